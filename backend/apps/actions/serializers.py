@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from utils.fast_serializers import FastSerializer
 from .models import ActionItem
 
 
@@ -13,6 +14,9 @@ class ActionItemSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'action_code', 'created_at', 'updated_at']
 
 
+ActionItemFastSerializer = FastSerializer(ActionItemSerializer)
+
+
 class ActionItemCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = ActionItem
@@ -1,20 +1,20 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from apps.clients.models import Client
+from apps.clients.tenancy import get_tenant
+from utils.fast_serializers import FastListMixin
 from .models import ActionItem
-from .serializers import ActionItemSerializer, ActionItemCreateSerializer
+from .serializers import ActionItemSerializer, ActionItemCreateSerializer, ActionItemFastSerializer
 
 
-class ActionItemViewSet(viewsets.ModelViewSet):
+class ActionItemViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for ActionItem CRUD operations."""
+    fast_serializer = ActionItemFastSerializer
     serializer_class = ActionItemSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
-        queryset = ActionItem.objects.filter(client__slug=client_slug)
+        queryset = ActionItem.objects.filter(client_id=get_tenant(self.request).id)
 
         # Filter by status if provided
         status_filter = self.request.query_params.get('status')
@@ -35,8 +35,7 @@ class ActionItemViewSet(viewsets.ModelViewSet):
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        client_slug = self.kwargs.get('client_slug')
-        context['client'] = get_object_or_404(Client, slug=client_slug)
+        context['client'] = get_tenant(self.request)
         return context
 
     def perform_create(self, serializer):
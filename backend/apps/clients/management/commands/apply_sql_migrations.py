@@ -0,0 +1,156 @@
+"""
+Management command that applies the raw SQL files in ``backend/migrations``.
+
+The ``managed=False`` tables are defined by numbered files
+(``NNN_description.sql``). Each applied file is recorded in
+``sql_schema_migrations`` with a checksum, so running the command again
+only applies new files and warns when an applied file was edited since.
+Files run in order, each in its own transaction together with its record.
+A file whose first line is ``-- migrate: no-transaction`` (needed for
+``CREATE INDEX CONCURRENTLY``) runs statement by statement in autocommit
+mode instead, so every statement in it must be idempotent.
+
+A PostgreSQL advisory lock keeps two deploys from applying files at once.
+
+On a database where the existing files were run by hand, record them once
+without running them: ``apply_sql_migrations --fake-through 013``.
+"""
+import hashlib
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+MIGRATIONS_DIR = settings.BASE_DIR / 'migrations'
+FILENAME = re.compile(r'^(?P<version>\d{3})_[\w-]+\.sql$')
+NO_TRANSACTION = '-- migrate: no-transaction'
+# Arbitrary key for pg_advisory_lock, shared by every process running this
+LOCK_KEY = 7_140_014
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS sql_schema_migrations (
+    version VARCHAR(10) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+)
+"""
+
+
+class SqlMigration:
+    def __init__(self, path):
+        self.path = path
+        self.name = path.name
+        self.version = FILENAME.match(path.name)['version']
+        self.sql = path.read_text()
+        self.checksum = hashlib.sha256(self.sql.encode()).hexdigest()
+        self.atomic = not self.sql.startswith(NO_TRANSACTION)
+
+    def statements(self):
+        """Top-level statements, for files run outside a transaction.
+
+        Splits on semicolons at line ends, so such files must not contain
+        function bodies or other multi-statement literals.
+        """
+        for chunk in re.split(r';\s*$', self.sql, flags=re.MULTILINE):
+            code = '\n'.join(line for line in chunk.splitlines() if not line.lstrip().startswith('--'))
+            if code.strip():
+                yield code.strip()
+
+
+def discover():
+    migrations = [SqlMigration(path) for path in MIGRATIONS_DIR.glob('*.sql') if FILENAME.match(path.name)]
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    duplicates = sorted({v for v in versions if versions.count(v) > 1})
+    if duplicates:
+        raise CommandError(f'Duplicate migration numbers: {", ".join(duplicates)}')
+    return migrations
+
+
+class Command(BaseCommand):
+    help = 'Apply new numbered SQL files from backend/migrations and record them in sql_schema_migrations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--list', action='store_true', help='Show applied and pending files and exit')
+        parser.add_argument('--target', help='Apply files up to and including this number')
+        parser.add_argument(
+            '--fake-through', metavar='NUMBER',
+            help='Record files up to this number as applied without running them',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Print what would be applied')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('The SQL migrations target PostgreSQL')
+
+        migrations = discover()
+        with connection.cursor() as cursor:
+            cursor.execute(CREATE_TABLE)
+            cursor.execute('SELECT pg_advisory_lock(%s)', [LOCK_KEY])
+        try:
+            self.run(migrations, options)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [LOCK_KEY])
+
+    def run(self, migrations, options):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT version, checksum FROM sql_schema_migrations')
+            applied = dict(cursor.fetchall())
+
+        for migration in migrations:
+            recorded = applied.get(migration.version)
+            if recorded is not None and recorded != migration.checksum:
+                self.stderr.write(self.style.WARNING(f'{migration.name} changed after it was applied'))
+
+        if options['list']:
+            for migration in migrations:
+                mark = 'x' if migration.version in applied else ' '
+                self.stdout.write(f'[{mark}] {migration.name}')
+            return
+
+        pending = [m for m in migrations if m.version not in applied]
+        if options['target']:
+            pending = [m for m in pending if m.version <= options['target'].zfill(3)]
+
+        if options['fake_through']:
+            through = options['fake_through'].zfill(3)
+            faked = [m for m in pending if m.version <= through]
+            if not options['dry_run']:
+                for migration in faked:
+                    self.record(migration)
+            for migration in faked:
+                self.stdout.write(f'Faked {migration.name}')
+            return
+
+        if not pending:
+            self.stdout.write('No SQL migrations to apply')
+            return
+
+        for migration in pending:
+            if options['dry_run']:
+                self.stdout.write(f'Would apply {migration.name}')
+                continue
+            self.stdout.write(f'Applying {migration.name}...', ending='')
+            self.stdout.flush()
+            if migration.atomic:
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        cursor.execute(migration.sql)
+                    self.record(migration)
+            else:
+                with connection.cursor() as cursor:
+                    for statement in migration.statements():
+                        cursor.execute(statement)
+                self.record(migration)
+            self.stdout.write(self.style.SUCCESS(' OK'))
+
+    def record(self, migration):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO sql_schema_migrations (version, name, checksum) VALUES (%s, %s, %s) '
+                'ON CONFLICT (version) DO NOTHING',
+                [migration.version, migration.name, migration.checksum],
+            )
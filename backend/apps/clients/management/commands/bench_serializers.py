@@ -0,0 +1,94 @@
+"""
+Management command that compares ModelSerializer and FastSerializer list cost.
+
+For each list serializer with a ``values()``-based twin, loads the same
+rows both ways (model instances through the ``ModelSerializer``, dict rows
+through ``FastSerializer``) and reports the best-of-``--repeat`` time per
+row, split into fetching and serializing, plus the speedup. The outputs are
+compared and the command fails if they differ in any row.
+
+Without ``--client`` a tenant of ``--rows`` rows is seeded inside a
+transaction that is rolled back at the end.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.actions.models import ActionItem
+from apps.actions.serializers import ActionItemFastSerializer
+from apps.clients.models import Client
+from apps.meetings.models import Meeting
+from apps.meetings.serializers import MeetingFastSerializer
+from apps.questions.models import Question
+from apps.questions.serializers import QuestionFastSerializer
+from apps.sprints.models import SprintItem
+from apps.sprints.serializers import SprintItemFastSerializer
+from apps.suggestions.models import AISuggestion
+from apps.suggestions.serializers import AISuggestionFastSerializer
+from utils.seeding import seed_tenant
+
+BENCHMARKS = [
+    ('meetings', Meeting, MeetingFastSerializer),
+    ('questions', Question, QuestionFastSerializer),
+    ('action items', ActionItem, ActionItemFastSerializer),
+    ('suggestions', AISuggestion, AISuggestionFastSerializer),
+    ('sprint items', SprintItem, SprintItemFastSerializer),
+]
+
+
+def best(run, repeat):
+    """Fastest (seconds, result) of ``repeat`` calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-row cost of ModelSerializer lists against their FastSerializer twins'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--client', help='Benchmark an existing client instead of a seeded one')
+        parser.add_argument('--rows', type=int, default=2000, help='Rows per table for the seeded client')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement; the fastest is kept')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['client']:
+                client = Client.objects.filter(slug=options['client']).first()
+                if client is None:
+                    raise CommandError(f'Client {options["client"]!r} not found')
+            else:
+                client = seed_tenant(options['rows'], transcripts=True)
+            failures = [name for name, model, fast in BENCHMARKS if not self.bench(name, model, fast, client, options)]
+            transaction.set_rollback(True)
+        if failures:
+            raise CommandError(f'Output differs for {", ".join(failures)}')
+
+    def bench(self, name, model, fast, client, options):
+        queryset = model.objects.filter(client=client)
+        repeat = max(options['repeat'], 1)
+
+        fetch_objects, instances = best(lambda: list(queryset.all()), repeat)
+        serialize_objects, expected = best(lambda: fast.serializer_class(instances, many=True).data, repeat)
+        fetch_rows, rows = best(lambda: list(fast.values(queryset)), repeat)
+        serialize_rows, actual = best(lambda: fast.serialize(rows), repeat)
+
+        count = max(len(rows), 1)
+        before = (fetch_objects + serialize_objects) / count * 1e6
+        after = (fetch_rows + serialize_rows) / count * 1e6
+        self.stdout.write(
+            f'{name:13} {len(rows):6} rows  '
+            f'ModelSerializer {before:7.1f}us/row (fetch {fetch_objects / count * 1e6:5.1f} + '
+            f'serialize {serialize_objects / count * 1e6:5.1f})  '
+            f'FastSerializer {after:7.1f}us/row (fetch {fetch_rows / count * 1e6:5.1f} + '
+            f'serialize {serialize_rows / count * 1e6:5.1f})  '
+            f'{before / after if after else 0:4.1f}x'
+        )
+        same = [dict(row) for row in expected] == actual
+        if not same:
+            self.stderr.write(f'{name}: FastSerializer output differs from {fast.serializer_class.__name__}')
+        return same
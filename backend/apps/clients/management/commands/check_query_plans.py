@@ -0,0 +1,245 @@
+"""
+Management command that fails when a hot query's plan scans a large table.
+
+Runs the queries behind the busiest endpoints and background tasks for one
+client (the one with the most meetings unless ``--client`` is given): list
+pages through the API, including the second keyset page, plus the
+calendar, workload, forecast, velocity, duplicate detection, pending
+question and batch approval queries called directly. Every statement is
+captured, run through ``EXPLAIN (FORMAT JSON)`` and rejected if its plan
+contains a sequential scan of a table the planner estimates at more than
+``--rows`` rows. Seq scans of small tables are normal and ignored. The
+second page of each list must also reach its rows through an index whose
+``Index Cond`` includes the leading cursor column; an index scan that only
+filters on ``client_id`` and checks the cursor row by row would read every
+earlier page again.
+
+Point it at a database filled by ``generate_tenant_data`` after
+``apply_sql_migrations``, with several clients so that filtering on
+``client_id`` is selective (with a single tenant a seq scan is the right
+plan). Writes made along the way are rolled back.
+"""
+import json
+import re
+from datetime import date
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client as HttpClient
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment
+from django.urls import reverse
+
+from apps.clients.models import Client
+from apps.clients.tenancy import local_cache
+from apps.questions.models import Question
+from apps.schedule import events
+from apps.sprints.burndown import client_velocity
+from apps.sprints.forecast import DEFAULT_HISTORY_DAYS, daily_throughput
+from apps.sprints.workload import _assignments, default_window
+from apps.suggestions.models import AISuggestion
+from apps.suggestions.services import approve_suggestions
+from apps.suggestions.similarity import find_duplicate
+
+# (check name, URL name, query string, table, leading cursor column) for
+# list pages fetched over HTTP. Sprint items are ordered by their sprint's
+# nullable rank first, a joined column no index on sprint_items can seek
+# to, so only their scans are checked.
+LIST_PAGES = [
+    ('meetings list', 'meetings-list', '', 'meetings', 'date'),
+    ('suggestion queue', 'suggestions-list', 'status=pending', 'ai_suggestions', 'created_at'),
+    ('suggestions by type', 'suggestions-list', 'status=pending&type=decision', 'ai_suggestions', 'created_at'),
+    ('action items by status', 'action-items-list', 'status=open', 'action_items', 'created_at'),
+    ('questions by status', 'questions-list', 'status=pending', 'questions', 'created_at'),
+    ('updates list', 'updates-list', '', 'updates', 'created_at'),
+    ('blockers list', 'blockers-list', '', 'blockers', 'created_at'),
+    ('business rules list', 'business-rules-list', '', 'business_rules', 'created_at'),
+    ('decisions list', 'decisions-list', '', 'decisions', 'created_at'),
+    ('sprint items list', 'sprint-items-list', '', None, None),
+]
+
+
+def _pending_questions(client, today):
+    # Loaded by every transcript analysis (transcription.tasks)
+    list(Question.objects.filter(client=client, status='pending').values('id', 'question_code', 'question', 'priority'))
+
+
+def _calendar(client, today):
+    start, end = events.default_window(today)
+    for source in (events.sprint_items, events.milestones, events.meetings, events.action_items):
+        list(source(client.id, start, end))
+
+
+def _workload(client, today):
+    _assignments(client.id, *default_window(today))
+
+
+def _forecast(client, today):
+    daily_throughput(client.id, today, DEFAULT_HISTORY_DAYS)
+
+
+def _velocity(client, today):
+    client_velocity(client.id)
+
+
+def _duplicates(client, today):
+    find_duplicate(client.id, 'decision', {'title': 'Adopt a new release checklist', 'description': ''})
+
+
+def _batch_approve(client, today):
+    ids = list(AISuggestion.objects.filter(client=client, status='pending').values_list('id', flat=True)[:10])
+    approve_suggestions(client.id, ids, reviewed_by='Plan check')
+
+
+DIRECT = [
+    ('pending questions', _pending_questions),
+    ('calendar', _calendar),
+    ('workload', _workload),
+    ('forecast throughput', _forecast),
+    ('velocity', _velocity),
+    ('duplicate candidates', _duplicates),
+    ('batch approve', _batch_approve),
+]
+
+
+def seq_scans(plan):
+    """Relation names of every Seq Scan node in an EXPLAIN JSON plan."""
+    if plan.get('Node Type') == 'Seq Scan':
+        yield plan['Relation Name']
+    for child in plan.get('Plans', ()):
+        yield from seq_scans(child)
+
+
+def index_conds(plan, relation=None):
+    """(relation, condition) for every ``Index Cond`` in an EXPLAIN JSON plan.
+
+    Bitmap index scans name no relation, so they take their heap scan's.
+    """
+    relation = plan.get('Relation Name', relation)
+    if 'Index Cond' in plan:
+        yield relation, plan['Index Cond']
+    for child in plan.get('Plans', ()):
+        yield from index_conds(child, relation)
+
+
+def mentions(condition, column):
+    # Quoted or not, but not a ``::date`` cast or a longer name ending in it
+    return re.search(rf'(?<![\w:]){re.escape(column)}\b', condition.replace('"', '')) is not None
+
+
+def explainable(sql):
+    return sql.lstrip().split(None, 1)[0].upper() in ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot queries for one client and fail on sequential scans of large tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--client', help='Client slug (default: the client with the most meetings)')
+        parser.add_argument(
+            '--rows', type=int, default=10000,
+            help='Fail on a Seq Scan of a table estimated above this many rows',
+        )
+        parser.add_argument('--analyze', action='store_true', help='ANALYZE the database first')
+        parser.add_argument('--verbose-sql', action='store_true', help='Print the statements of failing checks')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Plan checks need PostgreSQL')
+        client = self.get_client(options['client'])
+
+        with connection.cursor() as cursor:
+            if options['analyze']:
+                cursor.execute('ANALYZE')
+            cursor.execute("SELECT relname, reltuples FROM pg_class WHERE relkind = 'r'")
+            sizes = dict(cursor.fetchall())
+
+        setup_test_environment()
+        local = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        failures = []
+        checked = 0
+        with override_settings(CACHES=local), transaction.atomic():
+            http = HttpClient(raise_request_exception=False)
+            for name, url_name, query, table, column in LIST_PAGES:
+                statements, second_page = self.list_pages(http, client, url_name, query)
+                checked += 1
+                failures.extend(self.check_plans(name, statements, sizes, options))
+                failures.extend(self.check_cursor_index(name, second_page, table, column, sizes, options))
+            for name, run in DIRECT:
+                checked += 1
+                failures.extend(self.check_plans(name, self.direct(run, client), sizes, options))
+            transaction.set_rollback(True)
+
+        for failure in failures:
+            self.stderr.write(failure)
+        if failures:
+            raise CommandError(f'{len(failures)} plan check(s) failed')
+        self.stdout.write(self.style.SUCCESS(f'{checked} query group(s) for {client.slug} use indexes'))
+
+    def get_client(self, slug):
+        if slug:
+            client = Client.objects.filter(slug=slug).first()
+        else:
+            client = Client.objects.annotate(n=Count('meetings')).order_by('-n').first()
+        if client is None:
+            raise CommandError('No client to check; pass --client or run generate_tenant_data first')
+        return client
+
+    def list_pages(self, http, client, url_name, query):
+        """Statements behind the first two pages of a list endpoint, and the second's alone."""
+        # An empty cursor selects keyset paging, so the second page is one too
+        url = reverse(url_name, kwargs={'client_slug': client.slug}) + '?cursor=' + (f'&{query}' if query else '')
+        pages = []
+        for _ in range(2):
+            cache.clear()
+            local_cache.clear()
+            with CaptureQueriesContext(connection) as captured:
+                response = http.get(url)
+            if response.status_code != 200:
+                raise CommandError(f'GET {url} returned {response.status_code}')
+            pages.append([q['sql'] for q in captured.captured_queries])
+            url = json.loads(response.content).get('next')
+            if not url:
+                break
+        return [sql for page in pages for sql in page], pages[1] if len(pages) > 1 else []
+
+    def direct(self, run, client):
+        with CaptureQueriesContext(connection) as captured:
+            run(client, date.today())
+        return [q['sql'] for q in captured.captured_queries]
+
+    def explain(self, statements):
+        with connection.cursor() as cursor:
+            for sql in statements:
+                if not explainable(sql):
+                    continue
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                yield sql, plan[0]['Plan']
+
+    def check_plans(self, name, statements, sizes, options):
+        for sql, plan in self.explain(statements):
+            for table in seq_scans(plan):
+                if sizes.get(table, 0) > options['rows']:
+                    failure = f'{name}: Seq Scan on {table} (~{int(sizes[table])} rows)'
+                    if options['verbose_sql']:
+                        failure += f'\n    {sql}'
+                    yield failure
+
+    def check_cursor_index(self, name, statements, table, column, sizes, options):
+        """Fail unless the keyset page seeks to the cursor in an index on a large table."""
+        if not statements or not table or sizes.get(table, 0) <= options['rows']:
+            return
+        plans = list(self.explain(statements))
+        if any(
+            relation == table and mentions(condition, column)
+            for _, plan in plans for relation, condition in index_conds(plan)
+        ):
+            return
+        failure = f'{name}: no Index Cond on {table}.{column} for the second page'
+        if options['verbose_sql']:
+            failure += ''.join(f'\n    {sql}' for sql, _ in plans)
+        yield failure
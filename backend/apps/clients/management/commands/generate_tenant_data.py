@@ -0,0 +1,45 @@
+"""
+Management command to generate synthetic tenants for load and scale testing.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.clients.models import Client
+from utils.seeding import seed_tenant
+
+
+class Command(BaseCommand):
+    help = 'Create N synthetic clients with M meetings each and proportional related data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=1, help='Number of clients to create')
+        parser.add_argument(
+            '--meetings', type=int, default=100,
+            help='Meetings per client; questions, rules, suggestions, sprint items etc. scale with it',
+        )
+        parser.add_argument('--prefix', default='loadtest', help='Client slugs are <prefix>-<n>')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the first client')
+        parser.add_argument('--no-transcripts', action='store_true', help='Skip meeting transcripts')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        slugs = [f'{prefix}-{n + 1}' for n in range(options['clients'])]
+        existing = set(Client.objects.filter(slug__in=slugs).values_list('slug', flat=True))
+        if existing:
+            raise CommandError(f'{len(existing)} client(s) already exist, e.g. {min(existing)}; use another --prefix')
+
+        started = time.perf_counter()
+        for n, slug in enumerate(slugs):
+            client_started = time.perf_counter()
+            # Each client commits on its own, so an interrupted run keeps what it made
+            seed_tenant(
+                options['meetings'], slug=slug, seed=options['seed'] + n,
+                transcripts=not options['no_transcripts'],
+            )
+            self.stdout.write(f'{slug}: {time.perf_counter() - client_started:.1f}s')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(slugs)} client(s) x {options["meetings"]} meetings in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,193 @@
+"""
+Management command that drives the main API endpoints over HTTP and reports latency.
+
+Run it against a server started the way production runs it (gunicorn with
+the same worker count) and a database filled by ``generate_tenant_data``.
+Each of ``--concurrency`` threads keeps one keep-alive connection and
+issues requests back to back, picking an endpoint and a client at random,
+until ``--duration`` seconds have passed or ``--requests`` have been sent.
+
+The JSON report holds per-endpoint and overall p50/p95/p99 latency,
+throughput and error counts; pass an earlier report as ``--baseline`` to
+print the change run over run.
+"""
+import http.client
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.clients.models import Client
+
+ENDPOINTS = {
+    'all': '/api/{slug}/all/',
+    'roadmap': '/api/{slug}/sprints/roadmap/',
+    'meetings': '/api/{slug}/meetings/',
+    'suggestions': '/api/{slug}/suggestions/?status=pending',
+}
+PERCENTILES = (50, 95, 99)
+
+
+def summarize(samples, elapsed):
+    """Latency percentiles (ms), throughput and errors for (ms, status, bytes) samples."""
+    if not samples:
+        return {'requests': 0, 'errors': 0}
+    latencies = np.array([ms for ms, _, _ in samples])
+    statuses = Counter(str(status or 'failed') for _, status, _ in samples)
+    errors = sum(n for status, n in statuses.items() if not status.startswith(('2', '3')))
+    summary = {
+        'requests': len(samples),
+        'errors': errors,
+        'statuses': dict(sorted(statuses.items())),
+        'throughput_rps': round(len(samples) / elapsed, 2),
+        'mean_ms': round(float(latencies.mean()), 2),
+        'max_ms': round(float(latencies.max()), 2),
+        'mean_bytes': int(sum(size for _, _, size in samples) / len(samples)),
+    }
+    for p, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+        summary[f'p{p}_ms'] = round(float(value), 2)
+    return summary
+
+
+class Worker(threading.Thread):
+    """Sends requests over one keep-alive connection until told to stop."""
+
+    def __init__(self, url, paths, deadline, budget, seed, timeout):
+        super().__init__(daemon=True)
+        self.url = url
+        self.paths = paths
+        self.deadline = deadline
+        self.budget = budget
+        self.random = random.Random(seed)
+        self.timeout = timeout
+        self.samples = []
+        self.connection = None
+
+    def connect(self):
+        cls = http.client.HTTPSConnection if self.url.scheme == 'https' else http.client.HTTPConnection
+        self.connection = cls(self.url.hostname, self.url.port, timeout=self.timeout)
+
+    def run(self):
+        self.connect()
+        while time.monotonic() < self.deadline and next(self.budget) > 0:
+            name, path = self.random.choice(self.paths)
+            start = time.perf_counter()
+            try:
+                self.connection.request('GET', self.url.path.rstrip('/') + path, headers={'Accept': 'application/json'})
+                response = self.connection.getresponse()
+                size = len(response.read())
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                # Dropped connection: record the failure and reconnect
+                self.connection.close()
+                self.connect()
+                size, status = 0, None
+            self.samples.append((name, ((time.perf_counter() - start) * 1000, status, size)))
+        self.connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Load test the main API endpoints and write p50/p95/p99 latency and throughput as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://localhost:8000', help='Server to test')
+        parser.add_argument('--client', action='append', help='Client slug to request (repeatable)')
+        parser.add_argument(
+            '--prefix', default='loadtest',
+            help='Without --client, use every client whose slug starts with <prefix>-',
+        )
+        parser.add_argument(
+            '--endpoint', action='append', choices=sorted(ENDPOINTS),
+            help='Endpoint to include (repeatable; default all)',
+        )
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent connections')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+        parser.add_argument('--requests', type=int, help='Stop after this many requests instead')
+        parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for request selection')
+        parser.add_argument('--label', default='', help='Free-form run label stored in the report')
+        parser.add_argument('--output', default='loadtest.json', help='Report path')
+        parser.add_argument('--baseline', help='Earlier report to compare against')
+
+    def handle(self, *args, **options):
+        slugs = options['client'] or list(
+            Client.objects.filter(slug__startswith=f'{options["prefix"]}-').values_list('slug', flat=True)
+        )
+        if not slugs:
+            raise CommandError('No clients to test; pass --client or run generate_tenant_data first')
+        url = urlsplit(options['base_url'])
+        if url.scheme not in ('http', 'https') or not url.hostname:
+            raise CommandError(f'Invalid --base-url {options["base_url"]!r}')
+
+        names = options['endpoint'] or sorted(ENDPOINTS)
+        paths = [(name, ENDPOINTS[name].format(slug=slug)) for name in names for slug in slugs]
+
+        # Shared countdown of remaining requests; next() on a count is atomic
+        budget = itertools.count(options['requests'], -1) if options['requests'] else itertools.repeat(1)
+        deadline = time.monotonic() + (options['duration'] if not options['requests'] else float('inf'))
+        workers = [
+            Worker(url, paths, deadline, budget, options['seed'] + n, options['timeout'])
+            for n in range(max(options['concurrency'], 1))
+        ]
+        self.stdout.write(
+            f'{len(workers)} connection(s), {len(names)} endpoint(s), {len(slugs)} client(s) -> {options["base_url"]}'
+        )
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        by_endpoint = {name: [] for name in names}
+        for worker in workers:
+            for name, sample in worker.samples:
+                by_endpoint[name].append(sample)
+        report = {
+            'label': options['label'],
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'base_url': options['base_url'],
+            'concurrency': len(workers),
+            'clients': len(slugs),
+            'elapsed_s': round(elapsed, 2),
+            'total': summarize([s for samples in by_endpoint.values() for s in samples], elapsed),
+            'endpoints': {name: summarize(samples, elapsed) for name, samples in by_endpoint.items()},
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+        self.print_report(report, baseline)
+        self.stdout.write(self.style.SUCCESS(f'Report written to {options["output"]}'))
+
+    def print_report(self, report, baseline):
+        rows = [('total', report['total'])] + list(report['endpoints'].items())
+        for name, stats in rows:
+            if not stats['requests']:
+                self.stdout.write(f'{name:12} no requests')
+                continue
+            line = (
+                f'{name:12} {stats["requests"]:7} req {stats["errors"]:5} err '
+                f'{stats["throughput_rps"]:8.1f} rps  '
+                + '  '.join(f'p{p} {stats[f"p{p}_ms"]:8.1f}ms' for p in PERCENTILES)
+            )
+            previous = None
+            if baseline:
+                previous = baseline['total'] if name == 'total' else baseline['endpoints'].get(name)
+            if previous and previous.get('requests'):
+                changes = [
+                    f'p{p} {(stats[f"p{p}_ms"] / previous[f"p{p}_ms"] - 1) * 100:+.0f}%'
+                    for p in PERCENTILES if previous.get(f'p{p}_ms')
+                ]
+                line += '  vs baseline: ' + ', '.join(changes)
+            self.stdout.write(line)
@@ -0,0 +1,26 @@
+from django.http import JsonResponse
+
+from .tenancy import resolve
+
+
+class TenantMiddleware:
+    """Attach ``request.tenant`` for URLs carrying ``client_slug``.
+
+    Unknown slugs get a 404 before the view runs, matching what the views'
+    own client lookups used to return.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        slug = view_kwargs.get('client_slug')
+        if slug is None:
+            return None
+        request.tenant = resolve(slug)
+        if request.tenant is None:
+            return JsonResponse({'detail': 'Not found.'}, status=404)
+        return None
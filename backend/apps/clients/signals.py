@@ -0,0 +1,27 @@
+"""
+Drop cached tenant lookups when a Client changes.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import Client
+from .tenancy import invalidate
+
+
+def _remember_slug(sender, instance, **kwargs):
+    # A renamed slug must be forgotten as well as the new one
+    if not instance._state.adding:
+        instance._previous_slug = (
+            Client.objects.filter(pk=instance.pk).values_list('slug', flat=True).first()
+        )
+
+
+def _invalidate(sender, instance, **kwargs):
+    slugs = {instance.slug, getattr(instance, '_previous_slug', None)} - {None}
+    invalidate(*slugs)
+
+
+def connect():
+    pre_save.connect(_remember_slug, sender=Client, dispatch_uid='tenant-cache-pre-save')
+    post_save.connect(_invalidate, sender=Client, dispatch_uid='tenant-cache-save')
+    post_delete.connect(_invalidate, sender=Client, dispatch_uid='tenant-cache-delete')
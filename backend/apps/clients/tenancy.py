@@ -0,0 +1,122 @@
+"""
+Tenant resolution: the ``client_slug`` URL kwarg -> ``request.tenant``.
+
+Client-scoped views used to look the client up by slug (often twice per
+request) and filter with ``client__slug=``, a join. ``TenantMiddleware``
+now resolves the slug once per request through a small in-process LRU
+backed by the shared cache, so views read ``request.tenant`` and filter by
+``client_id``. Saving or deleting a Client drops its shared entry and this
+process's local entry; other processes see the change once their local
+entry expires (``TENANT_CACHE_LOCAL_TTL`` seconds).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+
+from utils.metrics import record_cache
+from .models import Client
+
+FIELDS = ('id', 'name', 'slug', 'created_at', 'updated_at')
+
+
+class LocalCache:
+    """Thread-safe LRU with a per-entry time to live."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_cache = LocalCache(settings.TENANT_CACHE_LOCAL_SIZE, settings.TENANT_CACHE_LOCAL_TTL)
+
+
+def _shared_key(slug):
+    return f'tenant:slug:{slug}'
+
+
+def _instance(values):
+    # A fresh instance per request, so a view mutating it never leaks
+    client = Client(**values)
+    client._state.adding = False
+    client._state.db = 'default'
+    return client
+
+
+def resolve(slug):
+    """Client for ``slug`` (local LRU, then shared cache, then one query) or None."""
+    values = local_cache.get(slug)
+    record_cache('tenant:local', values is not None)
+    if values is None:
+        values = cache.get(_shared_key(slug))
+        record_cache('tenant:shared', values is not None)
+        if values is None:
+            values = Client.objects.filter(slug=slug).values(*FIELDS).first()
+            if values is None:
+                # Unknown slugs are not cached: a client created a moment
+                # later must resolve straight away in every process
+                return None
+            cache.set(_shared_key(slug), values, timeout=settings.TENANT_CACHE_TIMEOUT)
+        local_cache.set(slug, values)
+    return _instance(values)
+
+
+def invalidate(*slugs):
+    """Forget cached clients, now and again once the transaction commits."""
+    def forget():
+        for slug in slugs:
+            cache.delete(_shared_key(slug))
+            local_cache.discard(slug)
+    forget()
+    transaction.on_commit(forget)
+
+
+def get_tenant(request):
+    """The request's client; raises Http404 for an unknown slug.
+
+    Normally set by ``TenantMiddleware``; resolved here when the middleware
+    did not run (e.g. views called directly).
+    """
+    tenant = getattr(request, 'tenant', None)
+    if tenant is None:
+        match = getattr(request, 'resolver_match', None)
+        slug = match.kwargs.get('client_slug') if match else None
+        tenant = resolve(slug) if slug else None
+        if tenant is None:
+            raise Http404('Client not found')
+        request.tenant = tenant
+    return tenant
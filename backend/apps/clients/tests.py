@@ -1,3 +1,432 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+import time
+from collections import namedtuple
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import URLResolver, get_resolver, reverse
+
+from apps.actions.models import ActionItem
+from apps.deliverables.models import ClientDocument, DeliverablePage, DeliverableSection
+from apps.meetings.models import Attachment, Blocker, Meeting, Update
+from apps.questions.models import Question
+from apps.rules.models import BusinessRule, Decision
+from apps.sprints.models import DeliveryMilestone, Sprint, SprintItem
+from apps.suggestions.models import AISuggestion
+from utils.seeding import seed_tenant
+
+from .management.commands import apply_sql_migrations
+from .management.commands.check_query_plans import index_conds, mentions
+from .management.commands.loadtest import summarize
+from .models import Client
+from .tenancy import LocalCache, local_cache, resolve
+
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# Tenant sizes every route is requested at
+SIZES = (10, 1000)
+
+# Each route's best time at the largest size may be at most SLOWDOWN times
+# its best time at the smallest, or under TIME_FLOOR seconds (which keeps
+# millisecond routes from failing on scheduler noise). Both are generous on
+# purpose: they catch per-row work, not regressions of a few percent.
+SLOWDOWN = 10
+TIME_FLOOR = 0.25
+TIMING_RUNS = 3
+
+# Routes that return all of a client's data grow with it by design; they
+# only have to stay under a loose absolute ceiling (seconds)
+UNPAGED = {'clients-all', 'clients-export', 'client-all', 'client-export'}
+UNPAGED_CEILING = 2.0
+
+# Rows sent to the bulk write endpoints (the same for every tenant size)
+WRITE_ROWS = 10
+
+# Routes that call external services, take uploads or are not client data
+EXEMPT = {
+    'api-root', 'health', 'api-health', 'metrics',
+    'login', 'logout', 'me', 'csrf',
+    'meetings-analyze', 'meetings-transcript', 'validate-key',
+}
+
+Check = namedtuple('Check', 'name method queries kwargs data', defaults=(None, None))
+
+
+def _pk(name):
+    return lambda t: {'pk': t[name]}
+
+
+def _reorder(name):
+    return lambda t: {'items': [{'id': str(pk), 'order': str(n)} for n, pk in enumerate(reversed(t[name]))]}
+
+
+def _rank(name):
+    return lambda t: {'after': str(t[name][1]), 'before': str(t[name][2])}
+
+
+# SQL statements per request at every tenant size, cold caches, tenant lookup
+# included; list pages also run the page-number COUNT
+CHECKS = [
+    Check('clients-list', 'get', 2),
+    Check('clients-detail', 'get', 1, kwargs=lambda t: {'slug': t['slug']}),
+    Check('clients-all', 'get', 6, kwargs=lambda t: {'slug': t['slug']}),
+    Check('clients-export', 'get', 6, kwargs=lambda t: {'slug': t['slug']}),
+    Check('clients-config', 'get', 1, kwargs=lambda t: {'slug': t['slug']}),
+    Check('client-config', 'get', 1),
+    Check('client-all', 'get', 9),
+    Check('client-export', 'get', 9),
+
+    Check('meetings-list', 'get', 3),
+    Check('meetings-detail', 'get', 2, kwargs=_pk('meeting')),
+    Check('meetings-suggestions', 'get', 3, kwargs=_pk('meeting')),
+    Check('meeting-summary', 'get', 3, kwargs=lambda t: {'meeting_id': t['meeting']}),
+    Check('updates-list', 'get', 3),
+    Check('updates-detail', 'get', 2, kwargs=_pk('update')),
+    Check('blockers-list', 'get', 3),
+    Check('blockers-detail', 'get', 2, kwargs=_pk('blocker')),
+    Check('blockers-resolve', 'post', 3, kwargs=_pk('blocker'), data=lambda t: {'resolution': 'Done'}),
+    Check('attachments-list', 'get', 3),
+    Check('attachments-detail', 'get', 2, kwargs=_pk('attachment')),
+
+    Check('questions-list', 'get', 3),
+    Check('questions-detail', 'get', 2, kwargs=_pk('question')),
+    Check('questions-answer', 'post', 3, kwargs=_pk('question'), data=lambda t: {'answer': 'Yes'}),
+    Check('action-items-list', 'get', 3),
+    Check('action-items-detail', 'get', 2, kwargs=_pk('action_item')),
+    Check('action-items-complete', 'post', 3, kwargs=_pk('action_item')),
+    Check('business-rules-list', 'get', 3),
+    Check('business-rules-detail', 'get', 2, kwargs=_pk('rule')),
+    Check('decisions-list', 'get', 3),
+    Check('decisions-detail', 'get', 2, kwargs=_pk('decision')),
+
+    Check('suggestions-list', 'get', 3),
+    Check('suggestions-detail', 'get', 2, kwargs=_pk('suggestion')),
+    Check('suggestions-batch-approve', 'post', 19, data=lambda t: {'ids': [str(pk) for pk in t['suggestions']]}),
+
+    Check('settings', 'get', 2),
+    Check('providers', 'get', 1),
+    Check('reset-usage', 'post', 3),
+
+    Check('sprints-list', 'get', 4),
+    Check('sprints-detail', 'get', 3, kwargs=_pk('sprint')),
+    # Pinned: sprints, their items (one prefetch) and one grouped count
+    Check('sprints-roadmap', 'get', 4),
+    Check('sprints-timeline', 'get', 4),
+    Check('sprints-velocity', 'get', 2),
+    Check('sprints-forecast', 'get', 4),
+    Check('sprints-burndown', 'get', 3, kwargs=_pk('sprint')),
+    Check('sprints-reorder', 'post', 4, data=_reorder('sprints')),
+    Check('sprints-rank', 'post', 6, kwargs=lambda t: {'pk': t['sprints'][0]}, data=_rank('sprints')),
+    Check('sprint-items-list', 'get', 3),
+    Check('sprint-items-detail', 'get', 2, kwargs=_pk('item')),
+    Check('sprint-items-workload', 'get', 2),
+    Check('sprint-items-complete', 'post', 3, kwargs=_pk('item')),
+    Check('sprint-items-move', 'post', 6, kwargs=_pk('item'), data=lambda t: {'sprint_id': str(t['sprint'])}),
+    Check('sprint-items-reorder', 'post', 4, data=_reorder('items')),
+    Check('sprint-items-rank', 'post', 5, kwargs=lambda t: {'pk': t['items'][0]}, data=_rank('items')),
+    Check('delivery-milestones-list', 'get', 3),
+    Check('delivery-milestones-detail', 'get', 2, kwargs=_pk('milestone')),
+    Check('delivery-milestones-reorder', 'post', 4, data=_reorder('milestones')),
+    Check('delivery-milestones-rank', 'post', 5, kwargs=lambda t: {'pk': t['milestones'][0]}, data=_rank('milestones')),
+
+    Check('client-branding', 'get', 2),
+    Check('deliverable-list', 'get', 3),
+    Check('deliverable-detail', 'get', 4, kwargs=_pk('page')),
+    Check('deliverable-by-slug', 'get', 4, kwargs=lambda t: {'slug': t['page_slug']}),
+    Check('deliverable-publish', 'post', 5, kwargs=_pk('page')),
+    Check('deliverable-unpublish', 'post', 5, kwargs=_pk('page')),
+    Check('section-list', 'get', 4, kwargs=lambda t: {'page_slug': t['page_slug']}),
+    Check('section-detail', 'get', 3, kwargs=lambda t: {'page_slug': t['page_slug'], 'pk': t['sections'][0]}),
+    Check('section-reorder', 'post', 5, kwargs=lambda t: {'page_slug': t['page_slug']},
+          data=lambda t: {'section_ids': [str(pk) for pk in reversed(t['sections'])]}),
+    Check('section-rank', 'post', 6, kwargs=lambda t: {'page_slug': t['page_slug'], 'pk': t['sections'][0]},
+          data=_rank('sections')),
+    Check('document-list', 'get', 3),
+    Check('document-categories', 'get', 2),
+    Check('document-detail', 'get', 2, kwargs=_pk('document')),
+    Check('document-by-slug', 'get', 2, kwargs=lambda t: {'slug': t['document_slug']}),
+
+    Check('calendar', 'get', 6),
+    Check('calendar-feed', 'get', 6),
+]
+
+
+def _ids(queryset, limit=WRITE_ROWS):
+    return list(queryset.values_list('id', flat=True)[:limit])
+
+
+def targets(client):
+    """Ids of sample rows of ``client`` used to build URLs and bodies."""
+    scoped = {'client_id': client.id}
+    page = DeliverablePage.objects.filter(**scoped).order_by('order').first()
+    sprint = Sprint.objects.filter(**scoped).first()
+    document = ClientDocument.objects.filter(**scoped).first()
+    return {
+        'slug': client.slug,
+        'meeting': Meeting.objects.filter(**scoped).values_list('id', flat=True).first(),
+        'update': Update.objects.filter(**scoped).values_list('id', flat=True).first(),
+        'blocker': Blocker.objects.filter(**scoped).values_list('id', flat=True).first(),
+        'attachment': Attachment.objects.filter(**scoped).values_list('id', flat=True).first(),
+        'question': Question.objects.filter(**scoped).values_list('id', flat=True).first(),
+        'action_item': ActionItem.objects.filter(**scoped).values_list('id', flat=True).first(),
+        'rule': BusinessRule.objects.filter(**scoped).values_list('id', flat=True).first(),
+        'decision': Decision.objects.filter(**scoped).values_list('id', flat=True).first(),
+        'suggestion': AISuggestion.objects.filter(**scoped).values_list('id', flat=True).first(),
+        'suggestions': _ids(AISuggestion.objects.filter(status='pending', **scoped)),
+        'sprint': sprint.id,
+        'sprints': _ids(Sprint.objects.filter(**scoped)),
+        'item': SprintItem.objects.filter(sprint=sprint).values_list('id', flat=True).first(),
+        'items': _ids(SprintItem.objects.filter(sprint=sprint)),
+        'milestone': DeliveryMilestone.objects.filter(**scoped).values_list('id', flat=True).first(),
+        'milestones': _ids(DeliveryMilestone.objects.filter(**scoped)),
+        'page': page.id,
+        'page_slug': page.slug,
+        'sections': _ids(DeliverableSection.objects.filter(page=page)),
+        'document': document.id,
+        'document_slug': document.slug,
+    }
+
+
+def route_names():
+    """URL names of every route outside the admin."""
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                if pattern.namespace != 'admin':
+                    yield from walk(pattern.url_patterns)
+            elif pattern.name:
+                yield pattern.name
+    return set(walk(get_resolver().url_patterns))
+
+
+class LocalCacheTests(SimpleTestCase):
+
+    def test_least_recently_used_evicted(self):
+        lru = LocalCache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        self.assertEqual(lru.get('a'), 1)
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+
+    def test_expired_entries(self):
+        lru = LocalCache(maxsize=2, ttl=-1)
+        lru.set('a', 1)
+        self.assertIsNone(lru.get('a'))
+
+    def test_discard_and_clear(self):
+        lru = LocalCache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.discard('a')
+        lru.discard('missing')
+        self.assertEqual((lru.get('a'), lru.get('b')), (None, 2))
+        lru.clear()
+        self.assertIsNone(lru.get('b'))
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class ResolveTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+
+    def test_cached_after_first_lookup(self):
+        with self.assertNumQueries(1):
+            first = resolve('acme')
+        with self.assertNumQueries(0):
+            second = resolve('acme')
+        self.assertEqual((first.pk, first.name), (self.client_.pk, 'Acme'))
+        # A fresh instance each time, so a view mutating it never leaks
+        self.assertIsNot(first, second)
+
+        # Another process: empty local LRU, warm shared cache
+        local_cache.clear()
+        with self.assertNumQueries(0):
+            resolve('acme')
+
+    def test_unknown_slug_not_cached(self):
+        self.assertIsNone(resolve('new'))
+        Client.objects.create(name='New', slug='new')
+        self.assertEqual(resolve('new').name, 'New')
+
+    def test_save_and_delete_invalidate(self):
+        resolve('acme')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_.name = 'Acme Corp'
+            self.client_.slug = 'acme-corp'
+            self.client_.save()
+        self.assertIsNone(resolve('acme'))
+        self.assertEqual(resolve('acme-corp').name, 'Acme Corp')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Client.objects.get(pk=self.client_.pk).delete()
+        self.assertIsNone(resolve('acme-corp'))
+
+    def test_unknown_slug_is_404(self):
+        response = self.client.get(reverse('meetings-list', kwargs={'client_slug': 'missing'}))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'detail': 'Not found.'})
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class QueryBudgetTests(TestCase):
+    """Every route runs the same number of queries for a small and a large tenant.
+
+    A serializer that starts issuing one query per row fails here instead of
+    in production. Wall time is checked too (SLOWDOWN, TIME_FLOOR), which
+    catches per-row work in Python that runs no extra queries. New routes
+    must add a budget (or an EXEMPT entry).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenants = [targets(seed_tenant(rows, seed=rows)) for rows in SIZES]
+
+    def test_every_route_has_a_budget(self):
+        self.assertEqual(route_names() - {check.name for check in CHECKS} - EXEMPT, set())
+
+    def test_budgets(self):
+        for check in CHECKS:
+            timings = []
+            for rows, t in zip(SIZES, self.tenants):
+                with self.subTest(route=check.name, rows=rows):
+                    timings.append(min(self.assertBudget(check, t) for _ in range(TIMING_RUNS)))
+            if len(timings) != len(SIZES):
+                continue
+            with self.subTest(route=check.name, timings=timings):
+                if check.name in UNPAGED:
+                    self.assertLessEqual(timings[-1], UNPAGED_CEILING)
+                else:
+                    self.assertLessEqual(timings[-1], max(SLOWDOWN * timings[0], TIME_FLOOR))
+
+    def assertBudget(self, check, t):
+        """Request ``check`` for tenant ``t`` within its query budget; returns the seconds taken."""
+        kwargs = {'client_slug': t['slug'], **(check.kwargs(t) if check.kwargs else {})}
+        if check.name.startswith('clients-'):
+            kwargs.pop('client_slug')
+        url = reverse(check.name, kwargs=kwargs)
+        body = json.dumps(check.data(t)) if check.data else None
+
+        cache.clear()
+        local_cache.clear()
+        # Writes are rolled back so every check sees the seeded data
+        with transaction.atomic():
+            with self.assertNumQueries(check.queries):
+                start = time.perf_counter()
+                response = getattr(self.client, check.method)(url, body, content_type='application/json')
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        self.assertLess(response.status_code, 400, f'{check.method.upper()} {url}')
+        return elapsed
+
+
+class PlanHelperTests(SimpleTestCase):
+
+    def test_index_conds(self):
+        plan = {
+            'Node Type': 'Limit',
+            'Plans': [{
+                'Node Type': 'Bitmap Heap Scan', 'Relation Name': 'questions',
+                'Plans': [{'Node Type': 'Bitmap Index Scan', 'Index Cond': '(client_id = 1)'}],
+            }, {
+                'Node Type': 'Index Scan', 'Relation Name': 'clients', 'Index Cond': '(id = 1)',
+            }],
+        }
+        self.assertEqual(list(index_conds(plan)), [('questions', '(client_id = 1)'), ('clients', '(id = 1)')])
+
+    def test_mentions(self):
+        condition = "((client_id = 1) AND (ROW(date, id) < ROW('2026-03-01'::date, 2)))"
+        self.assertTrue(mentions(condition, 'date'))
+        self.assertFalse(mentions("((client_id = 1) AND (created_at < '2026-03-01'::date))", 'date'))
+        self.assertFalse(mentions('(updated_at < now())', 'created_at'))
+        self.assertTrue(mentions('(ROW("order", id) > ROW(4, 2))', 'order'))
+
+
+class LoadTestSummaryTests(SimpleTestCase):
+
+    def test_summarize(self):
+        samples = [(float(ms), 200, 100) for ms in range(1, 101)]
+        samples += [(500.0, 503, 10), (30.0, None, 0), (2.0, 304, 0)]
+        summary = summarize(samples, elapsed=2.0)
+        self.assertEqual(summary['requests'], 103)
+        self.assertEqual(summary['errors'], 2)
+        self.assertEqual(summary['statuses'], {'200': 100, '304': 1, '503': 1, 'failed': 1})
+        self.assertEqual(summary['throughput_rps'], 51.5)
+        self.assertEqual(summary['max_ms'], 500.0)
+        self.assertLess(summary['p50_ms'], summary['p95_ms'])
+        self.assertLessEqual(summary['p95_ms'], summary['p99_ms'])
+
+    def test_no_samples(self):
+        self.assertEqual(summarize([], elapsed=1.0), {'requests': 0, 'errors': 0})
+
+
+class SqlMigrationTests(SimpleTestCase):
+
+    def migration(self, name, sql):
+        directory = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        (directory / name).write_text(sql)
+        return apply_sql_migrations.SqlMigration(directory / name)
+
+    def test_statements(self):
+        migration = self.migration('001_indexes.sql', (
+            '-- migrate: no-transaction\n'
+            '-- Header comment; with a semicolon\n'
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS a\n    ON t(x);\n\n'
+            '  -- indented comment\n'
+            'DROP INDEX CONCURRENTLY IF EXISTS b;\n'
+        ))
+        self.assertEqual(migration.version, '001')
+        self.assertFalse(migration.atomic)
+        self.assertEqual(list(migration.statements()), [
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS a\n    ON t(x)',
+            'DROP INDEX CONCURRENTLY IF EXISTS b',
+        ])
+        self.assertTrue(self.migration('002_table.sql', 'CREATE TABLE t (x int);').atomic)
+
+    def test_discover(self):
+        versions = [migration.version for migration in apply_sql_migrations.discover()]
+        self.assertEqual(versions, sorted(set(versions)))
+        self.assertIn('014', versions)
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ('001_a.sql', '001_b.sql', 'notes.sql'):
+                (Path(directory) / name).write_text('SELECT 1;')
+            with mock.patch.object(apply_sql_migrations, 'MIGRATIONS_DIR', Path(directory)):
+                with self.assertRaisesMessage(CommandError, 'Duplicate migration numbers: 001'):
+                    apply_sql_migrations.discover()
+
+
+class ApplySqlMigrationsTests(TestCase):
+
+    def call(self, *args):
+        out, err = io.StringIO(), io.StringIO()
+        call_command('apply_sql_migrations', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_applied_by_test_runner(self):
+        out, err = self.call('--list')
+        self.assertEqual(err, '')
+        self.assertNotIn('[ ]', out)
+        self.assertEqual(self.call(), ('No SQL migrations to apply\n', ''))
+
+    def test_changed_file_warns(self):
+        migrations = apply_sql_migrations.discover()
+        migrations[-1].checksum = '0' * 64
+        with mock.patch.object(apply_sql_migrations, 'discover', return_value=migrations):
+            _, err = self.call('--list')
+        self.assertIn(f'{migrations[-1].name} changed after it was applied', err)
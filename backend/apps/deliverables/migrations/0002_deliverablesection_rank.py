@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+def seed_ranks(apps, schema_editor):
+    """Give existing sections fixed-width keys in their current order."""
+    DeliverableSection = apps.get_model('deliverables', 'DeliverableSection')
+    sections = DeliverableSection.objects.order_by('page_id', 'order', 'created_at')
+    updated = []
+    page_id, position = None, 0
+    for section in sections.only('id', 'page_id'):
+        if section.page_id != page_id:
+            page_id, position = section.page_id, 0
+        # Frozen copy of utils.ranking.rank_for_order's key format
+        section.rank = f'i{position:07d}i'
+        updated.append(section)
+        position += 1
+    DeliverableSection.objects.bulk_update(updated, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deliverables", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="deliverablesection",
+            name="rank",
+            field=models.CharField(blank=True, db_collation="C", max_length=64, null=True),
+        ),
+        migrations.RunPython(seed_ranks, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name="deliverablesection",
+            options={"ordering": [models.F("rank").asc(nulls_last=True), "order"]},
+        ),
+        migrations.AddIndex(
+            model_name="deliverablesection",
+            index=models.Index(fields=["page", "rank"], name="deliverable_section_rank_idx"),
+        ),
+    ]
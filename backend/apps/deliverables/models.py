@@ -116,6 +116,7 @@ class DeliverableSection(models.Model):
     meta = models.JSONField(default=dict, blank=True)
 
     order = models.IntegerField(default=0)
+    rank = models.CharField(max_length=64, blank=True, null=True, db_collation='C')
     is_visible = models.BooleanField(default=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -123,7 +124,8 @@ class DeliverableSection(models.Model):
 
     class Meta:
         db_table = 'deliverable_sections'
-        ordering = ['order']
+        ordering = [models.F('rank').asc(nulls_last=True), 'order']
+        indexes = [models.Index(fields=['page', 'rank'], name='deliverable_section_rank_idx')]
 
     def __str__(self):
         return f"{self.page.slug}/{self.section_type}: {self.title}"
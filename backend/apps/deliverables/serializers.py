@@ -36,11 +36,12 @@ class DeliverableSectionSerializer(serializers.ModelSerializer):
             'content',
             'meta',
             'order',
+            'rank',
             'is_visible',
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'rank', 'created_at', 'updated_at']
 
 
 class DeliverablePageSerializer(serializers.ModelSerializer):
@@ -42,7 +42,7 @@ urlpatterns = [
     # Deliverable page by slug (for public access)
     path('deliverables/by-slug/<slug:slug>/', DeliverablePageViewSet.as_view({
         'get': 'retrieve',
-    }), name='deliverable-by-slug'),
+    }, lookup_field='slug'), name='deliverable-by-slug'),
 
     # Sections within a page
     path('deliverables/<slug:page_slug>/sections/', DeliverableSectionViewSet.as_view({
@@ -58,6 +58,9 @@ urlpatterns = [
     path('deliverables/<slug:page_slug>/sections/reorder/', DeliverableSectionViewSet.as_view({
         'post': 'reorder',
     }), name='section-reorder'),
+    path('deliverables/<slug:page_slug>/sections/<uuid:pk>/rank/', DeliverableSectionViewSet.as_view({
+        'post': 'rank',
+    }), name='section-rank'),
 
     # Knowledge base documents
     path('docs/', ClientDocumentViewSet.as_view({
@@ -75,5 +78,5 @@ urlpatterns = [
     }), name='document-detail'),
     path('docs/by-slug/<slug:slug>/', ClientDocumentViewSet.as_view({
         'get': 'retrieve',
-    }), name='document-by-slug'),
+    }, lookup_field='slug'), name='document-by-slug'),
 ]
@@ -1,3 +1,4 @@
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import viewsets, status
@@ -5,7 +6,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.clients.models import Client
+from apps.clients.tenancy import get_tenant
+from utils.ranking import RankActionMixin, place, rank_for_order
+from utils.reorder import bulk_reorder
 from .models import ClientBranding, DeliverablePage, DeliverableSection, ClientDocument
 from .serializers import (
     ClientBrandingSerializer,
@@ -21,7 +24,7 @@ class ClientConfigView(APIView):
     """Get client configuration including branding."""
 
     def get(self, request, client_slug):
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(request)
 
         # Get or create branding
         branding, _ = ClientBranding.objects.get_or_create(
@@ -44,13 +47,10 @@ class ClientBrandingViewSet(viewsets.ModelViewSet):
     serializer_class = ClientBrandingSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
-        client = get_object_or_404(Client, slug=client_slug)
-        return ClientBranding.objects.filter(client=client)
+        return ClientBranding.objects.filter(client_id=get_tenant(self.request).id)
 
     def get_object(self):
-        client_slug = self.kwargs.get('client_slug')
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(self.request)
         branding, _ = ClientBranding.objects.get_or_create(
             client=client,
             defaults={'company_name': client.name}
@@ -74,9 +74,7 @@ class DeliverablePageViewSet(viewsets.ModelViewSet):
         return DeliverablePageSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
-        client = get_object_or_404(Client, slug=client_slug)
-        queryset = DeliverablePage.objects.filter(client=client)
+        queryset = DeliverablePage.objects.filter(client_id=get_tenant(self.request).id)
 
         # Filter by published status if requested
         published = self.request.query_params.get('published')
@@ -93,8 +91,7 @@ class DeliverablePageViewSet(viewsets.ModelViewSet):
         return queryset
 
     def perform_create(self, serializer):
-        client_slug = self.kwargs.get('client_slug')
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(self.request)
         serializer.save(client=client)
 
     @action(detail=True, methods=['post'])
@@ -115,30 +112,42 @@ class DeliverablePageViewSet(viewsets.ModelViewSet):
         return Response(DeliverablePageSerializer(page).data)
 
 
-class DeliverableSectionViewSet(viewsets.ModelViewSet):
+class DeliverableSectionViewSet(RankActionMixin, viewsets.ModelViewSet):
     """Manage sections within a deliverable page."""
     serializer_class = DeliverableSectionSerializer
+    rank_group_field = 'page_id'
+
+    def get_page(self):
+        """The page named in the URL, looked up once per request."""
+        if not hasattr(self, '_page'):
+            self._page = get_object_or_404(
+                DeliverablePage.objects.only('id'),
+                client_id=get_tenant(self.request).id,
+                slug=self.kwargs.get('page_slug'),
+            )
+        return self._page
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
-        page_slug = self.kwargs.get('page_slug')
-        client = get_object_or_404(Client, slug=client_slug)
-        page = get_object_or_404(DeliverablePage, client=client, slug=page_slug)
-        return DeliverableSection.objects.filter(page=page)
+        return DeliverableSection.objects.filter(page_id=self.get_page().id)
 
     def perform_create(self, serializer):
-        client_slug = self.kwargs.get('client_slug')
-        page_slug = self.kwargs.get('page_slug')
-        client = get_object_or_404(Client, slug=client_slug)
-        page = get_object_or_404(DeliverablePage, client=client, slug=page_slug)
-        serializer.save(page=page)
+        page = self.get_page()
+        serializer.save(page=page, rank=place(DeliverableSection, 'page_id', page.id))
 
     @action(detail=False, methods=['post'])
     def reorder(self, request, client_slug=None, page_slug=None):
         """Reorder sections within a page."""
         section_ids = request.data.get('section_ids', [])
-        for index, section_id in enumerate(section_ids):
-            DeliverableSection.objects.filter(id=section_id).update(order=index)
+        page = self.get_page()
+        bulk_reorder(
+            DeliverableSection,
+            [
+                {'id': section_id, 'order': index, 'rank': rank_for_order(index)}
+                for index, section_id in enumerate(section_ids)
+            ],
+            scope={'page_id': page.id},
+            fields=('order', 'rank'),
+        )
         return Response({'status': 'reordered'})
 
 
@@ -151,9 +160,7 @@ class ClientDocumentViewSet(viewsets.ModelViewSet):
         return ClientDocumentSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
-        client = get_object_or_404(Client, slug=client_slug)
-        queryset = ClientDocument.objects.filter(client=client)
+        queryset = ClientDocument.objects.filter(client_id=get_tenant(self.request).id)
 
         # Filter by category
         category = self.request.query_params.get('category')
@@ -168,20 +175,16 @@ class ClientDocumentViewSet(viewsets.ModelViewSet):
         return queryset
 
     def perform_create(self, serializer):
-        client_slug = self.kwargs.get('client_slug')
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(self.request)
         serializer.save(client=client)
 
     @action(detail=False, methods=['get'])
     def categories(self, request, client_slug=None):
         """Get all document categories with counts."""
-        client = get_object_or_404(Client, slug=client_slug)
-        categories = ClientDocument.objects.filter(client=client).values('category').distinct()
-        result = []
-        for cat in categories:
-            count = ClientDocument.objects.filter(client=client, category=cat['category']).count()
-            result.append({
-                'category': cat['category'],
-                'count': count,
-            })
-        return Response(result)
+        # One grouped query; order_by() keeps Meta.ordering out of the GROUP BY
+        counts = ClientDocument.objects.filter(
+            client_id=get_tenant(request).id
+        ).values('category').annotate(count=Count('id')).order_by('category')
+        return Response([
+            {'category': row['category'], 'count': row['count']} for row in counts
+        ])
@@ -48,6 +48,7 @@ class Meeting(models.Model):
     transcript_source = models.CharField(max_length=50, choices=TRANSCRIPT_SOURCE_CHOICES, blank=True, null=True)
     transcript_duration = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     transcript_language = models.CharField(max_length=10, blank=True, null=True)
+    transcript_segments = models.JSONField(blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from utils.fast_serializers import FastSerializer
 from .models import Meeting, Update, Blocker, Attachment, MeetingSummary
 
 
@@ -14,6 +15,9 @@ class MeetingSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'meeting_code', 'created_at', 'updated_at']
 
 
+MeetingFastSerializer = FastSerializer(MeetingSerializer)
+
+
 class MeetingCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Meeting
@@ -41,6 +45,9 @@ class UpdateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'update_code', 'created_at', 'updated_at']
 
 
+UpdateFastSerializer = FastSerializer(UpdateSerializer)
+
+
 class UpdateCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Update
@@ -69,6 +76,9 @@ class BlockerSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'blocker_code', 'created_at', 'updated_at']
 
 
+BlockerFastSerializer = FastSerializer(BlockerSerializer)
+
+
 class BlockerCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Blocker
@@ -96,6 +106,9 @@ class AttachmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
+AttachmentFastSerializer = FastSerializer(AttachmentSerializer)
+
+
 class AttachmentCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Attachment
@@ -1,3 +1,32 @@
+import datetime
+
 from django.test import TestCase
+from django.urls import reverse
+
+from apps.clients.models import Client
+from apps.suggestions.models import AISuggestion
+
+from .models import Meeting
+
+
+class MeetingSuggestionsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        cls.meeting = Meeting.objects.create(
+            client=cls.client_, meeting_code='M1', title='Kickoff', date=datetime.date(2026, 3, 2)
+        )
+        AISuggestion.objects.bulk_create([
+            AISuggestion(meeting=cls.meeting, client=cls.client_, suggestion_type='decision',
+                         suggested_content={'title': f'Decision {n}'})
+            for n in range(3)
+        ])
 
-# Create your tests here.
+    def test_suggestions_is_a_plain_list(self):
+        # The frontend (services/api.ts getSuggestions) expects an array
+        url = reverse('meetings-suggestions', kwargs={'client_slug': self.client_.slug, 'pk': self.meeting.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.json(), list)
+        self.assertEqual(len(response.json()), 3)
@@ -1,29 +1,32 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from apps.clients.models import Client
+from apps.clients.tenancy import get_tenant
+from utils.fast_serializers import FastListMixin
+from utils.parsers import FastJSONParser, MessagePackParser
 from .models import Meeting, Update, Blocker, Attachment, MeetingSummary
 from .serializers import (
     MeetingSerializer, MeetingCreateSerializer,
     UpdateSerializer, UpdateCreateSerializer,
     BlockerSerializer, BlockerCreateSerializer,
     AttachmentSerializer, AttachmentCreateSerializer,
-    MeetingSummarySerializer, MeetingSummaryCreateSerializer
+    MeetingSummarySerializer, MeetingSummaryCreateSerializer,
+    MeetingFastSerializer, UpdateFastSerializer, BlockerFastSerializer, AttachmentFastSerializer
 )
 
 
-class MeetingViewSet(viewsets.ModelViewSet):
+class MeetingViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for Meeting CRUD operations."""
+    fast_serializer = MeetingFastSerializer
     serializer_class = MeetingSerializer
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, FastJSONParser, MessagePackParser]
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
-        return Meeting.objects.filter(client__slug=client_slug)
+        return Meeting.objects.filter(client_id=get_tenant(self.request).id)
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -32,8 +35,7 @@ class MeetingViewSet(viewsets.ModelViewSet):
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        client_slug = self.kwargs.get('client_slug')
-        context['client'] = get_object_or_404(Client, slug=client_slug)
+        context['client'] = get_tenant(self.request)
         return context
 
     @action(detail=True, methods=['post'])
@@ -65,6 +67,7 @@ class MeetingViewSet(viewsets.ModelViewSet):
         meeting.transcript_filename = file.name
         meeting.transcript_uploaded_at = timezone.now()
         meeting.transcript_source = source
+        meeting.transcript_segments = None
         meeting.save()
 
         return Response({
@@ -96,7 +99,11 @@ class MeetingViewSet(viewsets.ModelViewSet):
                 'message': 'Analysis complete',
                 'meeting_id': str(meeting.id),
                 'answers_applied': result.get('answers_applied', 0),
+                'answers_ungrounded': result.get('answers_ungrounded', 0),
                 'suggestions_created': result.get('suggestions_created', 0),
+                'duplicates_flagged': result.get('duplicates_flagged', 0),
+                'duplicates_merged': result.get('duplicates_merged', 0),
+                'auto_approved': result.get('auto_approved', 0),
                 'summary_generated': result.get('summary_generated', False),
             })
         except Exception as e:
@@ -117,14 +124,14 @@ class MeetingViewSet(viewsets.ModelViewSet):
         return Response(AISuggestionSerializer(suggestions, many=True).data)
 
 
-class UpdateViewSet(viewsets.ModelViewSet):
+class UpdateViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for Update CRUD operations."""
+    fast_serializer = UpdateFastSerializer
     serializer_class = UpdateSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
         meeting_id = self.request.query_params.get('meeting')
-        queryset = Update.objects.filter(client__slug=client_slug)
+        queryset = Update.objects.filter(client_id=get_tenant(self.request).id)
         if meeting_id:
             queryset = queryset.filter(meeting_id=meeting_id)
         return queryset
@@ -136,20 +143,19 @@ class UpdateViewSet(viewsets.ModelViewSet):
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        client_slug = self.kwargs.get('client_slug')
-        context['client'] = get_object_or_404(Client, slug=client_slug)
+        context['client'] = get_tenant(self.request)
         return context
 
 
-class BlockerViewSet(viewsets.ModelViewSet):
+class BlockerViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for Blocker CRUD operations."""
+    fast_serializer = BlockerFastSerializer
     serializer_class = BlockerSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
         meeting_id = self.request.query_params.get('meeting')
         status_filter = self.request.query_params.get('status')
-        queryset = Blocker.objects.filter(client__slug=client_slug)
+        queryset = Blocker.objects.filter(client_id=get_tenant(self.request).id)
         if meeting_id:
             queryset = queryset.filter(meeting_id=meeting_id)
         if status_filter:
@@ -163,8 +169,7 @@ class BlockerViewSet(viewsets.ModelViewSet):
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        client_slug = self.kwargs.get('client_slug')
-        context['client'] = get_object_or_404(Client, slug=client_slug)
+        context['client'] = get_tenant(self.request)
         return context
 
     @action(detail=True, methods=['post'])
@@ -179,14 +184,14 @@ class BlockerViewSet(viewsets.ModelViewSet):
         return Response(BlockerSerializer(blocker).data)
 
 
-class AttachmentViewSet(viewsets.ModelViewSet):
+class AttachmentViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for Attachment CRUD operations."""
+    fast_serializer = AttachmentFastSerializer
     serializer_class = AttachmentSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
         meeting_id = self.request.query_params.get('meeting')
-        queryset = Attachment.objects.filter(client__slug=client_slug)
+        queryset = Attachment.objects.filter(client_id=get_tenant(self.request).id)
         if meeting_id:
             queryset = queryset.filter(meeting_id=meeting_id)
         return queryset
@@ -198,8 +203,7 @@ class AttachmentViewSet(viewsets.ModelViewSet):
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        client_slug = self.kwargs.get('client_slug')
-        context['client'] = get_object_or_404(Client, slug=client_slug)
+        context['client'] = get_tenant(self.request)
         return context
 
 
@@ -208,7 +212,7 @@ class MeetingSummaryView(APIView):
 
     def get(self, request, client_slug, meeting_id):
         """Get summary for a meeting."""
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(request)
         meeting = get_object_or_404(Meeting, id=meeting_id, client=client)
         try:
             summary = MeetingSummary.objects.get(meeting=meeting)
@@ -218,7 +222,7 @@ class MeetingSummaryView(APIView):
 
     def post(self, request, client_slug, meeting_id):
         """Create or update summary for a meeting."""
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(request)
         meeting = get_object_or_404(Meeting, id=meeting_id, client=client)
 
         data = request.data.copy()
@@ -239,7 +243,7 @@ class MeetingSummaryView(APIView):
 
     def delete(self, request, client_slug, meeting_id):
         """Delete summary for a meeting."""
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(request)
         meeting = get_object_or_404(Meeting, id=meeting_id, client=client)
         try:
             summary = MeetingSummary.objects.get(meeting=meeting)
@@ -39,6 +39,7 @@ class Question(models.Model):
     answer = models.TextField(blank=True, null=True)
     answered_by = models.CharField(max_length=255, blank=True, null=True)
     answered_date = models.DateField(blank=True, null=True)
+    answer_grounding = models.JSONField(blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from utils.fast_serializers import FastSerializer
 from .models import Question
 
 
@@ -7,10 +8,13 @@ class QuestionSerializer(serializers.ModelSerializer):
         model = Question
         fields = [
             'id', 'question_code', 'category', 'question', 'status', 'priority',
-            'asked_in_meeting', 'answer', 'answered_by', 'answered_date', 'notes',
-            'created_at', 'updated_at'
+            'asked_in_meeting', 'answer', 'answered_by', 'answered_date', 'answer_grounding',
+            'notes', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'question_code', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'question_code', 'answer_grounding', 'created_at', 'updated_at']
+
+
+QuestionFastSerializer = FastSerializer(QuestionSerializer)
 
 
 class QuestionCreateSerializer(serializers.ModelSerializer):
@@ -1,20 +1,20 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from apps.clients.models import Client
+from apps.clients.tenancy import get_tenant
+from utils.fast_serializers import FastListMixin
 from .models import Question
-from .serializers import QuestionSerializer, QuestionCreateSerializer, AnswerQuestionSerializer
+from .serializers import QuestionSerializer, QuestionCreateSerializer, AnswerQuestionSerializer, QuestionFastSerializer
 
 
-class QuestionViewSet(viewsets.ModelViewSet):
+class QuestionViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for Question CRUD operations."""
+    fast_serializer = QuestionFastSerializer
     serializer_class = QuestionSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
-        queryset = Question.objects.filter(client__slug=client_slug)
+        queryset = Question.objects.filter(client_id=get_tenant(self.request).id)
 
         # Filter by status if provided
         status_filter = self.request.query_params.get('status')
@@ -35,8 +35,7 @@ class QuestionViewSet(viewsets.ModelViewSet):
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        client_slug = self.kwargs.get('client_slug')
-        context['client'] = get_object_or_404(Client, slug=client_slug)
+        context['client'] = get_tenant(self.request)
         return context
 
     def perform_create(self, serializer):
@@ -53,6 +52,7 @@ class QuestionViewSet(viewsets.ModelViewSet):
         question.answer = serializer.validated_data['answer']
         question.answered_by = serializer.validated_data.get('answered_by', '')
         question.answered_date = timezone.now().date()
+        question.answer_grounding = None
         question.status = serializer.validated_data.get('status', 'answered')
         question.save()
 
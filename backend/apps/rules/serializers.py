@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from utils.fast_serializers import FastSerializer
 from .models import BusinessRule, Decision
 
 
@@ -12,6 +13,9 @@ class BusinessRuleSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'rule_code', 'created_at', 'updated_at']
 
 
+BusinessRuleFastSerializer = FastSerializer(BusinessRuleSerializer)
+
+
 class BusinessRuleCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = BusinessRule
@@ -38,6 +42,9 @@ class DecisionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'decision_code', 'created_at', 'updated_at']
 
 
+DecisionFastSerializer = FastSerializer(DecisionSerializer)
+
+
 class DecisionCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Decision
@@ -1,20 +1,21 @@
 from rest_framework import viewsets
-from django.shortcuts import get_object_or_404
-from apps.clients.models import Client
+from apps.clients.tenancy import get_tenant
+from utils.fast_serializers import FastListMixin
 from .models import BusinessRule, Decision
 from .serializers import (
     BusinessRuleSerializer, BusinessRuleCreateSerializer,
-    DecisionSerializer, DecisionCreateSerializer
+    DecisionSerializer, DecisionCreateSerializer,
+    BusinessRuleFastSerializer, DecisionFastSerializer
 )
 
 
-class BusinessRuleViewSet(viewsets.ModelViewSet):
+class BusinessRuleViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for BusinessRule CRUD operations."""
+    fast_serializer = BusinessRuleFastSerializer
     serializer_class = BusinessRuleSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
-        queryset = BusinessRule.objects.filter(client__slug=client_slug)
+        queryset = BusinessRule.objects.filter(client_id=get_tenant(self.request).id)
 
         # Filter by category if provided
         category = self.request.query_params.get('category')
@@ -30,23 +31,21 @@ class BusinessRuleViewSet(viewsets.ModelViewSet):
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        client_slug = self.kwargs.get('client_slug')
-        context['client'] = get_object_or_404(Client, slug=client_slug)
+        context['client'] = get_tenant(self.request)
         return context
 
     def perform_create(self, serializer):
-        client_slug = self.kwargs.get('client_slug')
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(self.request)
         serializer.save(client=client)
 
 
-class DecisionViewSet(viewsets.ModelViewSet):
+class DecisionViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for Decision CRUD operations."""
+    fast_serializer = DecisionFastSerializer
     serializer_class = DecisionSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
-        return Decision.objects.filter(client__slug=client_slug)
+        return Decision.objects.filter(client_id=get_tenant(self.request).id)
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -55,11 +54,9 @@ class DecisionViewSet(viewsets.ModelViewSet):
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        client_slug = self.kwargs.get('client_slug')
-        context['client'] = get_object_or_404(Client, slug=client_slug)
+        context['client'] = get_tenant(self.request)
         return context
 
     def perform_create(self, serializer):
-        client_slug = self.kwargs.get('client_slug')
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(self.request)
         serializer.save(client=client)
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class ScheduleConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.schedule'
+    verbose_name = 'Schedule'
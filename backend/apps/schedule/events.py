@@ -0,0 +1,149 @@
+"""
+Calendar entries across sprints, milestones, meetings and action items.
+
+Every source is fetched with an interval-overlap filter on its own date
+columns (``start <= window_end AND end >= window_start``), which the
+planner answers from the per-column date indexes instead of shipping whole
+boards to the browser to filter there. Rows come back as ``values()``
+dicts, so no model instances are built.
+
+``fingerprint`` is the cheap change detector behind the ETags: one
+statement returning the row count and latest ``updated_at`` per source
+table for the client.
+"""
+
+import hashlib
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Q
+
+from apps.actions.models import ActionItem
+from apps.meetings.models import Meeting
+from apps.sprints.models import DeliveryMilestone, SprintItem
+
+# Default window when start/end are omitted (the .ics feed uses the same)
+DEFAULT_PAST_DAYS = 30
+DEFAULT_FUTURE_DAYS = 180
+MAX_WINDOW_DAYS = 731
+
+SOURCES = (SprintItem, DeliveryMilestone, Meeting, ActionItem)
+
+
+def default_window(today):
+    return today - timedelta(days=DEFAULT_PAST_DAYS), today + timedelta(days=DEFAULT_FUTURE_DAYS)
+
+
+def sprint_items(client_id, start, end):
+    """Items overlapping the window; a single date makes a one-day item."""
+    return SprintItem.objects.filter(client_id=client_id).filter(
+        Q(start_date__lte=end, end_date__gte=start)
+        | Q(end_date__isnull=True, start_date__range=(start, end))
+        | Q(start_date__isnull=True, end_date__range=(start, end))
+    ).order_by('start_date', 'end_date').values(
+        'id', 'item_code', 'name', 'item_type', 'status', 'assigned_to',
+        'sprint_id', 'start_date', 'end_date', 'updated_at',
+    )
+
+
+def milestones(client_id, start, end):
+    return DeliveryMilestone.objects.filter(client_id=client_id, start_date__lte=end).filter(
+        Q(end_date__gte=start) | Q(end_date__isnull=True, start_date__gte=start)
+    ).order_by('start_date').values(
+        'id', 'milestone_code', 'name', 'milestone_type', 'status', 'color',
+        'start_date', 'end_date', 'updated_at',
+    )
+
+
+def meetings(client_id, start, end):
+    return Meeting.objects.filter(
+        client_id=client_id, date__range=(start, end)
+    ).order_by('date').values(
+        'id', 'meeting_code', 'title', 'status', 'date', 'updated_at',
+    )
+
+
+def action_items(client_id, start, end):
+    return ActionItem.objects.filter(
+        client_id=client_id, due_date__range=(start, end)
+    ).order_by('due_date').values(
+        'id', 'action_code', 'title', 'status', 'priority', 'assigned_to',
+        'due_date', 'updated_at',
+    )
+
+
+def entries(client_id, start, end):
+    """All calendar entries in the window as uniform dicts (four queries).
+
+    ``end`` is inclusive. Each entry carries ``type``, ``id``, ``code``,
+    ``title``, ``start``, ``end``, ``status`` and ``updated_at`` plus a
+    few type-specific fields.
+    """
+    for row in sprint_items(client_id, start, end):
+        yield {
+            'type': 'sprint_item',
+            'id': row['id'],
+            'code': row['item_code'],
+            'title': row['name'],
+            'start': row['start_date'] or row['end_date'],
+            'end': row['end_date'] or row['start_date'],
+            'status': row['status'],
+            'item_type': row['item_type'],
+            'assigned_to': row['assigned_to'],
+            'sprint_id': row['sprint_id'],
+            'updated_at': row['updated_at'],
+        }
+    for row in milestones(client_id, start, end):
+        yield {
+            'type': 'milestone',
+            'id': row['id'],
+            'code': row['milestone_code'],
+            'title': row['name'],
+            'start': row['start_date'],
+            'end': row['end_date'] or row['start_date'],
+            'status': row['status'],
+            'milestone_type': row['milestone_type'],
+            'color': row['color'],
+            'updated_at': row['updated_at'],
+        }
+    for row in meetings(client_id, start, end):
+        yield {
+            'type': 'meeting',
+            'id': row['id'],
+            'code': row['meeting_code'],
+            'title': row['title'],
+            'start': row['date'],
+            'end': row['date'],
+            'status': row['status'],
+            'updated_at': row['updated_at'],
+        }
+    for row in action_items(client_id, start, end):
+        yield {
+            'type': 'action_item',
+            'id': row['id'],
+            'code': row['action_code'],
+            'title': row['title'],
+            'start': row['due_date'],
+            'end': row['due_date'],
+            'status': row['status'],
+            'priority': row['priority'],
+            'assigned_to': row['assigned_to'],
+            'updated_at': row['updated_at'],
+        }
+
+
+def fingerprint(client_id):
+    """Hex digest that changes whenever any source row of the client does.
+
+    Inserts and edits move the latest ``updated_at``; deletes change the
+    count.
+    """
+    qn = connection.ops.quote_name
+    selects = [
+        f'SELECT COUNT(*), MAX(updated_at) FROM {qn(model._meta.db_table)} WHERE client_id = %s'
+        for model in SOURCES
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(' UNION ALL '.join(selects), [client_id] * len(selects))
+        rows = cursor.fetchall()
+    return hashlib.md5(repr(rows).encode(), usedforsecurity=False).hexdigest()
@@ -0,0 +1,92 @@
+"""
+RFC 5545 serialization for the calendar feed.
+
+Entries become all-day VEVENTs (``DTEND`` is exclusive, hence the extra
+day). Lines are folded at 75 octets and text values escaped, and the body
+is produced line by line so the feed can be streamed.
+"""
+
+from datetime import timedelta, timezone as dt_timezone
+
+PRODID = '-//Morichal AI//Assessment Portal//EN'
+UID_DOMAIN = 'morichal-assessment'
+LINE_OCTETS = 75
+
+TYPE_LABELS = {
+    'sprint_item': 'Sprint item',
+    'milestone': 'Milestone',
+    'meeting': 'Meeting',
+    'action_item': 'Action item',
+}
+
+
+def escape(text):
+    return (
+        (text or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """Split ``line`` into CRLF-terminated chunks of at most 75 octets."""
+    if len(line.encode()) <= LINE_OCTETS:
+        return line + '\r\n'
+    chunks = []
+    current, size = '', 0
+    for char in line:
+        width = len(char.encode())
+        # Continuation lines start with a space, which counts towards the limit
+        limit = LINE_OCTETS if not chunks else LINE_OCTETS - 1
+        if size + width > limit:
+            chunks.append(current)
+            current, size = '', 0
+        current += char
+        size += width
+    chunks.append(current)
+    return '\r\n '.join(chunks) + '\r\n'
+
+
+def _date(value):
+    return value.strftime('%Y%m%d')
+
+
+def _timestamp(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def event_lines(entry):
+    label = TYPE_LABELS[entry['type']]
+    description = f'{label} {entry["code"]} ({entry["status"]})'
+    if entry.get('assigned_to'):
+        description += f'\nAssigned to {entry["assigned_to"]}'
+    yield 'BEGIN:VEVENT'
+    yield f'UID:{entry["type"]}-{entry["id"]}@{UID_DOMAIN}'
+    yield f'DTSTAMP:{_timestamp(entry["updated_at"])}'
+    yield f'LAST-MODIFIED:{_timestamp(entry["updated_at"])}'
+    yield f'DTSTART;VALUE=DATE:{_date(entry["start"])}'
+    yield f'DTEND;VALUE=DATE:{_date(entry["end"] + timedelta(days=1))}'
+    summary = f'{entry["code"]}: {entry["title"]}'
+    yield f'SUMMARY:{escape(summary)}'
+    yield f'DESCRIPTION:{escape(description)}'
+    yield f'CATEGORIES:{escape(label)}'
+    if entry['status'] == 'cancelled':
+        yield 'STATUS:CANCELLED'
+    yield 'END:VEVENT'
+
+
+def calendar_stream(name, entries):
+    """Yield the folded lines of a VCALENDAR holding ``entries``."""
+    yield fold('BEGIN:VCALENDAR')
+    yield fold('VERSION:2.0')
+    yield fold(f'PRODID:{PRODID}')
+    yield fold('CALSCALE:GREGORIAN')
+    yield fold('METHOD:PUBLISH')
+    yield fold(f'X-WR-CALNAME:{escape(name)}')
+    for entry in entries:
+        for line in event_lines(entry):
+            yield fold(line)
+    yield fold('END:VCALENDAR')
@@ -0,0 +1,152 @@
+import datetime
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from apps.clients.models import Client
+from apps.clients.tenancy import local_cache
+from apps.sprints.models import Sprint, SprintItem
+
+from .ical import LINE_OCTETS, escape, event_lines, fold
+
+UPDATED_AT = datetime.datetime(2026, 3, 2, 9, 30, tzinfo=datetime.timezone.utc)
+
+
+def unfold(text):
+    return text.replace('\r\n ', '')
+
+
+class FoldTests(SimpleTestCase):
+
+    def assertFolded(self, line):
+        folded = fold(line)
+        self.assertTrue(folded.endswith('\r\n'))
+        physical = folded[:-2].split('\r\n')
+        for n, part in enumerate(physical):
+            self.assertLessEqual(len(part.encode()), LINE_OCTETS)
+            if n:
+                self.assertTrue(part.startswith(' '))
+        self.assertEqual(unfold(folded[:-2]), line)
+        return physical
+
+    def test_short_line_untouched(self):
+        self.assertEqual(fold('VERSION:2.0'), 'VERSION:2.0\r\n')
+        self.assertEqual(fold('X' * LINE_OCTETS), 'X' * LINE_OCTETS + '\r\n')
+
+    def test_long_ascii_line(self):
+        physical = self.assertFolded('SUMMARY:' + 'a' * 200)
+        self.assertEqual(len(physical[0]), LINE_OCTETS)
+        self.assertEqual(len(physical[1]), LINE_OCTETS)
+
+    def test_multibyte_characters_not_split(self):
+        for line in ('SUMMARY:' + 'é' * 100, 'SUMMARY:x' + '日本語' * 40, 'SUMMARY:' + '😀' * 50):
+            with self.subTest(line=line[:12]):
+                self.assertFolded(line)
+
+    def test_escape(self):
+        self.assertEqual(escape('a;b,c\\d\r\ne\nf'), 'a\\;b\\,c\\\\d\\ne\\nf')
+        self.assertEqual(escape(None), '')
+
+
+class EventLinesTests(SimpleTestCase):
+
+    def entry(self, **fields):
+        return {
+            'type': 'sprint_item', 'id': 'abc', 'code': 'S1-1', 'title': 'Build, test; ship',
+            'start': datetime.date(2026, 3, 2), 'end': datetime.date(2026, 3, 4), 'status': 'planned',
+            'assigned_to': 'Ana', 'updated_at': UPDATED_AT, **fields,
+        }
+
+    def test_all_day_event(self):
+        lines = list(event_lines(self.entry()))
+        self.assertEqual(lines[0], 'BEGIN:VEVENT')
+        self.assertIn('UID:sprint_item-abc@morichal-assessment', lines)
+        self.assertIn('DTSTAMP:20260302T093000Z', lines)
+        self.assertIn('DTSTART;VALUE=DATE:20260302', lines)
+        # DTEND is exclusive
+        self.assertIn('DTEND;VALUE=DATE:20260305', lines)
+        self.assertIn('SUMMARY:S1-1: Build\\, test\\; ship', lines)
+        self.assertIn('DESCRIPTION:Sprint item S1-1 (planned)\\nAssigned to Ana', lines)
+        self.assertNotIn('STATUS:CANCELLED', lines)
+
+    def test_cancelled(self):
+        lines = list(event_lines(self.entry(type='milestone', status='cancelled', assigned_to=None)))
+        self.assertIn('STATUS:CANCELLED', lines)
+        self.assertIn('DESCRIPTION:Milestone S1-1 (cancelled)', lines)
+
+
+class CalendarFeedTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme, Inc.', slug='acme')
+        cls.sprint = Sprint.objects.create(
+            client=cls.client_, sprint_code='S1', name='Sprint 1',
+            start_date=datetime.date(2026, 3, 2), end_date=datetime.date(2026, 3, 15),
+        )
+        cls.item = SprintItem.objects.create(
+            client=cls.client_, sprint=cls.sprint, item_code='S1-1', name='Inside',
+            start_date=datetime.date(2026, 3, 3), end_date=datetime.date(2026, 3, 5),
+        )
+        SprintItem.objects.create(
+            client=cls.client_, sprint=cls.sprint, item_code='S1-2', name='Outside',
+            start_date=datetime.date(2026, 5, 1), end_date=datetime.date(2026, 5, 2),
+        )
+
+    def setUp(self):
+        local_cache.clear()
+        self.url = reverse('calendar-feed', kwargs={'client_slug': self.client_.slug})
+        self.params = {'start': '2026-03-01', 'end': '2026-03-31'}
+
+    def get(self, **headers):
+        local_cache.clear()
+        return self.client.get(self.url, self.params, headers=headers)
+
+    def test_feed(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = b''.join(response.streaming_content).decode()
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(body.endswith('END:VCALENDAR\r\n'))
+        self.assertIn('X-WR-CALNAME:Acme\\, Inc.', body)
+        self.assertEqual(body.count('BEGIN:VEVENT'), 1)
+        self.assertIn(f'UID:sprint_item-{self.item.pk}@', body)
+
+    def test_etag_revalidation(self):
+        etag = self.get()['ETag']
+        with self.assertNumQueries(1):  # the fingerprint; the first request cached the tenant
+            self.assertEqual(self.get(**{'If-None-Match': etag}).status_code, 304)
+
+        self.item.name = 'Renamed'
+        self.item.save()
+        changed = self.get(**{'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+        SprintItem.objects.filter(item_code='S1-2').delete()
+        self.assertNotEqual(self.get()['ETag'], changed['ETag'])
+
+    def test_etag_changes_after_reorder(self):
+        other = Sprint.objects.create(
+            client=self.client_, sprint_code='S2', name='Sprint 2',
+            start_date=datetime.date(2026, 3, 16), end_date=datetime.date(2026, 3, 29),
+        )
+        self.url = reverse('calendar', kwargs={'client_slug': self.client_.slug})
+        etag = self.get()['ETag']
+        response = self.client.post(
+            reverse('sprint-items-reorder', kwargs={'client_slug': self.client_.slug}),
+            {'items': [{'id': str(self.item.pk), 'order': 0, 'sprint_id': str(other.pk)}]},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        changed = self.get(**{'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        entry, = [e for e in changed.json()['entries'] if e['id'] == str(self.item.pk)]
+        self.assertEqual(entry['sprint_id'], str(other.pk))
+
+    def test_bad_window(self):
+        self.params = {'start': '2026-03-31', 'end': '2026-03-01'}
+        self.assertEqual(self.get().status_code, 400)
+        self.params = {'start': 'yesterday'}
+        self.assertEqual(self.get().status_code, 400)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import CalendarView, calendar_feed
+
+urlpatterns = [
+    path('calendar/', CalendarView.as_view(), name='calendar'),
+    path('calendar.ics', calendar_feed, name='calendar-feed'),
+]
@@ -0,0 +1,81 @@
+import hashlib
+from datetime import date
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition, require_GET
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.clients.tenancy import get_tenant
+from .events import MAX_WINDOW_DAYS, default_window, entries, fingerprint
+from .ical import calendar_stream
+
+
+def _window(params):
+    """Parse ``start``/``end`` (ISO dates, end inclusive); raises ValueError."""
+    start, end = default_window(timezone.now().date())
+    if params.get('start'):
+        start = date.fromisoformat(params['start'])
+    if params.get('end'):
+        end = date.fromisoformat(params['end'])
+    if end < start or (end - start).days >= MAX_WINDOW_DAYS:
+        raise ValueError(f'end must be on or after start and within {MAX_WINDOW_DAYS} days')
+    return start, end
+
+
+def calendar_etag(request, client_slug):
+    """ETag from the client's source-table fingerprint plus the request URL.
+
+    Costs one aggregate query, so pollers get a 304 without any rows being
+    fetched or rendered. The default window moves with the date, so the day
+    is part of the tag.
+    """
+    digest = fingerprint(get_tenant(request).id)
+    key = f'{digest}:{request.get_full_path()}:{timezone.now().date()}'
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def _revalidate(response):
+    # Let browsers and calendar apps keep the body but check the ETag each time
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@method_decorator(condition(etag_func=calendar_etag), name='get')
+class CalendarView(APIView):
+    """Sprint items, milestones, meetings and action items overlapping a window."""
+
+    def get(self, request, client_slug):
+        client = get_tenant(request)
+        try:
+            start, end = _window(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return _revalidate(Response({
+            'start': start,
+            'end': end,
+            'entries': list(entries(client.id, start, end)),
+        }))
+
+
+@require_GET
+@condition(etag_func=calendar_etag)
+def calendar_feed(request, client_slug):
+    """Subscribable iCalendar feed, streamed while the rows are read."""
+    client = get_tenant(request)
+    try:
+        start, end = _window(request.GET)
+    except ValueError as e:
+        return StreamingHttpResponse([str(e)], status=400, content_type='text/plain')
+
+    response = StreamingHttpResponse(
+        calendar_stream(client.name, entries(client.id, start, end)),
+        content_type='text/calendar; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'inline; filename="{client.slug}.ics"'
+    return _revalidate(response)
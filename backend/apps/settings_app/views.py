@@ -4,7 +4,7 @@ from rest_framework.views import APIView
 from rest_framework.decorators import action
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from apps.clients.models import Client
+from apps.clients.tenancy import get_tenant
 from .models import ClientSettings
 from .serializers import ClientSettingsSerializer, ClientSettingsUpdateSerializer
 
@@ -14,14 +14,14 @@ class ClientSettingsView(APIView):
 
     def get(self, request, client_slug):
         """Get settings for a client, creating defaults if needed."""
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(request)
 
         settings, created = ClientSettings.objects.get_or_create(client=client)
         return Response(ClientSettingsSerializer(settings).data)
 
     def patch(self, request, client_slug):
         """Update settings for a client."""
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(request)
         settings = get_object_or_404(ClientSettings, client=client)
 
         serializer = ClientSettingsUpdateSerializer(settings, data=request.data, partial=True)
@@ -72,7 +72,7 @@ class ResetUsageView(APIView):
 
     def post(self, request, client_slug):
         """Reset monthly usage statistics."""
-        client = get_object_or_404(Client, slug=client_slug)
+        client = get_tenant(request)
         settings = get_object_or_404(ClientSettings, client=client)
 
         settings.api_calls_this_month = 0
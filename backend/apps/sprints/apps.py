@@ -5,3 +5,12 @@ class SprintsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.sprints'
     verbose_name = 'Sprints'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from utils.ranking import add_c_collation
+
+        from . import signals
+        signals.connect()
+        connection_created.connect(add_c_collation, dispatch_uid='rank-c-collation')
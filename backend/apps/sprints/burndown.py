@@ -0,0 +1,153 @@
+"""
+Burndown and velocity read models.
+
+``sprint_item_status_events`` is an append-only log written by a trigger on
+``sprint_items`` (migrations/011_sprint_status_history.sql), so every status
+change is captured, including the ``complete`` action and the bulk paths.
+``compact_day`` folds the log into one ``sprint_daily_snapshots`` row per
+active sprint: the latest event per item as of the end of the day
+(``DISTINCT ON``) is each item's state that day, aggregated per sprint in a
+single statement. Charts then read snapshots with one indexed range query.
+"""
+
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import connection
+
+from .models import SprintDailySnapshot
+
+COMPACT_DAY_SQL = """
+WITH active AS (
+    SELECT id, client_id FROM sprints
+    WHERE start_date <= %(day)s AND end_date >= %(day)s {client_filter}
+),
+state AS (
+    SELECT DISTINCT ON (e.item_id) e.item_id, e.sprint_id, e.to_status, e.estimated_hours
+    FROM sprint_item_status_events e
+    WHERE e.changed_at < %(day_end)s
+      AND e.item_id IN (
+          SELECT item_id FROM sprint_item_status_events
+          WHERE sprint_id IN (SELECT id FROM active)
+      )
+    ORDER BY e.item_id, e.changed_at DESC, e.id DESC
+)
+INSERT INTO sprint_daily_snapshots (
+    client_id, sprint_id, snapshot_date, total_items, completed_items,
+    cancelled_items, estimated_hours, completed_hours
+)
+SELECT a.client_id, a.id, %(day)s,
+       COUNT(s.item_id),
+       COUNT(s.item_id) FILTER (WHERE s.to_status = 'completed'),
+       COUNT(s.item_id) FILTER (WHERE s.to_status = 'cancelled'),
+       COALESCE(SUM(s.estimated_hours), 0),
+       COALESCE(SUM(s.estimated_hours) FILTER (WHERE s.to_status = 'completed'), 0)
+FROM active a
+LEFT JOIN state s ON s.sprint_id = a.id AND s.to_status IS NOT NULL
+GROUP BY a.client_id, a.id
+ON CONFLICT (sprint_id, snapshot_date) DO UPDATE SET
+    total_items = EXCLUDED.total_items,
+    completed_items = EXCLUDED.completed_items,
+    cancelled_items = EXCLUDED.cancelled_items,
+    estimated_hours = EXCLUDED.estimated_hours,
+    completed_hours = EXCLUDED.completed_hours
+"""
+
+
+def compact_day(day, client_id=None):
+    """Write (or refresh) the snapshot rows for every sprint active on ``day``.
+
+    Returns the number of snapshot rows written.
+    """
+    day_end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=dt_timezone.utc)
+    params = {'day': day, 'day_end': day_end}
+    client_filter = ''
+    if client_id is not None:
+        client_filter = 'AND client_id = %(client_id)s'
+        params['client_id'] = client_id
+
+    with connection.cursor() as cursor:
+        cursor.execute(COMPACT_DAY_SQL.format(client_filter=client_filter), params)
+        return cursor.rowcount
+
+
+def compact_range(start, end, client_id=None):
+    """Compact every day from ``start`` to ``end`` inclusive."""
+    written = 0
+    day = start
+    while day <= end:
+        written += compact_day(day, client_id=client_id)
+        day += timedelta(days=1)
+    return written
+
+
+def _decimal(value):
+    return str(Decimal(value).quantize(Decimal('0.01')))
+
+
+def sprint_burndown(sprint):
+    """Daily remaining work for ``sprint`` from its snapshots (one range query)."""
+    snapshots = SprintDailySnapshot.objects.filter(
+        sprint=sprint,
+        snapshot_date__range=(sprint.start_date, sprint.end_date),
+    ).order_by('snapshot_date').values(
+        'snapshot_date', 'total_items', 'completed_items', 'cancelled_items',
+        'estimated_hours', 'completed_hours',
+    )
+
+    days = []
+    for row in snapshots:
+        scope = row['total_items'] - row['cancelled_items']
+        days.append({
+            'date': row['snapshot_date'],
+            'total_items': row['total_items'],
+            'completed_items': row['completed_items'],
+            'remaining_items': scope - row['completed_items'],
+            'estimated_hours': _decimal(row['estimated_hours']),
+            'remaining_hours': _decimal(row['estimated_hours'] - row['completed_hours']),
+        })
+
+    return {
+        'sprint_id': sprint.id,
+        'sprint_code': sprint.sprint_code,
+        'start_date': sprint.start_date,
+        'end_date': sprint.end_date,
+        'days': days,
+    }
+
+
+def client_velocity(client_id, last=6):
+    """Completed work per sprint from each sprint's latest snapshot.
+
+    Returns the sprints (most recent first) and averages over the ``last``
+    sprints that have already ended.
+    """
+    latest = (
+        SprintDailySnapshot.objects.filter(client_id=client_id)
+        .select_related('sprint')
+        .order_by('sprint_id', '-snapshot_date')
+        .distinct('sprint_id')
+    )
+    rows = sorted(latest, key=lambda s: s.sprint.end_date, reverse=True)
+
+    sprints = [
+        {
+            'sprint_id': s.sprint_id,
+            'sprint_code': s.sprint.sprint_code,
+            'name': s.sprint.name,
+            'start_date': s.sprint.start_date,
+            'end_date': s.sprint.end_date,
+            'as_of': s.snapshot_date,
+            'completed_items': s.completed_items,
+            'completed_hours': _decimal(s.completed_hours),
+        }
+        for s in rows
+    ]
+
+    finished = [s for s in rows if s.snapshot_date >= s.sprint.end_date][:last]
+    count = len(finished)
+    return {
+        'sprints': sprints,
+        'average_completed_items': round(sum(s.completed_items for s in finished) / count, 1) if count else 0,
+        'average_completed_hours': _decimal(sum(s.completed_hours for s in finished) / count) if count else '0.00',
+    }
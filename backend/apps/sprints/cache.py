@@ -0,0 +1,67 @@
+"""
+Per-client cache for sprint read models.
+
+Every cached payload key embeds a per-client version number. Writes to
+Sprint, SprintItem or DeliveryMilestone bump the version (see ``signals``),
+which orphans all earlier payloads at once instead of deleting keys one by
+one; bulk paths that bypass model signals (``QuerySet.update``) call
+``bump_version`` themselves.
+
+The version lives in the cache, so it has to be one every worker shares:
+with a per-process cache a write would only invalidate the worker that
+made it. Caching is therefore off unless ``ROADMAP_CACHE_ENABLED`` (set
+when ``REDIS_URL`` is configured); payloads are then built per request.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from utils.metrics import record_cache
+
+
+def _version_key(client_id):
+    return f'sprints:version:{client_id}'
+
+
+def get_version(client_id):
+    key = _version_key(client_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from a clock value so an evicted counter never reuses an old version
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(client_id):
+    """Invalidate the client's cached payloads once the transaction commits."""
+    if not settings.ROADMAP_CACHE_ENABLED:
+        return
+
+    def bump():
+        try:
+            cache.incr(_version_key(client_id))
+        except ValueError:
+            cache.set(_version_key(client_id), time.time_ns(), timeout=None)
+    transaction.on_commit(bump)
+
+
+def cache_key(client_id, name, *parts):
+    suffix = ':'.join(str(part) for part in parts)
+    return f'sprints:{name}:{client_id}:{get_version(client_id)}:{suffix}'
+
+
+def get_or_build(client_id, name, build, *parts, timeout=None):
+    """Return the cached payload ``name`` for the client, building it on a miss."""
+    if not settings.ROADMAP_CACHE_ENABLED:
+        return build()
+    key = cache_key(client_id, name, *parts)
+    payload = cache.get(key)
+    record_cache(f'sprints:{name}', payload is not None)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, timeout=timeout or settings.ROADMAP_CACHE_TIMEOUT)
+    return payload
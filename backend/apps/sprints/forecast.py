@@ -0,0 +1,167 @@
+"""
+Monte Carlo delivery forecasts for sprints and delivery milestones.
+
+Historical throughput is the client's completed items per calendar day over
+a recent window (days with no completions count as zero). Each trial draws
+a daily throughput sequence from that history; all trials are simulated at
+once as a ``(trials, horizon)`` NumPy matrix whose running sum is compared
+against the cumulative remaining work of the sprints in board order. The
+day a trial's running sum reaches a sprint's cumulative backlog is that
+sprint's completion day in that trial.
+
+A delivery milestone lands once every sprint ending on or before its target
+date is done, i.e. with the last of those sprints.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DeliveryMilestone, Sprint, SprintItem
+
+DEFAULT_TRIALS = 10000
+MAX_TRIALS = 100000
+DEFAULT_HISTORY_DAYS = 90
+MAX_HORIZON_DAYS = 730
+PERCENTILES = (50, 85, 95)
+SEED = 0
+
+
+def daily_throughput(client_id, today, history_days):
+    """Completed items per day for the last ``history_days`` days."""
+    start = today - timedelta(days=history_days)
+    completed = SprintItem.objects.filter(
+        client_id=client_id,
+        status='completed',
+        completed_at__date__gte=start,
+        completed_at__date__lt=today,
+    ).values_list('completed_at', flat=True)
+
+    offsets = np.fromiter(
+        ((c.date() - start).days for c in completed), dtype=np.int64
+    )
+    return np.bincount(offsets, minlength=history_days)[:history_days]
+
+
+def simulate(throughput, backlog, trials, rng):
+    """Completion day (1 = today, ``inf`` past the horizon) per trial and threshold.
+
+    ``backlog`` holds cumulative remaining item counts; returns an array of
+    shape ``(trials, len(backlog))``.
+    """
+    backlog = np.asarray(backlog, dtype=np.int64)
+    result = np.zeros((trials, len(backlog)))
+    if not len(backlog) or backlog.max() == 0:
+        return result
+
+    mean = throughput.mean()
+    if mean == 0:
+        result[:, backlog > 0] = np.inf
+        return result
+
+    # Enough days for slow trials to finish, without unbounded memory
+    horizon = int(min(MAX_HORIZON_DAYS, max(30, np.ceil(backlog.max() / mean * 3))))
+    draws = rng.choice(throughput.astype(np.int32), size=(trials, horizon))
+    burned = np.cumsum(draws, axis=1, dtype=np.int32)
+
+    for k, remaining in enumerate(backlog):
+        if remaining == 0:
+            continue
+        # Rows are non-decreasing, so days below the threshold precede completion
+        days = (burned < remaining).sum(axis=1).astype(float) + 1
+        days[burned[:, -1] < remaining] = np.inf
+        result[:, k] = days
+    return result
+
+
+def _summarize(days, today, target):
+    summary = {}
+    # inverted_cdf returns an observed trial, so trials past the horizon
+    # surface as inf (reported as null) instead of being interpolated
+    values = np.percentile(days, PERCENTILES, method='inverted_cdf')
+    for p, value in zip(PERCENTILES, values):
+        summary[f'p{p}'] = today + timedelta(days=int(value) - 1) if np.isfinite(value) else None
+    if target is not None:
+        deadline = (target - today).days + 1
+        summary['on_time_probability'] = round(float((days <= deadline).mean()), 3)
+    else:
+        summary['on_time_probability'] = None
+    return summary
+
+
+def forecast(client_id, trials=DEFAULT_TRIALS, history_days=DEFAULT_HISTORY_DAYS, today=None):
+    """P50/P85/P95 completion dates for the client's open sprints and milestones."""
+    today = today or timezone.now().date()
+    throughput = daily_throughput(client_id, today, history_days)
+
+    sprints = list(
+        Sprint.objects.filter(client_id=client_id)
+        .order_by(F('rank').asc(nulls_last=True), 'order', 'start_date')
+        .only('id', 'sprint_code', 'name', 'end_date', 'status',
+              'total_items', 'completed_items', 'cancelled_items')
+    )
+    remaining = [
+        max(s.total_items - s.completed_items - s.cancelled_items, 0)
+        if s.status != 'cancelled' else 0
+        for s in sprints
+    ]
+    backlog = np.cumsum(remaining, dtype=np.int64) if sprints else np.zeros(0, dtype=np.int64)
+
+    rng = np.random.default_rng(SEED)
+    days = simulate(throughput, backlog, trials, rng)
+
+    sprint_rows = []
+    for k, sprint in enumerate(sprints):
+        row = {
+            'id': sprint.id,
+            'sprint_code': sprint.sprint_code,
+            'name': sprint.name,
+            'end_date': sprint.end_date,
+            'remaining_items': remaining[k],
+        }
+        if remaining[k] == 0:
+            row.update({f'p{p}': None for p in PERCENTILES})
+            row.update({'done': True, 'on_time_probability': 1.0})
+        else:
+            row.update(_summarize(days[:, k], today, sprint.end_date))
+            row['done'] = False
+        sprint_rows.append(row)
+
+    milestone_rows = []
+    milestones = DeliveryMilestone.objects.filter(client_id=client_id).exclude(
+        status='completed'
+    ).order_by(F('rank').asc(nulls_last=True), 'order', 'start_date')
+    for milestone in milestones:
+        target = milestone.end_date or milestone.start_date
+        # Board position of the last sprint due by the milestone's target
+        due = [k for k, s in enumerate(sprints) if s.end_date <= target]
+        row = {
+            'id': milestone.id,
+            'milestone_code': milestone.milestone_code,
+            'name': milestone.name,
+            'target_date': target,
+            'sprints': len(due),
+        }
+        last = due[-1] if due else None
+        if last is None or backlog[last] == 0:
+            row.update({f'p{p}': None for p in PERCENTILES})
+            row.update({'done': last is not None, 'on_time_probability': 1.0 if last is not None else None})
+        else:
+            row.update(_summarize(days[:, last], today, target))
+            row['done'] = False
+        milestone_rows.append(row)
+
+    return {
+        'generated_at': timezone.now(),
+        'as_of': today,
+        'trials': trials,
+        'history_days': history_days,
+        'throughput': {
+            'mean_per_day': round(float(throughput.mean()), 2) if len(throughput) else 0,
+            'completed_items': int(throughput.sum()),
+        },
+        'sprints': sprint_rows,
+        'milestones': milestone_rows,
+    }
@@ -0,0 +1,36 @@
+"""
+Management command to build daily burndown snapshots from the status log.
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.clients.models import Client
+from apps.sprints.burndown import compact_range
+
+
+class Command(BaseCommand):
+    help = 'Compact sprint item status events into per-sprint daily snapshots'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Last day to compact (YYYY-MM-DD, default today)')
+        parser.add_argument('--days', type=int, default=2, help='Number of days ending at --date')
+        parser.add_argument('--client', help='Only compact this client slug')
+
+    def handle(self, *args, **options):
+        try:
+            end = date.fromisoformat(options['date']) if options['date'] else timezone.now().date()
+        except ValueError:
+            raise CommandError('--date must be YYYY-MM-DD')
+        start = end - timedelta(days=max(options['days'], 1) - 1)
+
+        client_id = None
+        if options['client']:
+            client = Client.objects.filter(slug=options['client']).first()
+            if client is None:
+                raise CommandError(f"Client '{options['client']}' not found")
+            client_id = client.id
+
+        written = compact_range(start, end, client_id=client_id)
+        self.stdout.write(self.style.SUCCESS(f'{written} snapshot row(s) written for {start} to {end}'))
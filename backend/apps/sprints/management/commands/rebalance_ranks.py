@@ -0,0 +1,26 @@
+"""
+Management command to rewrite fractional rank keys.
+"""
+from django.core.management.base import BaseCommand
+
+from utils.ranking import MAX_RANK_LENGTH, rebalance_all
+
+
+class Command(BaseCommand):
+    help = 'Rebalance rank keys for sprints, sprint items, milestones and deliverable sections'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-length', type=int, default=MAX_RANK_LENGTH,
+            help='Rebalance groups holding a key longer than this',
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Rebalance every group, not only those with long or missing keys',
+        )
+
+    def handle(self, *args, **options):
+        results = rebalance_all(max_length=options['max_length'], force=options['all'])
+        for label, groups in results.items():
+            self.stdout.write(f'{label}: {groups} group(s) rebalanced')
+        self.stdout.write(self.style.SUCCESS('Ranks rebalanced'))
@@ -0,0 +1,70 @@
+"""
+Management command to repair drift in the denormalized sprint counters.
+"""
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from apps.clients.models import Client
+from apps.sprints.models import Sprint, SprintItem
+
+
+class Command(BaseCommand):
+    help = 'Recompute sprint item counters and hour sums from sprint_items and fix any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--client', help='Only reconcile this client slug')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        clients = Client.objects.all()
+        if options['client']:
+            clients = clients.filter(slug=options['client'])
+
+        total_fixed = 0
+        for client in clients:
+            with transaction.atomic():
+                # Lock the client's sprints so trigger updates wait for the repair
+                sprints = list(
+                    Sprint.objects.select_for_update().filter(client=client).order_by()
+                )
+                if not sprints:
+                    continue
+
+                actual = {
+                    row['sprint_id']: row
+                    for row in SprintItem.objects.filter(sprint__client=client)
+                    .values('sprint_id')
+                    .annotate(
+                        total_items=Count('id'),
+                        completed_items=Count('id', filter=Q(status='completed')),
+                        cancelled_items=Count('id', filter=Q(status='cancelled')),
+                        estimated_hours=Sum('estimated_hours'),
+                        actual_hours=Sum('actual_hours'),
+                    )
+                    .order_by()
+                }
+
+                drifted = []
+                for sprint in sprints:
+                    row = actual.get(sprint.id, {})
+                    changed = False
+                    for field in Sprint.COUNTER_FIELDS:
+                        expected = row.get(field) or (Decimal('0') if field.endswith('hours') else 0)
+                        if getattr(sprint, field) != expected:
+                            setattr(sprint, field, expected)
+                            changed = True
+                    if changed:
+                        drifted.append(sprint)
+
+                if drifted and not options['dry_run']:
+                    Sprint.objects.bulk_update(drifted, list(Sprint.COUNTER_FIELDS))
+
+            for sprint in drifted:
+                self.stdout.write(f'{client.slug}: {sprint.sprint_code} counters drifted')
+            total_fixed += len(drifted)
+
+        verb = 'found' if options['dry_run'] else 'repaired'
+        self.stdout.write(self.style.SUCCESS(f'{total_fixed} sprint(s) with drift {verb}'))
@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.db.models import F
 
 
 class Sprint(models.Model):
@@ -25,35 +26,44 @@ class Sprint(models.Model):
     end_date = models.DateField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='planned')
     order = models.IntegerField(default=0)
+    rank = models.CharField(max_length=64, blank=True, null=True, db_collation='C')
     color = models.CharField(max_length=7, default='#3B82F6')
+    # Maintained by the sprint_items triggers (migrations/010_sprint_counters.sql)
+    total_items = models.IntegerField(default=0)
+    completed_items = models.IntegerField(default=0)
+    cancelled_items = models.IntegerField(default=0)
+    estimated_hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    actual_hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    COUNTER_FIELDS = ('total_items', 'completed_items', 'cancelled_items', 'estimated_hours', 'actual_hours')
+
     class Meta:
         db_table = 'sprints'
         managed = False
-        ordering = ['order', 'start_date']
+        ordering = [F('rank').asc(nulls_last=True), 'order', 'start_date']
         unique_together = [['client', 'sprint_code']]
 
     def __str__(self):
         return f"{self.sprint_code}: {self.name}"
 
+    def save(self, *args, **kwargs):
+        # Never write counters back from a possibly stale instance; the
+        # database triggers own them
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def progress(self):
         """Calculate progress based on completed items."""
-        total = self.items.count()
-        if total == 0:
+        if self.total_items == 0:
             return 0
-        completed = self.items.filter(status='completed').count()
-        return round((completed / total) * 100)
-
-    @property
-    def total_items(self):
-        return self.items.count()
-
-    @property
-    def completed_items(self):
-        return self.items.filter(status='completed').count()
+        return round((self.completed_items / self.total_items) * 100)
 
 
 class SprintItem(models.Model):
@@ -98,6 +108,7 @@ class SprintItem(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='planned')
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='medium')
     order = models.IntegerField(default=0)
+    rank = models.CharField(max_length=64, blank=True, null=True, db_collation='C')
     assigned_to = models.CharField(max_length=100, blank=True, null=True)
     estimated_hours = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True)
     actual_hours = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True)
@@ -111,7 +122,7 @@ class SprintItem(models.Model):
     class Meta:
         db_table = 'sprint_items'
         managed = False
-        ordering = ['order', 'created_at']
+        ordering = [F('rank').asc(nulls_last=True), 'order', 'created_at']
         unique_together = [['client', 'item_code']]
 
     def __str__(self):
@@ -148,6 +159,7 @@ class DeliveryMilestone(models.Model):
     end_date = models.DateField(blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='upcoming')
     order = models.IntegerField(default=0)
+    rank = models.CharField(max_length=64, blank=True, null=True, db_collation='C')
     color = models.CharField(max_length=7, default='#6366F1')
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -156,8 +168,62 @@ class DeliveryMilestone(models.Model):
     class Meta:
         db_table = 'delivery_milestones'
         managed = False
-        ordering = ['order', 'start_date']
+        ordering = [F('rank').asc(nulls_last=True), 'order', 'start_date']
         unique_together = [['client', 'milestone_code']]
 
     def __str__(self):
         return f"{self.milestone_code}: {self.name}"
+
+
+class SprintItemStatusEvent(models.Model):
+    """Append-only log of sprint item status changes (written by a DB trigger)."""
+    id = models.BigAutoField(primary_key=True)
+    client_id = models.UUIDField()
+    item_id = models.UUIDField()
+    sprint_id = models.UUIDField()
+    previous_sprint_id = models.UUIDField(blank=True, null=True)
+    from_status = models.CharField(max_length=20, blank=True, null=True)
+    to_status = models.CharField(max_length=20, blank=True, null=True)
+    estimated_hours = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True)
+    changed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'sprint_item_status_events'
+        managed = False
+        ordering = ['changed_at', 'id']
+
+    def __str__(self):
+        return f"{self.item_id}: {self.from_status} -> {self.to_status}"
+
+
+class SprintDailySnapshot(models.Model):
+    """Per-sprint daily burndown figures compacted from the status log."""
+    id = models.BigAutoField(primary_key=True)
+    client = models.ForeignKey(
+        'clients.Client',
+        on_delete=models.CASCADE,
+        related_name='sprint_snapshots',
+        db_column='client_id'
+    )
+    sprint = models.ForeignKey(
+        'Sprint',
+        on_delete=models.CASCADE,
+        related_name='snapshots',
+        db_column='sprint_id'
+    )
+    snapshot_date = models.DateField()
+    total_items = models.IntegerField(default=0)
+    completed_items = models.IntegerField(default=0)
+    cancelled_items = models.IntegerField(default=0)
+    estimated_hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    completed_hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'sprint_daily_snapshots'
+        managed = False
+        ordering = ['sprint', 'snapshot_date']
+        unique_together = [['sprint', 'snapshot_date']]
+
+    def __str__(self):
+        return f"{self.sprint_id} @ {self.snapshot_date}"
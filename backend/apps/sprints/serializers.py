@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from utils.fast_serializers import FastSerializer
 from .models import Sprint, SprintItem, DeliveryMilestone
 
 
@@ -9,11 +10,14 @@ class SprintItemSerializer(serializers.ModelSerializer):
         model = SprintItem
         fields = [
             'id', 'client', 'sprint', 'item_code', 'name', 'description',
-            'item_type', 'status', 'priority', 'order', 'assigned_to',
+            'item_type', 'status', 'priority', 'order', 'rank', 'assigned_to',
             'estimated_hours', 'actual_hours', 'notes', 'start_date', 'end_date',
             'completed_at', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'client', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'client', 'rank', 'created_at', 'updated_at']
+
+
+SprintItemFastSerializer = FastSerializer(SprintItemSerializer)
 
 
 class SprintItemCreateSerializer(serializers.ModelSerializer):
@@ -32,18 +36,19 @@ class SprintSerializer(serializers.ModelSerializer):
     """Full serializer for sprints with nested items."""
     items = SprintItemSerializer(many=True, read_only=True)
     progress = serializers.ReadOnlyField()
-    total_items = serializers.ReadOnlyField()
-    completed_items = serializers.ReadOnlyField()
 
     class Meta:
         model = Sprint
         fields = [
             'id', 'client', 'sprint_code', 'name', 'description',
-            'start_date', 'end_date', 'status', 'order', 'color',
-            'progress', 'total_items', 'completed_items', 'items',
-            'created_at', 'updated_at'
+            'start_date', 'end_date', 'status', 'order', 'rank', 'color',
+            'progress', 'total_items', 'completed_items', 'cancelled_items',
+            'estimated_hours', 'actual_hours', 'items', 'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'client', 'rank', 'progress', 'total_items', 'completed_items',
+            'cancelled_items', 'estimated_hours', 'actual_hours', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'client', 'progress', 'total_items', 'completed_items', 'created_at', 'updated_at']
 
 
 class SprintCreateSerializer(serializers.ModelSerializer):
@@ -60,15 +65,14 @@ class SprintCreateSerializer(serializers.ModelSerializer):
 class SprintSummarySerializer(serializers.ModelSerializer):
     """Summary serializer for sprints (without nested items)."""
     progress = serializers.ReadOnlyField()
-    total_items = serializers.ReadOnlyField()
-    completed_items = serializers.ReadOnlyField()
 
     class Meta:
         model = Sprint
         fields = [
             'id', 'sprint_code', 'name', 'description', 'start_date',
-            'end_date', 'status', 'order', 'color', 'progress',
-            'total_items', 'completed_items'
+            'end_date', 'status', 'order', 'rank', 'color', 'progress',
+            'total_items', 'completed_items', 'cancelled_items',
+            'estimated_hours', 'actual_hours'
         ]
 
 
@@ -96,6 +100,9 @@ class MoveItemSerializer(serializers.Serializer):
     """Serializer for moving item to different sprint."""
     sprint_id = serializers.UUIDField()
     order = serializers.IntegerField(required=False, default=0)
+    # Neighbours in the target sprint; the item goes last when both are omitted
+    after = serializers.UUIDField(required=False, allow_null=True)
+    before = serializers.UUIDField(required=False, allow_null=True)
 
 
 class DeliveryMilestoneSerializer(serializers.ModelSerializer):
@@ -106,9 +113,9 @@ class DeliveryMilestoneSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'client', 'milestone_code', 'name', 'description',
             'milestone_type', 'start_date', 'end_date', 'status',
-            'order', 'color', 'notes', 'created_at', 'updated_at'
+            'order', 'rank', 'color', 'notes', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'client', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'client', 'rank', 'created_at', 'updated_at']
 
 
 class DeliveryMilestoneCreateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,19 @@
+"""
+Invalidate cached sprint payloads when sprints, their items or delivery
+milestones change.
+"""
+
+from django.db.models.signals import post_delete, post_save
+
+from .cache import bump_version
+from .models import DeliveryMilestone, Sprint, SprintItem
+
+
+def _invalidate(sender, instance, **kwargs):
+    bump_version(instance.client_id)
+
+
+def connect():
+    for model in (Sprint, SprintItem, DeliveryMilestone):
+        post_save.connect(_invalidate, sender=model, dispatch_uid=f'sprints-cache-save-{model.__name__}')
+        post_delete.connect(_invalidate, sender=model, dispatch_uid=f'sprints-cache-delete-{model.__name__}')
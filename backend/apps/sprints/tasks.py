@@ -0,0 +1,34 @@
+"""
+Celery tasks for sprint boards.
+"""
+
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from utils.ranking import MAX_RANK_LENGTH, rebalance_all
+
+
+@shared_task(ignore_result=True)
+def rebalance_ranks_task(max_length: int = MAX_RANK_LENGTH):
+    """
+    Rewrite rank keys for any board group whose keys grew past ``max_length``
+    or that still has unranked rows (sprints, sprint items, delivery
+    milestones and deliverable sections).
+    """
+    return rebalance_all(max_length=max_length)
+
+
+@shared_task(ignore_result=True)
+def compact_sprint_snapshots_task():
+    """
+    Fold the sprint item status log into daily burndown snapshots.
+
+    Yesterday is finalised and today's row is refreshed so charts stay
+    current between nightly runs.
+    """
+    from .burndown import compact_range
+
+    today = timezone.now().date()
+    return compact_range(today - timedelta(days=1), today)
@@ -0,0 +1,521 @@
+import datetime
+import io
+from decimal import Decimal
+
+import numpy as np
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+
+from apps.clients.models import Client
+from apps.clients.tenancy import local_cache
+from utils import reorder
+
+from .burndown import client_velocity, compact_day, compact_range, sprint_burndown
+from .forecast import _summarize, forecast, simulate
+from .models import DeliveryMilestone, Sprint, SprintDailySnapshot, SprintItem, SprintItemStatusEvent
+from .timeline import ENUMS, timeline
+from .workload import default_window, workload
+
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def create_sprints(client, sprints, items_per_sprint):
+    start = datetime.date(2026, 1, 5)
+    created = Sprint.objects.bulk_create([
+        Sprint(
+            client=client, sprint_code=f'S{n}', name=f'Sprint {n}', order=n,
+            status='in_progress' if n == 1 else 'planned',
+            start_date=start + datetime.timedelta(days=14 * n),
+            end_date=start + datetime.timedelta(days=14 * n + 13),
+        )
+        for n in range(sprints)
+    ])
+    SprintItem.objects.bulk_create([
+        SprintItem(
+            client=client, sprint=sprint, item_code=f'{sprint.sprint_code}-{n}', name=f'Item {n}', order=n,
+            status='completed' if n % 2 else 'in_progress', estimated_hours=2,
+            item_type='milestone' if n == 0 else 'feature',
+        )
+        for sprint in created
+        for n in range(items_per_sprint)
+    ])
+    return created
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class SprintQueryCountTests(TestCase):
+    """Sprint reads run a fixed number of queries however many sprints and items exist."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.small = Client.objects.create(name='Small', slug='small')
+        cls.large = Client.objects.create(name='Large', slug='large')
+        create_sprints(cls.small, 2, 2)
+        create_sprints(cls.large, 12, 25)
+
+    def get(self, name, client, queries):
+        for tenant in (self.small, client):
+            cache.clear()
+            local_cache.clear()
+            with self.assertNumQueries(queries):
+                response = self.client.get(reverse(name, kwargs={'client_slug': tenant.slug}))
+            self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_list(self):
+        data = self.get('sprints-list', self.large, 4)
+        sprints = data['results']
+        self.assertEqual(len(sprints), 12)
+        self.assertEqual(len(sprints[0]['items']), 25)
+        self.assertEqual((sprints[0]['total_items'], sprints[0]['completed_items']), (25, 12))
+        self.assertEqual(sprints[0]['progress'], round(12 / 25 * 100))
+
+    def test_roadmap(self):
+        data = self.get('sprints-roadmap', self.large, 4)
+        self.assertEqual(len(data['sprints']), 12)
+        self.assertEqual((data['total_items'], data['completed_items'], data['overall_progress']), (12 * 24, 12 * 12, 50))
+        self.assertEqual((data['milestone_total'], data['milestone_completed']), (12, 0))
+        self.assertEqual(data['current_sprint']['sprint_code'], 'S1')
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class RoadmapCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        create_sprints(cls.client_, 3, 4)
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.url = reverse('sprints-roadmap', kwargs={'client_slug': self.client_.slug})
+
+    def roadmap(self):
+        local_cache.clear()
+        return self.client.get(self.url).json()
+
+    @override_settings(ROADMAP_CACHE_ENABLED=True)
+    def test_cached_until_a_write(self):
+        self.roadmap()
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Sprint.objects.filter(client=self.client_, order=2).get().save()
+        self.assertEqual(len(self.roadmap()['sprints']), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            Sprint.objects.filter(client=self.client_, order=2).delete()
+        self.assertEqual(len(self.roadmap()['sprints']), 2)
+
+    @override_settings(ROADMAP_CACHE_ENABLED=False)
+    def test_not_cached_without_shared_cache(self):
+        self.roadmap()
+        with self.captureOnCommitCallbacks(execute=True):
+            Sprint.objects.filter(client=self.client_, order=2).delete()
+        self.assertEqual(len(self.roadmap()['sprints']), 2)
+        self.assertEqual(cache.get(f'sprints:version:{self.client_.pk}'), None)
+
+
+class BulkReorderTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        cls.other = Client.objects.create(name='Other', slug='other')
+        cls.first, cls.second = create_sprints(cls.client_, 2, 3)
+        (cls.foreign,) = create_sprints(cls.other, 1, 1)
+
+    def orders(self, **filters):
+        return dict(Sprint.objects.filter(**filters).values_list('sprint_code', 'order'))
+
+    def test_reorder_in_one_statement(self):
+        rows = [{'id': str(self.second.pk), 'order': '0'}, {'id': str(self.first.pk), 'order': '1'}]
+        with self.assertNumQueries(3):  # savepoint, UPDATE, release
+            updated = reorder.bulk_reorder(Sprint, rows, scope={'client_id': self.client_.pk})
+        self.assertEqual(updated, 2)
+        self.assertEqual(self.orders(client=self.client_), {'S0': 1, 'S1': 0})
+
+    def test_other_tenants_rows_untouched(self):
+        rows = [{'id': str(self.first.pk), 'order': '5'}, {'id': str(self.foreign.pk), 'order': '5'}]
+        self.assertEqual(reorder.bulk_reorder(Sprint, rows, scope={'client_id': self.client_.pk}), 1)
+        self.assertEqual(self.orders(pk=self.foreign.pk), {'S0': 0})
+
+    def test_cross_sprint_move_keeps_missing_fields(self):
+        first_items = list(SprintItem.objects.filter(sprint=self.first).order_by('order'))
+        rows = [
+            {'id': str(first_items[0].pk), 'order': '9', 'sprint_id': str(self.second.pk)},
+            {'id': str(first_items[1].pk), 'order': '8', 'sprint_id': ''},
+        ]
+        reorder.bulk_reorder(SprintItem, rows, scope={'client_id': self.client_.pk}, fields=('order', 'sprint_id'))
+        moved, kept = SprintItem.objects.get(pk=first_items[0].pk), SprintItem.objects.get(pk=first_items[1].pk)
+        self.assertEqual((moved.sprint_id, moved.order), (self.second.pk, 9))
+        self.assertEqual((kept.sprint_id, kept.order), (self.first.pk, 8))
+
+    def test_fallback_matches(self):
+        rows = reorder._clean_rows(Sprint, [{'id': str(self.first.pk), 'order': '7'}], ('order',))
+        scope = {'client_id': self.client_.pk}
+        self.assertEqual(reorder._bulk_update(Sprint, rows, ('order',), scope), 1)
+        self.assertEqual(reorder._bulk_update(Sprint, [[self.foreign.pk, 7]], ('order',), scope), 0)
+        self.assertEqual(self.orders(client=self.client_)['S0'], 7)
+
+    def test_malformed_rows_rejected(self):
+        for row in ({'order': '1'}, {'id': 'not-a-uuid', 'order': '1'}, {'id': str(self.first.pk), 'order': 'x'}):
+            with self.subTest(row=row), self.assertRaises(ValidationError):
+                reorder.bulk_reorder(Sprint, [row], scope={'client_id': self.client_.pk})
+        self.assertEqual(reorder.bulk_reorder(Sprint, [], scope={'client_id': self.client_.pk}), 0)
+
+    def test_item_move_to_foreign_sprint_rejected(self):
+        item = SprintItem.objects.filter(sprint=self.first).first()
+        response = self.client.post(
+            reverse('sprint-items-reorder', kwargs={'client_slug': self.client_.slug}),
+            {'items': [{'id': str(item.pk), 'order': '0', 'sprint_id': str(self.foreign.pk)}]},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(SprintItem.objects.get(pk=item.pk).sprint_id, self.first.pk)
+
+
+class SprintCounterTests(TestCase):
+    """The sprint_items triggers keep the sprint counters in step with every write path."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        cls.first, cls.second = create_sprints(cls.client_, 2, 0)
+
+    def counters(self, sprint):
+        sprint.refresh_from_db()
+        return tuple(getattr(sprint, field) for field in Sprint.COUNTER_FIELDS)
+
+    def add_item(self, sprint, code, **fields):
+        return SprintItem.objects.create(
+            client=self.client_, sprint=sprint, item_code=code, name=code, **fields
+        )
+
+    def test_insert_update_delete(self):
+        item = self.add_item(self.first, 'A', estimated_hours=3)
+        self.add_item(self.first, 'B', status='cancelled', actual_hours=1)
+        self.assertEqual(self.counters(self.first), (2, 0, 1, Decimal('3'), Decimal('1')))
+
+        item.status, item.actual_hours = 'completed', Decimal('2.5')
+        item.save()
+        self.assertEqual(self.counters(self.first), (2, 1, 1, Decimal('3'), Decimal('3.5')))
+
+        item.delete()
+        self.assertEqual(self.counters(self.first), (1, 0, 1, Decimal('0'), Decimal('1')))
+
+    def test_move_between_sprints(self):
+        item = self.add_item(self.first, 'A', status='completed', estimated_hours=4)
+        SprintItem.objects.filter(pk=item.pk).update(sprint=self.second)
+        self.assertEqual(self.counters(self.first), (0, 0, 0, Decimal('0'), Decimal('0')))
+        self.assertEqual(self.counters(self.second), (1, 1, 0, Decimal('4'), Decimal('0')))
+
+        reorder.bulk_reorder(
+            SprintItem, [{'id': str(item.pk), 'order': '0', 'sprint_id': str(self.first.pk)}],
+            scope={'client_id': self.client_.pk}, fields=('order', 'sprint_id'),
+        )
+        self.assertEqual(self.counters(self.first)[:2], (1, 1))
+        self.assertEqual(self.counters(self.second)[:2], (0, 0))
+
+    def test_sprint_save_keeps_counters(self):
+        stale = Sprint.objects.get(pk=self.first.pk)
+        self.add_item(self.first, 'A', status='completed')
+        stale.name = 'Renamed'
+        stale.save()
+        self.assertEqual(self.counters(self.first)[:2], (1, 1))
+
+    def test_reconcile_repairs_drift(self):
+        self.add_item(self.first, 'A', status='completed', estimated_hours=2)
+        Sprint.objects.filter(pk=self.first.pk).update(total_items=7, completed_items=0)
+        Sprint.objects.filter(pk=self.second.pk).update(estimated_hours=5)
+
+        out = io.StringIO()
+        call_command('reconcile_sprint_counters', dry_run=True, stdout=out)
+        self.assertIn('2 sprint(s) with drift found', out.getvalue())
+        self.assertEqual(self.counters(self.first)[0], 7)
+
+        call_command('reconcile_sprint_counters', stdout=io.StringIO())
+        self.assertEqual(self.counters(self.first), (1, 1, 0, Decimal('2'), Decimal('0')))
+        self.assertEqual(self.counters(self.second), (0, 0, 0, Decimal('0'), Decimal('0')))
+
+
+class BurndownTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        (cls.sprint,) = create_sprints(cls.client_, 1, 0)  # 2026-01-05 to 2026-01-18
+
+    def add_item(self, code, hours):
+        return SprintItem.objects.create(
+            client=self.client_, sprint=self.sprint, item_code=code, name=code, estimated_hours=hours
+        )
+
+    def log_on(self, day):
+        """Move the events just written (stamped with the test transaction's NOW()) to ``day``."""
+        changed_at = datetime.datetime.combine(day, datetime.time(12), tzinfo=datetime.timezone.utc)
+        SprintItemStatusEvent.objects.filter(changed_at__gt=changed_at).update(changed_at=changed_at)
+
+    def test_status_log(self):
+        item = self.add_item('A', 2)
+        item.order = 5
+        item.save()
+        item.status = 'completed'
+        item.save()
+        item.estimated_hours = 3
+        item.save()
+        item_id = item.pk
+        item.delete()
+        events = list(SprintItemStatusEvent.objects.filter(item_id=item_id).order_by('id').values_list(
+            'from_status', 'to_status', 'estimated_hours'
+        ))
+        self.assertEqual(events, [
+            (None, 'planned', Decimal('2')),
+            ('planned', 'completed', Decimal('2')),
+            ('completed', 'completed', Decimal('3')),
+            ('completed', None, Decimal('3')),
+        ])
+
+    def test_daily_snapshots(self):
+        day = self.sprint.start_date
+        first, second, dropped = self.add_item('A', 2), self.add_item('B', 3), self.add_item('C', 1)
+        self.log_on(day)
+        SprintItem.objects.filter(pk=first.pk).update(status='completed')
+        self.log_on(day + datetime.timedelta(days=1))
+        dropped.delete()
+        SprintItem.objects.filter(pk=second.pk).update(status='cancelled')
+        self.log_on(day + datetime.timedelta(days=2))
+
+        self.assertEqual(compact_range(day - datetime.timedelta(days=1), day + datetime.timedelta(days=2)), 3)
+        # Recompacting a day refreshes its row instead of adding one
+        self.assertEqual(compact_day(day), 1)
+        self.assertEqual(SprintDailySnapshot.objects.filter(sprint=self.sprint).count(), 3)
+
+        days = sprint_burndown(self.sprint)['days']
+        self.assertEqual(
+            [(d['total_items'], d['completed_items'], d['remaining_items'], d['remaining_hours']) for d in days],
+            [(3, 0, 3, '6.00'), (3, 1, 2, '4.00'), (2, 1, 0, '3.00')],
+        )
+
+    def test_velocity_counts_finished_sprints(self):
+        item = self.add_item('A', 4)
+        SprintItem.objects.filter(pk=item.pk).update(status='completed')
+        self.log_on(self.sprint.start_date)
+        compact_day(self.sprint.start_date)
+        self.assertEqual(client_velocity(self.client_.pk)['average_completed_items'], 0)
+
+        compact_day(self.sprint.end_date)
+        velocity = client_velocity(self.client_.pk)
+        self.assertEqual(velocity['sprints'][0]['as_of'], self.sprint.end_date)
+        self.assertEqual((velocity['average_completed_items'], velocity['average_completed_hours']), (1.0, '4.00'))
+
+
+class SimulateTests(SimpleTestCase):
+
+    def run_trials(self, throughput, backlog, trials=50):
+        return simulate(np.asarray(throughput), backlog, trials, np.random.default_rng(0))
+
+    def test_constant_throughput(self):
+        days = self.run_trials([2], [4, 5, 5])
+        self.assertEqual(days.shape, (50, 3))
+        self.assertTrue((days == [2, 3, 3]).all())
+
+    def test_nothing_remaining(self):
+        self.assertTrue((self.run_trials([1], [0, 0]) == 0).all())
+        self.assertEqual(self.run_trials([1], []).shape, (50, 0))
+
+    def test_no_throughput_never_finishes(self):
+        days = self.run_trials([0, 0], [0, 3])
+        self.assertTrue((days[:, 0] == 0).all())
+        self.assertTrue(np.isinf(days[:, 1]).all())
+
+    def test_past_horizon(self):
+        self.assertTrue(np.isinf(self.run_trials([1], [1000])).all())
+
+    def test_variable_throughput_bounds(self):
+        days = self.run_trials([0, 1, 2, 3], [12], trials=1000)[:, 0]
+        self.assertTrue(np.isfinite(days).all())
+        self.assertGreaterEqual(days.min(), 4)
+        self.assertAlmostEqual(np.median(days), 8, delta=1)
+
+
+class SummarizeTests(SimpleTestCase):
+    today = datetime.date(2026, 3, 2)
+
+    def test_percentiles_and_on_time(self):
+        days = np.array([1.0] * 50 + [3.0] * 40 + [5.0] * 10)
+        summary = _summarize(days, self.today, self.today + datetime.timedelta(days=1))
+        self.assertEqual(
+            (summary['p50'], summary['p85'], summary['p95']),
+            (self.today, self.today + datetime.timedelta(days=2), self.today + datetime.timedelta(days=4)),
+        )
+        self.assertEqual(summary['on_time_probability'], 0.5)
+        self.assertIsNone(_summarize(days, self.today, None)['on_time_probability'])
+
+    def test_unfinished_trials(self):
+        summary = _summarize(np.array([2.0] * 90 + [np.inf] * 10), self.today, self.today)
+        self.assertEqual(summary['p85'], self.today + datetime.timedelta(days=1))
+        self.assertIsNone(summary['p95'])
+        self.assertEqual(summary['on_time_probability'], 0.0)
+
+
+class ForecastTests(TestCase):
+    today = datetime.date(2026, 1, 10)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        done, next_sprint, last = create_sprints(cls.client_, 3, 0)
+        # Two completions on each of the last seven days
+        completed_at = [
+            datetime.datetime.combine(cls.today - datetime.timedelta(days=1 + n // 2), datetime.time(12),
+                                      tzinfo=datetime.timezone.utc)
+            for n in range(14)
+        ]
+        SprintItem.objects.bulk_create(
+            [SprintItem(client=cls.client_, sprint=done, item_code=f'D{n}', name='Done', status='completed',
+                        completed_at=at) for n, at in enumerate(completed_at)]
+            + [SprintItem(client=cls.client_, sprint=next_sprint, item_code=f'N{n}', name='Next') for n in range(4)]
+            + [SprintItem(client=cls.client_, sprint=last, item_code=f'L{n}', name='Last') for n in range(2)]
+        )
+        for code, end_date in (('M1', done.end_date), ('M2', next_sprint.end_date), ('M3', done.start_date)):
+            DeliveryMilestone.objects.create(
+                client=cls.client_, milestone_code=code, name=code, start_date=done.start_date, end_date=end_date
+            )
+
+    def test_forecast(self):
+        data = forecast(self.client_.pk, trials=200, history_days=7, today=self.today)
+        self.assertEqual(data['throughput'], {'mean_per_day': 2.0, 'completed_items': 14})
+
+        done, next_sprint, last = data['sprints']
+        self.assertEqual((done['done'], done['p50'], done['on_time_probability']), (True, None, 1.0))
+        self.assertEqual(next_sprint['remaining_items'], 4)
+        self.assertEqual({next_sprint[f'p{p}'] for p in (50, 85, 95)}, {self.today + datetime.timedelta(days=1)})
+        self.assertEqual(last['p50'], self.today + datetime.timedelta(days=2))
+        self.assertEqual(last['on_time_probability'], 1.0)
+
+        by_code = {m['milestone_code']: m for m in data['milestones']}
+        self.assertEqual((by_code['M1']['sprints'], by_code['M1']['done']), (1, True))
+        self.assertEqual(by_code['M2']['p95'], self.today + datetime.timedelta(days=1))
+        self.assertEqual((by_code['M3']['sprints'], by_code['M3']['done'], by_code['M3']['on_time_probability']),
+                         (0, False, None))
+
+    def test_deterministic(self):
+        self.assertEqual(
+            forecast(self.client_.pk, trials=200, today=self.today)['sprints'],
+            forecast(self.client_.pk, trials=200, today=self.today)['sprints'],
+        )
+
+
+class WorkloadTests(TestCase):
+    monday = datetime.date(2026, 3, 2)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        (cls.sprint,) = create_sprints(cls.client_, 1, 0)
+        cls.sprint.start_date, cls.sprint.end_date = cls.monday, cls.monday + datetime.timedelta(days=13)
+        cls.sprint.save()
+
+    def add_item(self, assigned_to, hours, start=None, end=None, **fields):
+        return SprintItem.objects.create(
+            client=self.client_, sprint=self.sprint, item_code=f'I{SprintItem.objects.count()}', name='Item',
+            assigned_to=assigned_to, estimated_hours=hours, start_date=start, end_date=end, **fields
+        )
+
+    def day(self, offset):
+        return self.monday + datetime.timedelta(days=offset)
+
+    def test_spread_over_working_days(self):
+        self.add_item('ana', 10, self.day(0), self.day(6))
+        self.add_item('ana', 4, self.day(5), self.day(6))  # weekend only
+        data = workload(self.client_.pk, self.day(0), self.day(6), capacity=8)
+        self.assertEqual(data['buckets'][0], '2026-03-02')
+        self.assertEqual(data['capacity'], [8.0] * 5 + [0.0] * 2)
+        (ana,) = data['people']
+        self.assertEqual(ana['hours'], [2.0] * 5 + [2.0, 2.0])
+        self.assertEqual(ana['total_hours'], 14.0)
+        # Weekend hours exceed zero capacity
+        self.assertEqual(ana['overloaded_buckets'], [5, 6])
+
+    def test_sprint_dates_and_window_clipping(self):
+        self.add_item('luis', 20)  # two working weeks from the sprint
+        data = workload(self.client_.pk, self.day(7), self.day(13), capacity=8)
+        (luis,) = data['people']
+        self.assertEqual(luis['hours'], [2.0] * 5 + [0.0, 0.0])
+        self.assertFalse(luis['overloaded'])
+
+    def test_skips_closed_unassigned_and_unestimated(self):
+        self.add_item('ana', 8, self.day(0), self.day(0), status='completed')
+        self.add_item('', 8, self.day(0), self.day(0))
+        self.add_item(None, 8, self.day(0), self.day(0))
+        self.add_item('ana', None, self.day(0), self.day(0))
+        self.add_item('ana', 8, self.day(0) - datetime.timedelta(days=30), self.day(0) - datetime.timedelta(days=29))
+        self.assertEqual(workload(self.client_.pk, self.day(0), self.day(6))['people'], [])
+
+    def test_overload_and_weekly_buckets(self):
+        self.add_item('ana', 8, self.day(0), self.day(0))
+        self.add_item('ana', 4, self.day(0), self.day(0))
+        self.add_item('maria', 40, self.day(7), self.day(11))
+        data = workload(self.client_.pk, self.day(0), self.day(13), capacity=8, bucket='week')
+        self.assertEqual(data['buckets'], ['2026-03-02', '2026-03-09'])
+        self.assertEqual(data['capacity'], [40.0, 40.0])
+        ana, maria = data['people']
+        self.assertEqual((ana['hours'], ana['overloaded']), ([12.0, 0.0], False))
+        self.assertEqual((maria['hours'], maria['overloaded']), ([0.0, 40.0], False))
+
+        daily = workload(self.client_.pk, self.day(0), self.day(13), capacity=8)['people']
+        self.assertEqual((daily[0]['peak_hours'], daily[0]['overloaded_buckets']), (12.0, [0]))
+        self.assertEqual(daily[1]['overloaded'], False)
+
+    def test_default_window(self):
+        self.assertEqual(default_window(self.day(3), weeks=2), (self.monday, self.day(13)))
+
+
+class TimelineTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        cls.first, cls.second = create_sprints(cls.client_, 2, 2)
+        # Board order follows rank, not creation order
+        Sprint.objects.filter(pk=cls.second.pk).update(rank='a')
+        Sprint.objects.filter(pk=cls.first.pk).update(rank='b')
+        SprintItem.objects.filter(sprint=cls.first, order=1).update(start_date=datetime.date(2026, 1, 20))
+        DeliveryMilestone.objects.create(
+            client=cls.client_, milestone_code='M1', name='Launch', milestone_type='checkpoint',
+            start_date=datetime.date(2026, 2, 1),
+        )
+
+    def test_columns(self):
+        with self.assertNumQueries(3):
+            data = timeline(self.client_.pk)
+        self.assertEqual(data['epoch'], self.first.start_date)
+
+        sprints, items, milestones = data['sprints'], data['items'], data['milestones']
+        self.assertEqual(sprints['code'], ['S1', 'S0'])
+        self.assertEqual(sprints['start'], [14, 0])
+        self.assertEqual(sprints['end'], [27, 13])
+        self.assertEqual([ENUMS['sprint_status'][code] for code in sprints['status']], ['in_progress', 'planned'])
+
+        self.assertEqual(items['code'], ['S1-0', 'S1-1', 'S0-0', 'S0-1'])
+        self.assertEqual(items['sprint'], [0, 0, 1, 1])
+        self.assertEqual(items['start'], [None, None, None, 15])
+        self.assertEqual([ENUMS['item_type'][code] for code in items['type']], ['milestone', 'feature'] * 2)
+        self.assertEqual([ENUMS['item_status'][code] for code in items['status']], ['in_progress', 'completed'] * 2)
+
+        self.assertEqual((milestones['code'], milestones['start'], milestones['end']), (['M1'], [27], [None]))
+        self.assertEqual(ENUMS['milestone_type'][milestones['type'][0]], 'checkpoint')
+
+    def test_unknown_status_and_empty(self):
+        Sprint.objects.filter(pk=self.first.pk).update(status='archived')
+        self.assertEqual(timeline(self.client_.pk)['sprints']['status'], [1, None])
+
+        empty = timeline(Client.objects.create(name='Empty', slug='empty').pk)
+        self.assertIsNone(empty['epoch'])
+        self.assertEqual(empty['items']['id'], [])
+        self.assertEqual(empty['sprints']['start'], [])
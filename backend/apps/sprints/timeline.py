@@ -0,0 +1,96 @@
+"""
+Column-oriented timeline payload for Gantt-style views.
+
+Sprints, items and milestones are each returned as a table of parallel
+arrays (one array per field) rather than a list of dicts, so field names
+appear once per table instead of once per row. Dates are integer day
+offsets from ``epoch``; status and type fields are small-int codes into the
+shared ``enums`` dictionary; items point at their sprint by row index.
+Rows are in board order, so a row's position is its order.
+
+Everything is read with ``values_list``; no model instances or
+serializers are involved.
+"""
+
+from django.db.models import F
+
+from .models import DeliveryMilestone, Sprint, SprintItem
+
+ENUMS = {
+    'sprint_status': [value for value, _ in Sprint.STATUS_CHOICES],
+    'item_status': [value for value, _ in SprintItem.STATUS_CHOICES],
+    'item_type': [value for value, _ in SprintItem.ITEM_TYPE_CHOICES],
+    'milestone_status': [value for value, _ in DeliveryMilestone.STATUS_CHOICES],
+    'milestone_type': [value for value, _ in DeliveryMilestone.MILESTONE_TYPE_CHOICES],
+}
+CODES = {name: {value: code for code, value in enumerate(values)} for name, values in ENUMS.items()}
+
+
+def _columns(rows, names):
+    """Transpose ``values_list`` tuples into ``{name: [values...]}``."""
+    if not rows:
+        return {name: [] for name in names}
+    return {name: list(column) for name, column in zip(names, zip(*rows))}
+
+
+def _offsets(dates, epoch):
+    return [(d - epoch).days if d is not None else None for d in dates]
+
+
+def _codes(values, enum):
+    # Unknown values (rows written before a choice was added) map to None
+    codes = CODES[enum]
+    return [codes.get(value) for value in values]
+
+
+def timeline(client_id):
+    """Timeline tables for one client (three queries)."""
+    sprint_rows = list(
+        Sprint.objects.filter(client_id=client_id)
+        .order_by(F('rank').asc(nulls_last=True), 'order', 'start_date')
+        .values_list('id', 'sprint_code', 'name', 'status', 'start_date', 'end_date', 'color')
+    )
+    item_rows = list(
+        SprintItem.objects.filter(client_id=client_id)
+        .order_by(
+            F('sprint__rank').asc(nulls_last=True), 'sprint__order',
+            F('rank').asc(nulls_last=True), 'order', 'created_at',
+        )
+        .values_list('id', 'sprint_id', 'item_code', 'name', 'item_type', 'status', 'start_date', 'end_date')
+    )
+    milestone_rows = list(
+        DeliveryMilestone.objects.filter(client_id=client_id)
+        .order_by(F('rank').asc(nulls_last=True), 'order', 'start_date')
+        .values_list('id', 'milestone_code', 'name', 'milestone_type', 'status', 'start_date', 'end_date', 'color')
+    )
+
+    sprints = _columns(sprint_rows, ('id', 'code', 'name', 'status', 'start', 'end', 'color'))
+    items = _columns(item_rows, ('id', 'sprint', 'code', 'name', 'type', 'status', 'start', 'end'))
+    milestones = _columns(milestone_rows, ('id', 'code', 'name', 'type', 'status', 'start', 'end', 'color'))
+
+    dates = [
+        d for table in (sprints, items, milestones)
+        for column in ('start', 'end') for d in table[column] if d is not None
+    ]
+    epoch = min(dates) if dates else None
+    if epoch is not None:
+        for table in (sprints, items, milestones):
+            table['start'] = _offsets(table['start'], epoch)
+            table['end'] = _offsets(table['end'], epoch)
+
+    sprint_index = {sprint_id: index for index, sprint_id in enumerate(sprints['id'])}
+    items['sprint'] = [sprint_index[sprint_id] for sprint_id in items['sprint']]
+
+    sprints['status'] = _codes(sprints['status'], 'sprint_status')
+    items['status'] = _codes(items['status'], 'item_status')
+    items['type'] = _codes(items['type'], 'item_type')
+    milestones['status'] = _codes(milestones['status'], 'milestone_status')
+    milestones['type'] = _codes(milestones['type'], 'milestone_type')
+
+    return {
+        'epoch': epoch,
+        'enums': ENUMS,
+        'sprints': sprints,
+        'items': items,
+        'milestones': milestones,
+    }
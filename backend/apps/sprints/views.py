@@ -1,18 +1,35 @@
+import uuid
+from datetime import date
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Case, CharField, Count, F, Value, When
+from apps.clients.tenancy import get_tenant
+from utils.fast_serializers import FastListMixin
+from utils.ranking import RankActionMixin, RankError, place, with_order_ranks
+from utils.reorder import bulk_reorder
+from .burndown import client_velocity, sprint_burndown
+from .cache import bump_version, get_or_build
+from .forecast import DEFAULT_HISTORY_DAYS, DEFAULT_TRIALS, MAX_TRIALS, forecast as delivery_forecast
 from .models import Sprint, SprintItem, DeliveryMilestone
 from .serializers import (
     SprintSerializer, SprintCreateSerializer, SprintSummarySerializer,
-    SprintItemSerializer, SprintItemCreateSerializer,
+    SprintItemSerializer, SprintItemCreateSerializer, SprintItemFastSerializer,
     RoadmapSerializer, ReorderSerializer, MoveItemSerializer,
     DeliveryMilestoneSerializer, DeliveryMilestoneCreateSerializer
 )
+from .timeline import timeline as build_timeline
+from .workload import BUCKETS as WORKLOAD_BUCKETS, MAX_WINDOW_DAYS, default_window, workload as assigned_workload
+
+
+# Development item types (milestones are tracked separately)
+DEV_ITEM_TYPES = ['agent', 'feature', 'task', 'bugfix']
 
 
-class SprintViewSet(viewsets.ModelViewSet):
+class SprintViewSet(RankActionMixin, viewsets.ModelViewSet):
     """ViewSet for Sprint CRUD operations."""
 
     def get_serializer_class(self):
@@ -21,16 +38,13 @@ class SprintViewSet(viewsets.ModelViewSet):
         return SprintSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
         return Sprint.objects.filter(
-            client__slug=client_slug
-        ).prefetch_related('items').order_by('order', 'start_date')
+            client_id=get_tenant(self.request).id
+        ).prefetch_related('items').order_by(F('rank').asc(nulls_last=True), 'order', 'start_date')
 
     def perform_create(self, serializer):
-        from apps.clients.models import Client
-        client_slug = self.kwargs.get('client_slug')
-        client = Client.objects.get(slug=client_slug)
-        serializer.save(client=client)
+        client = get_tenant(self.request)
+        serializer.save(client=client, rank=place(Sprint, 'client_id', client.id))
 
     @action(detail=False, methods=['post'])
     def reorder(self, request, client_slug=None):
@@ -38,73 +52,128 @@ class SprintViewSet(viewsets.ModelViewSet):
         serializer = ReorderSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        for item in serializer.validated_data['items']:
-            Sprint.objects.filter(
-                id=item['id'],
-                client__slug=client_slug
-            ).update(order=int(item['order']))
+        client = get_tenant(request)
+        bulk_reorder(
+            Sprint, with_order_ranks(serializer.validated_data['items']),
+            scope={'client_id': client.id}, fields=('order', 'rank'),
+        )
 
+        bump_version(client.id)
         return Response({'status': 'reordered'})
 
+    @action(detail=True, methods=['get'])
+    def burndown(self, request, client_slug=None, pk=None):
+        """Daily remaining items/hours for one sprint."""
+        sprint = get_object_or_404(Sprint, pk=pk, client_id=get_tenant(request).id)
+        return Response(sprint_burndown(sprint))
+
     @action(detail=False, methods=['get'])
-    def roadmap(self, request, client_slug=None):
-        """Get roadmap summary for presentations."""
-        sprints = self.get_queryset()
+    def velocity(self, request, client_slug=None):
+        """Completed items/hours per sprint, averaged over recent sprints."""
+        client = get_tenant(request)
+        try:
+            last = max(int(request.query_params.get('last', 6)), 1)
+        except ValueError:
+            return Response({'error': 'last must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(client_velocity(client.id, last=last))
 
-        # Development item types (exclude milestones from main progress)
-        dev_types = ['agent', 'feature', 'task', 'bugfix']
+    @action(detail=False, methods=['get'])
+    def forecast(self, request, client_slug=None):
+        """Monte Carlo P50/P85/P95 completion dates for sprints and milestones."""
+        client = get_tenant(request)
+        try:
+            trials = int(request.query_params.get('trials', DEFAULT_TRIALS))
+            history_days = int(request.query_params.get('history_days', DEFAULT_HISTORY_DAYS))
+        except ValueError:
+            return Response(
+                {'error': 'trials and history_days must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        trials = min(max(trials, 100), MAX_TRIALS)
+        history_days = min(max(history_days, 7), 365)
+
+        today = timezone.now().date()
+        data = get_or_build(
+            client.id, 'forecast',
+            lambda: delivery_forecast(client.id, trials=trials, history_days=history_days, today=today),
+            today, trials, history_days,
+        )
+        return Response(data)
 
-        # Calculate DEVELOPMENT progress only
-        dev_total = SprintItem.objects.filter(
-            client__slug=client_slug,
-            item_type__in=dev_types
-        ).exclude(status='cancelled').count()
+    @action(detail=False, methods=['get'])
+    def timeline(self, request, client_slug=None):
+        """Column-oriented sprints, items and milestones for Gantt views."""
+        client = get_tenant(request)
+        data = get_or_build(client.id, 'timeline', lambda: build_timeline(client.id))
+        return Response(data)
 
-        dev_completed = SprintItem.objects.filter(
-            client__slug=client_slug,
-            item_type__in=dev_types,
-            status='completed'
-        ).count()
+    @action(detail=False, methods=['get'])
+    def roadmap(self, request, client_slug=None):
+        """Get roadmap summary for presentations."""
+        client = get_tenant(request)
+        today = timezone.now().date()
+        data = get_or_build(
+            client.id, 'roadmap', lambda: self._build_roadmap(client, today), today
+        )
+        return Response(data)
 
+    def _build_roadmap(self, client, today):
+        sprints = list(
+            Sprint.objects.filter(client=client)
+            .prefetch_related('items')
+            .order_by(F('rank').asc(nulls_last=True), 'order', 'start_date')
+        )
+
+        # One grouped aggregate feeds every counter; development item types
+        # are counted apart from milestones (excluded from main progress)
+        counts = SprintItem.objects.filter(client=client).annotate(
+            kind=Case(
+                When(item_type__in=DEV_ITEM_TYPES, then=Value('dev')),
+                When(item_type='milestone', then=Value('milestone')),
+                default=Value(''),
+                output_field=CharField(),
+            )
+        ).values('kind', 'status').annotate(n=Count('id')).order_by()
+
+        totals = {'dev': 0, 'milestone': 0}
+        completed = {'dev': 0, 'milestone': 0}
+        for row in counts:
+            kind = row['kind']
+            if kind not in totals:
+                continue
+            if row['status'] != 'cancelled':
+                totals[kind] += row['n']
+            if row['status'] == 'completed':
+                completed[kind] += row['n']
+
+        dev_total = totals['dev']
+        dev_completed = completed['dev']
         dev_progress = round((dev_completed / dev_total) * 100) if dev_total > 0 else 0
 
-        # Calculate MILESTONE progress separately
-        milestone_total = SprintItem.objects.filter(
-            client__slug=client_slug,
-            item_type='milestone'
-        ).exclude(status='cancelled').count()
-
-        milestone_completed = SprintItem.objects.filter(
-            client__slug=client_slug,
-            item_type='milestone',
-            status='completed'
-        ).count()
-
         # Find current sprint (in_progress or the next planned one)
-        current_sprint = sprints.filter(status='in_progress').first()
+        current_sprint = next((s for s in sprints if s.status == 'in_progress'), None)
         if not current_sprint:
-            current_sprint = sprints.filter(
-                status='planned',
-                start_date__gte=timezone.now().date()
-            ).first()
+            current_sprint = next(
+                (s for s in sprints if s.status == 'planned' and s.start_date >= today), None
+            )
 
-        data = {
+        return {
             'sprints': SprintSerializer(sprints, many=True).data,
             # Development stats (main display)
             'overall_progress': dev_progress,
             'total_items': dev_total,
             'completed_items': dev_completed,
             # Milestone stats (secondary display)
-            'milestone_total': milestone_total,
-            'milestone_completed': milestone_completed,
+            'milestone_total': totals['milestone'],
+            'milestone_completed': completed['milestone'],
             'current_sprint': SprintSummarySerializer(current_sprint).data if current_sprint else None
         }
 
-        return Response(data)
-
 
-class SprintItemViewSet(viewsets.ModelViewSet):
+class SprintItemViewSet(RankActionMixin, FastListMixin, viewsets.ModelViewSet):
     """ViewSet for SprintItem CRUD operations."""
+    fast_serializer = SprintItemFastSerializer
+    rank_group_field = 'sprint_id'
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -112,10 +181,12 @@ class SprintItemViewSet(viewsets.ModelViewSet):
         return SprintItemSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
         queryset = SprintItem.objects.filter(
-            client__slug=client_slug
-        ).select_related('sprint').order_by('sprint__order', 'order')
+            client_id=get_tenant(self.request).id
+        ).select_related('sprint').order_by(
+            F('sprint__rank').asc(nulls_last=True), 'sprint__order',
+            F('rank').asc(nulls_last=True), 'order'
+        )
 
         # Allow filtering by sprint
         sprint_id = self.request.query_params.get('sprint')
@@ -125,10 +196,45 @@ class SprintItemViewSet(viewsets.ModelViewSet):
         return queryset
 
     def perform_create(self, serializer):
-        from apps.clients.models import Client
-        client_slug = self.kwargs.get('client_slug')
-        client = Client.objects.get(slug=client_slug)
-        serializer.save(client=client)
+        client = get_tenant(self.request)
+        sprint = serializer.validated_data['sprint']
+        serializer.save(client=client, rank=place(SprintItem, 'sprint_id', sprint.id))
+
+    @action(detail=False, methods=['get'])
+    def workload(self, request, client_slug=None):
+        """Assigned hours per person per day (or week), with overloads flagged."""
+        client = get_tenant(request)
+        start, end = default_window(timezone.now().date())
+        params = request.query_params
+        try:
+            if params.get('start'):
+                start = date.fromisoformat(params['start'])
+            if params.get('end'):
+                end = date.fromisoformat(params['end'])
+            capacity = float(params['capacity']) if params.get('capacity') else None
+        except ValueError:
+            return Response(
+                {'error': 'start/end must be ISO dates and capacity a number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        bucket = params.get('bucket', 'day')
+        if bucket not in WORKLOAD_BUCKETS:
+            return Response(
+                {'error': f'bucket must be one of {", ".join(WORKLOAD_BUCKETS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if end < start or (end - start).days >= MAX_WINDOW_DAYS:
+            return Response(
+                {'error': f'end must be on or after start and within {MAX_WINDOW_DAYS} days'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = get_or_build(
+            client.id, 'workload',
+            lambda: assigned_workload(client.id, start, end, capacity=capacity, bucket=bucket),
+            start, end, capacity, bucket,
+        )
+        return Response(data)
 
     @action(detail=True, methods=['post'])
     def complete(self, request, client_slug=None, pk=None):
@@ -141,7 +247,7 @@ class SprintItemViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'])
     def move(self, request, client_slug=None, pk=None):
-        """Move item to a different sprint."""
+        """Move item to a different sprint, optionally between two of its items."""
         item = self.get_object()
         serializer = MoveItemSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -149,7 +255,7 @@ class SprintItemViewSet(viewsets.ModelViewSet):
         # Verify sprint belongs to same client
         new_sprint = Sprint.objects.filter(
             id=serializer.validated_data['sprint_id'],
-            client__slug=client_slug
+            client_id=get_tenant(request).id
         ).first()
 
         if not new_sprint:
@@ -158,9 +264,25 @@ class SprintItemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        try:
+            rank = place(
+                SprintItem, 'sprint_id', new_sprint.id,
+                exclude_pk=item.pk,
+                after_id=serializer.validated_data.get('after'),
+                before_id=serializer.validated_data.get('before'),
+            )
+        except SprintItem.DoesNotExist:
+            return Response(
+                {'error': 'Neighbour item not found in sprint'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except RankError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         item.sprint = new_sprint
         item.order = serializer.validated_data.get('order', 0)
-        item.save()
+        item.rank = rank
+        item.save(update_fields=['sprint', 'order', 'rank', 'updated_at'])
 
         return Response(SprintItemSerializer(item).data)
 
@@ -170,20 +292,30 @@ class SprintItemViewSet(viewsets.ModelViewSet):
         serializer = ReorderSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        for item_data in serializer.validated_data['items']:
-            update_fields = {'order': int(item_data['order'])}
-            if 'sprint_id' in item_data:
-                update_fields['sprint_id'] = item_data['sprint_id']
+        client = get_tenant(request)
+        items = serializer.validated_data['items']
+
+        # Cross-sprint moves may only target this client's sprints
+        try:
+            sprint_ids = {uuid.UUID(item['sprint_id']) for item in items if item.get('sprint_id')}
+        except ValueError:
+            return Response({'error': 'Invalid sprint_id'}, status=status.HTTP_400_BAD_REQUEST)
+        if sprint_ids and Sprint.objects.filter(client=client, id__in=sprint_ids).count() != len(sprint_ids):
+            return Response(
+                {'error': 'Sprint not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
 
-            SprintItem.objects.filter(
-                id=item_data['id'],
-                client__slug=client_slug
-            ).update(**update_fields)
+        bulk_reorder(
+            SprintItem, with_order_ranks(items),
+            scope={'client_id': client.id}, fields=('order', 'sprint_id', 'rank'),
+        )
 
+        bump_version(client.id)
         return Response({'status': 'reordered'})
 
 
-class DeliveryMilestoneViewSet(viewsets.ModelViewSet):
+class DeliveryMilestoneViewSet(RankActionMixin, viewsets.ModelViewSet):
     """ViewSet for DeliveryMilestone CRUD operations."""
 
     def get_serializer_class(self):
@@ -192,16 +324,13 @@ class DeliveryMilestoneViewSet(viewsets.ModelViewSet):
         return DeliveryMilestoneSerializer
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
         return DeliveryMilestone.objects.filter(
-            client__slug=client_slug
-        ).order_by('order', 'start_date')
+            client_id=get_tenant(self.request).id
+        ).order_by(F('rank').asc(nulls_last=True), 'order', 'start_date')
 
     def perform_create(self, serializer):
-        from apps.clients.models import Client
-        client_slug = self.kwargs.get('client_slug')
-        client = Client.objects.get(slug=client_slug)
-        serializer.save(client=client)
+        client = get_tenant(self.request)
+        serializer.save(client=client, rank=place(DeliveryMilestone, 'client_id', client.id))
 
     @action(detail=False, methods=['post'])
     def reorder(self, request, client_slug=None):
@@ -209,10 +338,11 @@ class DeliveryMilestoneViewSet(viewsets.ModelViewSet):
         serializer = ReorderSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        for item in serializer.validated_data['items']:
-            DeliveryMilestone.objects.filter(
-                id=item['id'],
-                client__slug=client_slug
-            ).update(order=int(item['order']))
+        client = get_tenant(request)
+        bulk_reorder(
+            DeliveryMilestone, with_order_ranks(serializer.validated_data['items']),
+            scope={'client_id': client.id}, fields=('order', 'rank'),
+        )
 
+        bump_version(client.id)
         return Response({'status': 'reordered'})
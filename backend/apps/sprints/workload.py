@@ -0,0 +1,133 @@
+"""
+Per-person workload from sprint item assignments.
+
+Each open, assigned item spreads its ``estimated_hours`` evenly over the
+working days (Mon-Fri) of its date range; items without their own dates
+fall back to their sprint's. All items are accumulated in one pass into a
+``(people, days)`` NumPy grid as a difference array: ``np.add.at`` adds an
+item's daily rate at its first day in the window and subtracts it after its
+last, and a cumulative sum along the day axis turns the deltas into daily
+hours. Items scheduled entirely on a weekend are spread over those calendar
+days instead of vanishing.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+
+from .models import SprintItem
+
+OPEN_STATUSES = ('planned', 'in_progress', 'blocked')
+MAX_WINDOW_DAYS = 366
+BUCKETS = ('day', 'week')
+
+
+def default_window(today, weeks=4):
+    """Monday of the current week through the Sunday ``weeks`` weeks later."""
+    start = today - timedelta(days=today.weekday())
+    return start, start + timedelta(days=7 * weeks - 1)
+
+
+def _assignments(client_id, start, end):
+    """Open assigned items overlapping [start, end] as NumPy columns."""
+    rows = (
+        SprintItem.objects.filter(
+            client_id=client_id,
+            status__in=OPEN_STATUSES,
+            estimated_hours__gt=0,
+        )
+        .exclude(Q(assigned_to__isnull=True) | Q(assigned_to=''))
+        .annotate(
+            first_day=Coalesce('start_date', 'end_date', 'sprint__start_date'),
+            last_day=Coalesce('end_date', 'start_date', 'sprint__end_date'),
+        )
+        .filter(first_day__lte=end, last_day__gte=start)
+        .filter(last_day__gte=F('first_day'))
+        .values_list('assigned_to', 'estimated_hours', 'first_day', 'last_day')
+    )
+    rows = list(rows)
+    if not rows:
+        return None
+
+    people, hours, first, last = zip(*rows)
+    return (
+        np.asarray(people, dtype=object),
+        np.asarray(hours, dtype=np.float64),
+        np.asarray(first, dtype='datetime64[D]'),
+        np.asarray(last, dtype='datetime64[D]'),
+    )
+
+
+def workload(client_id, start, end, capacity=None, bucket='day'):
+    """Daily (or weekly) assigned hours per person over [start, end].
+
+    ``capacity`` is hours per working day (``WORKLOAD_DAILY_CAPACITY_HOURS``
+    by default); a bucket is overloaded when its hours exceed the capacity
+    of the working days it covers.
+    """
+    capacity = float(settings.WORKLOAD_DAILY_CAPACITY_HOURS if capacity is None else capacity)
+    days = (end - start).days + 1
+    window_start = np.datetime64(start, 'D')
+    calendar = window_start + np.arange(days)
+    working = np.is_busday(calendar)
+
+    data = _assignments(client_id, start, end)
+    if data is None:
+        names = np.asarray([], dtype=object)
+        grid = np.zeros((0, days))
+    else:
+        people, hours, first, last = data
+        names, person = np.unique(people, return_inverse=True)
+
+        # Rate per day the item is worked; weekend-only items use calendar days
+        busdays = np.busday_count(first, last + 1)
+        weekday_only = busdays > 0
+        span = np.where(weekday_only, busdays, (last - first).astype(np.int64) + 1)
+        rate = hours / span
+
+        # Clip each range to the window (day offsets, end exclusive)
+        lo = np.clip((first - window_start).astype(np.int64), 0, days)
+        hi = np.clip((last - window_start).astype(np.int64) + 1, 0, days)
+
+        # Two difference arrays: weekday-spread items are masked to working
+        # days after the running sum, weekend-only items are not
+        deltas = np.zeros((2, len(names), days + 1))
+        kind = (~weekday_only).astype(np.int64)
+        np.add.at(deltas, (kind, person, lo), rate)
+        np.add.at(deltas, (kind, person, hi), -rate)
+        loads = np.cumsum(deltas[:, :, :days], axis=2)
+        grid = loads[0] * working + loads[1]
+
+    if bucket == 'week':
+        edges = np.arange(0, days, 7)
+        grid = np.add.reduceat(grid, edges, axis=1) if len(names) else np.zeros((0, len(edges)))
+        limits = capacity * np.add.reduceat(working.astype(np.int64), edges)
+        labels = calendar[edges]
+    else:
+        limits = capacity * working
+        labels = calendar
+
+    # Float noise from the running sums must not flag an exactly-full day
+    overloaded = grid > limits + 1e-6
+    return {
+        'start': start,
+        'end': end,
+        'bucket': bucket,
+        'capacity_hours_per_day': capacity,
+        'buckets': [str(label) for label in labels],
+        'capacity': np.round(limits, 2).tolist(),
+        'people': [
+            {
+                'assigned_to': name,
+                'hours': np.round(grid[i], 2).tolist(),
+                'total_hours': round(float(grid[i].sum()), 2),
+                'peak_hours': round(float(grid[i].max()), 2) if grid.shape[1] else 0.0,
+                'overloaded': bool(overloaded[i].any()),
+                'overloaded_buckets': np.flatnonzero(overloaded[i]).tolist(),
+            }
+            for i, name in enumerate(names)
+        ],
+    }
@@ -0,0 +1,51 @@
+"""
+Management command to (re)build the near-duplicate similarity index.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.clients.models import Client
+from apps.suggestions.models import AISuggestion, SimilaritySignature
+from apps.suggestions.similarity import (
+    INDEXED_STATUSES, RECORD_KINDS, record_model, record_signature, suggestion_signature
+)
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Build MinHash signatures for business rules, decisions, action items and suggestions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--client', help='Only index this client slug')
+
+    def handle(self, *args, **options):
+        clients = Client.objects.all()
+        if options['client']:
+            clients = clients.filter(slug=options['client'])
+
+        for client in clients:
+            SimilaritySignature.objects.filter(client=client).delete()
+            total = 0
+
+            for kind in RECORD_KINDS:
+                records = record_model(kind).objects.filter(client=client)
+                created = SimilaritySignature.objects.bulk_create(
+                    [record_signature(kind, r) for r in records.iterator(chunk_size=BATCH_SIZE)],
+                    batch_size=BATCH_SIZE,
+                )
+                total += len(created)
+
+            suggestions = AISuggestion.objects.filter(
+                client=client,
+                suggestion_type__in=list(RECORD_KINDS),
+                status__in=INDEXED_STATUSES,
+            )
+            created = SimilaritySignature.objects.bulk_create(
+                [suggestion_signature(s) for s in suggestions.iterator(chunk_size=BATCH_SIZE)],
+                batch_size=BATCH_SIZE,
+            )
+            total += len(created)
+
+            self.stdout.write(f'{client.slug}: indexed {total} items')
+
+        self.stdout.write(self.style.SUCCESS('Similarity index rebuilt'))
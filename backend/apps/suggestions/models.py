@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.contrib.postgres.fields import ArrayField
 
 
 class AISuggestion(models.Model):
@@ -52,3 +53,35 @@ class AISuggestion(models.Model):
 
     def __str__(self):
         return f"{self.suggestion_type}: {self.confidence}"
+
+
+class SimilaritySignature(models.Model):
+    """MinHash signature and LSH band keys for near-duplicate detection."""
+    SOURCE_RECORD = 'record'
+    SOURCE_SUGGESTION = 'suggestion'
+    SOURCE_CHOICES = [
+        (SOURCE_RECORD, 'Record'),
+        (SOURCE_SUGGESTION, 'Suggestion'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    client = models.ForeignKey(
+        'clients.Client',
+        on_delete=models.CASCADE,
+        related_name='similarity_signatures',
+        db_column='client_id'
+    )
+    kind = models.CharField(max_length=50)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    object_id = models.UUIDField()
+    label = models.CharField(max_length=50, blank=True, default='')
+    signature = ArrayField(models.BigIntegerField())
+    band_keys = ArrayField(models.BigIntegerField())
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'similarity_signatures'
+        managed = False
+
+    def __str__(self):
+        return f"{self.kind}/{self.source}: {self.label or self.object_id}"
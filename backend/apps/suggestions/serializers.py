@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from utils.fast_serializers import FastSerializer
 from .models import AISuggestion
 
 
@@ -13,6 +14,9 @@ class AISuggestionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'meeting', 'suggestion_type', 'suggested_content', 'confidence', 'created_at']
 
 
+AISuggestionFastSerializer = FastSerializer(AISuggestionSerializer)
+
+
 class SuggestionActionSerializer(serializers.Serializer):
     action = serializers.ChoiceField(choices=['approve', 'reject'])
     reviewed_by = serializers.CharField(required=False)
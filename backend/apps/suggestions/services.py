@@ -0,0 +1,203 @@
+"""
+Set-based approval of AI suggestions.
+
+Approving N suggestions locks the pending rows once, allocates record codes
+in one block per type, bulk-creates the resulting BusinessRule, Decision and
+ActionItem rows and bulk-updates the answered questions and the suggestions
+themselves, all inside a single transaction. The query count is constant in
+N instead of three or more round trips per suggestion.
+
+Transcript analysis reuses the same path to auto-approve new suggestions
+that meet the client's ClientSettings policy.
+"""
+
+from collections import Counter
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.actions.models import ActionItem
+from apps.clients.models import Client
+from apps.questions.models import Question
+from apps.rules.models import BusinessRule, Decision
+
+from .models import AISuggestion
+from .similarity import index_signatures, record_signature
+
+BATCH_SIZE = 500
+
+
+def _allocate_codes(model, client_id, prefix, count):
+    """Reserve ``count`` sequential codes (``PREFIX-<n>``) for a client.
+
+    Follows the existing ``count() + 100`` numbering; callers hold the
+    client row lock so concurrent approvals cannot hand out the same block.
+    """
+    start = model.objects.filter(client_id=client_id).count() + 100
+    return [f"{prefix}-{start + offset}" for offset in range(count)]
+
+
+def _build_business_rules(client_id, suggestions):
+    codes = _allocate_codes(BusinessRule, client_id, 'BR', len(suggestions))
+    return [
+        BusinessRule(
+            client_id=client_id,
+            rule_code=code,
+            title=s.suggested_content.get('title', ''),
+            description=s.suggested_content.get('description', ''),
+            category=s.suggested_content.get('category', ''),
+            discovered_in_meeting_id=s.meeting_id,
+            source='AI Suggestion',
+        )
+        for s, code in zip(suggestions, codes)
+    ]
+
+
+def _build_action_items(client_id, suggestions):
+    codes = _allocate_codes(ActionItem, client_id, 'ACT', len(suggestions))
+    return [
+        ActionItem(
+            client_id=client_id,
+            action_code=code,
+            title=s.suggested_content.get('title', ''),
+            description=s.suggested_content.get('description', ''),
+            assigned_to=s.suggested_content.get('assignee', ''),
+            priority=s.suggested_content.get('priority', 'medium'),
+            from_meeting_id=s.meeting_id,
+        )
+        for s, code in zip(suggestions, codes)
+    ]
+
+
+def _build_decisions(client_id, suggestions):
+    codes = _allocate_codes(Decision, client_id, 'DEC', len(suggestions))
+    return [
+        Decision(
+            client_id=client_id,
+            decision_code=code,
+            title=s.suggested_content.get('title', ''),
+            description=s.suggested_content.get('description', ''),
+            made_in_meeting_id=s.meeting_id,
+            made_by='AI Suggestion',
+        )
+        for s, code in zip(suggestions, codes)
+    ]
+
+
+RECORD_BUILDERS = {
+    'business_rule': (BusinessRule, _build_business_rules),
+    'action_item': (ActionItem, _build_action_items),
+    'decision': (Decision, _build_decisions),
+}
+
+
+def _apply_answers(suggestions, now):
+    questions = {}
+    for suggestion in suggestions:
+        question = suggestion.target_question
+        if question is None:
+            continue
+        content = suggestion.suggested_content
+        question.answer = content.get('answer', '')
+        question.answered_by = 'AI Suggestion'
+        question.answered_date = now.date()
+        question.answer_grounding = content.get('grounding')
+        question.status = 'answered'
+        question.updated_at = now
+        questions[question.pk] = question
+
+    Question.objects.bulk_update(
+        list(questions.values()),
+        ['answer', 'answered_by', 'answered_date', 'answer_grounding', 'status', 'updated_at'],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def approve_suggestions(client_id, suggestion_ids, reviewed_by='', statuses=('pending',)):
+    """Approve the client's pending suggestions among ``suggestion_ids``.
+
+    Returns a Counter of approved suggestions per suggestion_type. Rows that
+    are missing, belong to another client or are not in one of ``statuses``
+    are skipped; pass ``('pending', 'rejected')`` to re-open and approve
+    rejected ones under the same lock. Either every selected suggestion is
+    applied or none is.
+    """
+    counts = Counter()
+    if not suggestion_ids:
+        return counts
+
+    with transaction.atomic():
+        # Serializes code allocation for this client
+        Client.objects.select_for_update().filter(pk=client_id).first()
+
+        suggestions = list(
+            AISuggestion.objects.select_for_update(of=('self',))
+            .select_related('target_question')
+            .filter(client_id=client_id, id__in=list(suggestion_ids), status__in=statuses)
+            .order_by('created_at')
+        )
+        if not suggestions:
+            return counts
+
+        by_type = {}
+        for suggestion in suggestions:
+            by_type.setdefault(suggestion.suggestion_type, []).append(suggestion)
+
+        now = timezone.now()
+        _apply_answers(by_type.get('answer', []), now)
+
+        for suggestion_type, (model, build) in RECORD_BUILDERS.items():
+            group = by_type.get(suggestion_type)
+            if not group:
+                continue
+            records = model.objects.bulk_create(build(client_id, group), batch_size=BATCH_SIZE)
+            index_signatures(record_signature(suggestion_type, record) for record in records)
+
+        for suggestion in suggestions:
+            suggestion.status = 'approved'
+            suggestion.reviewed_at = now
+            suggestion.reviewed_by = reviewed_by
+            counts[suggestion.suggestion_type] += 1
+        AISuggestion.objects.bulk_update(
+            suggestions, ['status', 'reviewed_at', 'reviewed_by'], batch_size=BATCH_SIZE
+        )
+
+    return counts
+
+
+def auto_approve_suggestions(client_settings, suggestions):
+    """Approve the suggestions that satisfy a client's auto-approval policy.
+
+    A suggestion qualifies when its type is listed in
+    ``client_settings.auto_approve_types``, its confidence reaches
+    ``auto_approve_threshold``, it is still pending, it was not flagged as a
+    likely duplicate and its source quote (if any) was found in the
+    transcript. The policy that applied is recorded in ``reviewed_by``.
+    Returns the Counter from ``approve_suggestions``.
+    """
+    types = set(client_settings.auto_approve_types or [])
+    threshold = client_settings.auto_approve_threshold
+    if not types or threshold is None:
+        return Counter()
+
+    threshold = Decimal(threshold)
+    eligible = []
+    for suggestion in suggestions:
+        content = suggestion.suggested_content or {}
+        grounding = content.get('grounding')
+        if (
+            suggestion.status == 'pending'
+            and suggestion.suggestion_type in types
+            and suggestion.confidence is not None
+            and Decimal(str(suggestion.confidence)) >= threshold
+            and 'duplicate_of' not in content
+            and not (grounding and not grounding.get('matched'))
+        ):
+            eligible.append(suggestion.id)
+
+    return approve_suggestions(
+        client_settings.client_id,
+        eligible,
+        reviewed_by=f'Auto-approval (confidence >= {threshold})',
+    )
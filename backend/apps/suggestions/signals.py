@@ -0,0 +1,69 @@
+"""
+Keep similarity signatures in step with rules, decisions and action items.
+
+A record is reindexed when it is created or when a field its signature is
+built from changes; other saves (status, dates, assignees) leave the index
+alone. The indexed values are remembered when the instance is loaded.
+Suggestions leave the index when they are saved as rejected.
+"""
+
+from django.db.models.signals import post_delete, post_init, post_save
+
+from .models import AISuggestion, SimilaritySignature
+from .similarity import (
+    INDEXED_STATUSES, RECORD_KINDS, drop_signatures, index_signatures, record_fields, record_model, record_signature,
+)
+
+
+def _indexed_values(instance, fields):
+    """Values of ``fields`` on ``instance``, or None when any is deferred."""
+    values = instance.__dict__
+    if any(name not in values for name in fields):
+        return None
+    return tuple(values[name] for name in fields)
+
+
+def _remember_record(kind):
+    fields = record_fields(kind)
+
+    def handler(sender, instance, **kwargs):
+        instance._similarity_values = _indexed_values(instance, fields)
+    return handler
+
+
+def _reindex_record(kind):
+    fields = record_fields(kind)
+
+    def handler(sender, instance, created=False, update_fields=None, **kwargs):
+        if update_fields is not None and not set(fields) & set(update_fields):
+            return
+        values = _indexed_values(instance, fields)
+        if not created and values is not None and values == getattr(instance, '_similarity_values', None):
+            return
+        index_signatures([record_signature(kind, instance)])
+        instance._similarity_values = values
+    return handler
+
+
+def _drop_signature(sender, instance, **kwargs):
+    SimilaritySignature.objects.filter(object_id=instance.pk).delete()
+
+
+def _drop_rejected_suggestion(sender, instance, **kwargs):
+    if instance.status not in INDEXED_STATUSES and instance.suggestion_type in RECORD_KINDS:
+        drop_signatures([instance.pk])
+
+
+# Receivers are kept module-level so the weak references stay alive
+_record_loaders = {kind: _remember_record(kind) for kind in RECORD_KINDS}
+_record_handlers = {kind: _reindex_record(kind) for kind in RECORD_KINDS}
+
+
+def connect():
+    for kind, handler in _record_handlers.items():
+        model = record_model(kind)
+        post_init.connect(_record_loaders[kind], sender=model, dispatch_uid=f'similarity-load-{kind}')
+        post_save.connect(handler, sender=model, dispatch_uid=f'similarity-index-{kind}')
+        post_delete.connect(_drop_signature, sender=model, dispatch_uid=f'similarity-drop-{kind}')
+    post_save.connect(_drop_rejected_suggestion, sender=AISuggestion, dispatch_uid='similarity-reject-suggestion')
+    post_delete.connect(_drop_signature, sender=AISuggestion, dispatch_uid='similarity-drop-suggestion')
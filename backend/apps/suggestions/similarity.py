@@ -0,0 +1,228 @@
+"""
+Near-duplicate detection for AI suggestions.
+
+Each suggestion and each existing BusinessRule/Decision/ActionItem gets a
+MinHash signature over word shingles of its title and description. The
+signature is split into LSH bands whose hashes are stored in
+``similarity_signatures.band_keys`` (GIN-indexed), so candidate duplicates
+for a new suggestion come from one array-overlap lookup per client instead
+of a scan of the tenant's history.
+
+Only pending and approved suggestions are indexed. Rejected ones (by a
+reviewer or merged by duplicate detection) are dropped from the index and
+never offered as candidates, so new suggestions are not matched against
+items a human already turned down.
+"""
+
+import hashlib
+import random
+import re
+
+from django.apps import apps
+from django.utils import timezone
+
+from .models import AISuggestion, SimilaritySignature
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+
+# Estimated Jaccard similarity at which a suggestion is flagged for review,
+# and at which it is merged into the existing item automatically.
+FLAG_THRESHOLD = 0.5
+MERGE_THRESHOLD = 0.9
+
+_PRIME = (1 << 61) - 1
+_MAX_BIGINT = (1 << 63) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# suggestion_type -> (model label, code field)
+RECORD_KINDS = {
+    'business_rule': ('rules.BusinessRule', 'rule_code'),
+    'decision': ('rules.Decision', 'decision_code'),
+    'action_item': ('actions.ActionItem', 'action_code'),
+}
+
+# Suggestion statuses kept in the index
+INDEXED_STATUSES = ('pending', 'approved')
+
+
+def _hash64(value):
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') & _MAX_BIGINT
+
+
+def signature_text(content):
+    """Text that identifies a rule/decision/action item."""
+    return f"{content.get('title') or ''} {content.get('description') or ''}"
+
+
+def shingles(text):
+    words = [w.lower() for w in WORD_RE.findall(text or '')]
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    """MinHash signature (list of NUM_PERMUTATIONS ints) for ``text``."""
+    hashes = [_hash64(shingle) for shingle in shingles(text)]
+    if not hashes:
+        return [_PRIME] * NUM_PERMUTATIONS
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_keys(signature):
+    """One LSH bucket key per band, salted with the band number."""
+    return [
+        _hash64(f"{band}:" + ','.join(map(str, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])))
+        for band in range(BANDS)
+    ]
+
+
+def estimate_similarity(signature_a, signature_b):
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / NUM_PERMUTATIONS
+
+
+def build_signature(client_id, kind, source, object_id, content, label=''):
+    """Unsaved SimilaritySignature for one record or suggestion."""
+    signature = minhash(signature_text(content))
+    return SimilaritySignature(
+        client_id=client_id,
+        kind=kind,
+        source=source,
+        object_id=object_id,
+        label=label or '',
+        signature=signature,
+        band_keys=band_keys(signature),
+    )
+
+
+def record_model(kind):
+    return apps.get_model(RECORD_KINDS[kind][0])
+
+
+def record_fields(kind):
+    """Record fields a signature is built from."""
+    return ('title', 'description', RECORD_KINDS[kind][1])
+
+
+def record_signature(kind, record):
+    _, code_field = RECORD_KINDS[kind]
+    return build_signature(
+        record.client_id, kind, SimilaritySignature.SOURCE_RECORD, record.id,
+        {'title': record.title, 'description': record.description},
+        label=getattr(record, code_field),
+    )
+
+
+def suggestion_signature(suggestion):
+    return build_signature(
+        suggestion.client_id, suggestion.suggestion_type, SimilaritySignature.SOURCE_SUGGESTION,
+        suggestion.id, suggestion.suggested_content or {},
+    )
+
+
+def index_signatures(signatures):
+    """Replace the stored signatures for the given objects in bulk."""
+    signatures = list(signatures)
+    if not signatures:
+        return
+    SimilaritySignature.objects.filter(
+        object_id__in=[s.object_id for s in signatures]
+    ).delete()
+    SimilaritySignature.objects.bulk_create(signatures)
+
+
+def drop_signatures(object_ids):
+    object_ids = list(object_ids)
+    if object_ids:
+        SimilaritySignature.objects.filter(object_id__in=object_ids).delete()
+
+
+def index_suggestions(suggestions):
+    """Index the suggestions in ``INDEXED_STATUSES`` and drop the others."""
+    suggestions = [s for s in suggestions if s.suggestion_type in RECORD_KINDS]
+    drop_signatures(s.id for s in suggestions if s.status not in INDEXED_STATUSES)
+    index_signatures(suggestion_signature(s) for s in suggestions if s.status in INDEXED_STATUSES)
+
+
+def find_duplicate(client_id, kind, content, exclude_ids=(), unindexed=()):
+    """Best existing match for ``content`` among the client's items of ``kind``.
+
+    ``unindexed`` holds SimilaritySignatures not stored yet (earlier
+    suggestions of the same batch) that are candidates as well. Returns a
+    dict (type, id, code, source, similarity) or None when nothing reaches
+    FLAG_THRESHOLD.
+    """
+    signature = minhash(signature_text(content))
+    keys = band_keys(signature)
+    candidates = list(SimilaritySignature.objects.filter(
+        client_id=client_id,
+        kind=kind,
+        band_keys__overlap=keys,
+    ).exclude(
+        object_id__in=list(exclude_ids),
+    ).exclude(
+        # Signatures indexed before their suggestion was rejected
+        source=SimilaritySignature.SOURCE_SUGGESTION,
+        object_id__in=AISuggestion.objects.filter(client_id=client_id, status='rejected').values('id'),
+    ).values_list('source', 'object_id', 'label', 'signature'))
+    candidates.extend(
+        (s.source, s.object_id, s.label, s.signature)
+        for s in unindexed
+        if s.client_id == client_id and s.kind == kind and s.object_id not in exclude_ids
+        and not set(s.band_keys).isdisjoint(keys)
+    )
+
+    best = None
+    for source, object_id, label, candidate in candidates:
+        similarity = estimate_similarity(signature, candidate)
+        # Prefer confirmed records over other pending suggestions on ties
+        rank = (similarity, source == SimilaritySignature.SOURCE_RECORD)
+        if best is None or rank > best[0]:
+            best = (rank, source, object_id, label)
+
+    if best is None or best[0][0] < FLAG_THRESHOLD:
+        return None
+    (similarity, _), source, object_id, label = best
+    return {
+        'type': kind,
+        'source': source,
+        'id': str(object_id),
+        'code': label or None,
+        'similarity': round(similarity, 2),
+    }
+
+
+def apply_duplicate_check(suggestion, unindexed=()):
+    """Flag or merge an unsaved AISuggestion that duplicates an existing item.
+
+    Likely duplicates stay pending with ``suggested_content['duplicate_of']``
+    set; near-identical ones are closed as rejected by duplicate detection
+    (and so are not indexed by ``index_suggestions``). ``unindexed`` is
+    passed on to ``find_duplicate``. Returns the match dict or None.
+    """
+    if suggestion.suggestion_type not in RECORD_KINDS:
+        return None
+    match = find_duplicate(
+        suggestion.client_id, suggestion.suggestion_type, suggestion.suggested_content or {},
+        exclude_ids=[suggestion.id], unindexed=unindexed,
+    )
+    if match is None:
+        return None
+
+    suggestion.suggested_content = {**suggestion.suggested_content, 'duplicate_of': match}
+    if match['similarity'] >= MERGE_THRESHOLD:
+        suggestion.status = 'rejected'
+        suggestion.reviewed_at = timezone.now()
+        suggestion.reviewed_by = 'Duplicate detection'
+    return match
@@ -1,3 +1,348 @@
-from django.test import TestCase
+import datetime
+from decimal import Decimal
 
-# Create your tests here.
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.actions.models import ActionItem
+from apps.clients.models import Client
+from apps.meetings.models import Meeting
+from apps.questions.models import Question
+from apps.rules.models import BusinessRule, Decision
+from apps.settings_app.models import ClientSettings
+
+from .models import AISuggestion, SimilaritySignature
+from .services import approve_suggestions, auto_approve_suggestions
+from .similarity import (
+    BANDS,
+    FLAG_THRESHOLD,
+    NUM_PERMUTATIONS,
+    apply_duplicate_check,
+    band_keys,
+    estimate_similarity,
+    find_duplicate,
+    index_suggestions,
+    minhash,
+    shingles,
+    suggestion_signature,
+)
+
+DECISION = {
+    'title': 'Switch the Rotterdam lane to the new carrier',
+    'description': 'Freight for the Rotterdam lane moves to the new carrier from the first of March '
+                   'once the contract is signed and customs documentation is updated.',
+}
+REWORDED = {
+    'title': 'Switch the Rotterdam lane to the new carrier',
+    'description': 'Freight for the Rotterdam lane moves to the new carrier from the first of April '
+                   'once the contract is signed and customs documentation is updated.',
+}
+UNRELATED = {
+    'title': 'Quarterly pricing review',
+    'description': 'Finance reviews the tariff margins for every customer at the end of the quarter.',
+}
+
+
+def text(content):
+    return f"{content['title']} {content['description']}"
+
+
+class MinHashTests(SimpleTestCase):
+
+    def test_shingles(self):
+        self.assertEqual(shingles('Ship the  CONTAINER today'), {'ship the container', 'the container today'})
+        self.assertEqual(shingles('two words'), {'two words'})
+        self.assertEqual(shingles(''), set())
+
+    def test_signature_is_deterministic(self):
+        signature = minhash(text(DECISION))
+        self.assertEqual(len(signature), NUM_PERMUTATIONS)
+        self.assertEqual(signature, minhash(text(DECISION)))
+        self.assertEqual(len(band_keys(signature)), BANDS)
+
+    def test_estimate_tracks_jaccard(self):
+        a, b = shingles(text(DECISION)), shingles(text(REWORDED))
+        jaccard = len(a & b) / len(a | b)
+        estimate = estimate_similarity(minhash(text(DECISION)), minhash(text(REWORDED)))
+        self.assertAlmostEqual(estimate, jaccard, delta=0.2)
+        self.assertGreaterEqual(estimate, FLAG_THRESHOLD)
+
+    def test_unrelated_text(self):
+        estimate = estimate_similarity(minhash(text(DECISION)), minhash(text(UNRELATED)))
+        self.assertLess(estimate, 0.2)
+
+    def test_near_duplicates_share_a_band(self):
+        # The LSH candidate lookup relies on this
+        self.assertTrue(set(band_keys(minhash(text(DECISION)))) & set(band_keys(minhash(text(REWORDED)))))
+        self.assertFalse(set(band_keys(minhash(text(DECISION)))) & set(band_keys(minhash(text(UNRELATED)))))
+
+
+class DuplicateIndexTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        cls.meeting = Meeting.objects.create(
+            client=cls.client_, meeting_code='MTG-1', date=datetime.date(2026, 1, 5), title='Kickoff'
+        )
+
+    def suggestion(self, content, **kwargs):
+        suggestion = AISuggestion.objects.create(
+            meeting=self.meeting, client=self.client_, suggestion_type='decision',
+            suggested_content=content, **kwargs
+        )
+        index_suggestions([suggestion])
+        return suggestion
+
+    def indexed(self, obj):
+        return SimilaritySignature.objects.filter(object_id=obj.pk).exists()
+
+    def test_record_indexed_on_create(self):
+        decision = Decision.objects.create(client=self.client_, decision_code='DEC-100', **DECISION)
+        self.assertTrue(self.indexed(decision))
+        match = find_duplicate(self.client_.id, 'decision', REWORDED)
+        self.assertEqual((match['id'], match['code'], match['source']), (str(decision.id), 'DEC-100', 'record'))
+        self.assertIsNone(find_duplicate(self.client_.id, 'decision', UNRELATED))
+
+    def test_record_reindexed_only_when_text_changes(self):
+        decision = Decision.objects.create(client=self.client_, decision_code='DEC-100', **DECISION)
+        signature_id = SimilaritySignature.objects.get(object_id=decision.id).id
+
+        decision.status = 'pending'
+        with self.assertNumQueries(1):
+            decision.save()
+        loaded = Decision.objects.get(pk=decision.pk)
+        loaded.implementation_notes = 'Notes'
+        with self.assertNumQueries(1):
+            loaded.save()
+        self.assertEqual(SimilaritySignature.objects.get(object_id=decision.id).id, signature_id)
+
+        loaded.description = UNRELATED['description']
+        loaded.save()
+        self.assertNotEqual(SimilaritySignature.objects.get(object_id=decision.id).id, signature_id)
+
+    def test_update_fields_without_text_skip_reindex(self):
+        decision = Decision.objects.create(client=self.client_, decision_code='DEC-100', **DECISION)
+        decision.title = 'Changed title'
+        with self.assertNumQueries(1):
+            decision.save(update_fields=['status'])
+
+    def test_pending_suggestion_flagged(self):
+        original = self.suggestion(DECISION)
+        duplicate = AISuggestion(
+            meeting=self.meeting, client=self.client_, suggestion_type='decision', suggested_content=REWORDED
+        )
+        match = apply_duplicate_check(duplicate)
+        self.assertEqual(match['id'], str(original.id))
+        self.assertEqual(duplicate.status, 'pending')
+        self.assertEqual(duplicate.suggested_content['duplicate_of'], match)
+
+    def test_unindexed_signature_is_a_candidate(self):
+        earlier = AISuggestion.objects.create(
+            meeting=self.meeting, client=self.client_, suggestion_type='decision', suggested_content=DECISION
+        )
+        unindexed = [suggestion_signature(earlier)]
+        duplicate = AISuggestion(
+            meeting=self.meeting, client=self.client_, suggestion_type='decision', suggested_content=REWORDED
+        )
+        self.assertIsNone(apply_duplicate_check(duplicate))
+        match = apply_duplicate_check(duplicate, unindexed=unindexed)
+        self.assertEqual((match['id'], match['source']), (str(earlier.id), 'suggestion'))
+        self.assertIsNone(find_duplicate(self.client_.id, 'business_rule', REWORDED, unindexed=unindexed))
+
+    def test_identical_suggestion_merged_and_not_indexed(self):
+        self.suggestion(DECISION)
+        duplicate = AISuggestion(
+            meeting=self.meeting, client=self.client_, suggestion_type='decision', suggested_content=dict(DECISION)
+        )
+        apply_duplicate_check(duplicate)
+        self.assertEqual(duplicate.status, 'rejected')
+        duplicate.save()
+        index_suggestions([duplicate])
+        self.assertFalse(self.indexed(duplicate))
+
+    def test_rejected_suggestion_leaves_index(self):
+        suggestion = self.suggestion(DECISION)
+        self.assertTrue(self.indexed(suggestion))
+        suggestion.status = 'rejected'
+        suggestion.save()
+        self.assertFalse(self.indexed(suggestion))
+        self.assertIsNone(find_duplicate(self.client_.id, 'decision', REWORDED))
+
+    def test_rejected_suggestion_never_a_candidate(self):
+        # A signature left from before the suggestion was rejected
+        suggestion = self.suggestion(DECISION)
+        AISuggestion.objects.filter(pk=suggestion.pk).update(status='rejected')
+        self.assertTrue(self.indexed(suggestion))
+        self.assertIsNone(find_duplicate(self.client_.id, 'decision', REWORDED))
+
+    def test_other_clients_ignored(self):
+        other = Client.objects.create(name='Other', slug='other')
+        Decision.objects.create(client=other, decision_code='DEC-100', **DECISION)
+        self.assertIsNone(find_duplicate(self.client_.id, 'decision', REWORDED))
+
+
+class ApproveSuggestionsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        cls.meeting = Meeting.objects.create(
+            client=cls.client_, meeting_code='MTG-1', date=datetime.date(2026, 1, 5), title='Kickoff'
+        )
+
+    def create(self, suggestion_type, content, client=None, **kwargs):
+        return AISuggestion.objects.create(
+            meeting=self.meeting, client=client or self.client_, suggestion_type=suggestion_type,
+            suggested_content=content, **kwargs
+        )
+
+    def batch(self, count):
+        return [
+            self.create(kind, {'title': f'{kind} {n}', 'description': f'Details of {kind} number {n}'}).id
+            for n in range(count)
+            for kind in ('business_rule', 'decision', 'action_item')
+        ]
+
+    def test_applies_each_type(self):
+        question = Question.objects.create(client=self.client_, question_code='Q-1', question='When?')
+        ids = [
+            self.create('business_rule', {'title': 'Rule', 'description': 'Always', 'category': 'ops'}).id,
+            self.create('decision', {'title': 'Decision', 'description': 'Go'}).id,
+            self.create('action_item', {'title': 'Act', 'assignee': 'Ana', 'priority': 'high'}).id,
+            self.create('answer', {'answer': 'Monday'}, target_question=question).id,
+        ]
+        counts = approve_suggestions(self.client_.id, ids, reviewed_by='Ana')
+
+        self.assertEqual(counts, {'business_rule': 1, 'decision': 1, 'action_item': 1, 'answer': 1})
+        rule = BusinessRule.objects.get(client=self.client_)
+        self.assertEqual((rule.rule_code, rule.category, rule.discovered_in_meeting_id), ('BR-100', 'ops', self.meeting.id))
+        self.assertEqual(Decision.objects.get(client=self.client_).decision_code, 'DEC-100')
+        action = ActionItem.objects.get(client=self.client_)
+        self.assertEqual((action.action_code, action.assigned_to, action.priority), ('ACT-100', 'Ana', 'high'))
+        question.refresh_from_db()
+        self.assertEqual((question.status, question.answer), ('answered', 'Monday'))
+        self.assertEqual(
+            set(AISuggestion.objects.filter(id__in=ids).values_list('status', 'reviewed_by')), {('approved', 'Ana')}
+        )
+        # Approved records are indexed for duplicate detection
+        self.assertTrue(SimilaritySignature.objects.filter(object_id=rule.id).exists())
+
+    def test_codes_continue_numbering(self):
+        approve_suggestions(self.client_.id, self.batch(2))
+        approve_suggestions(self.client_.id, self.batch(1))
+        self.assertEqual(
+            sorted(Decision.objects.filter(client=self.client_).values_list('decision_code', flat=True)),
+            ['DEC-100', 'DEC-101', 'DEC-102'],
+        )
+
+    def test_query_count_constant(self):
+        counts = []
+        for size in (1, 20):
+            ids = self.batch(size)
+            with CaptureQueriesContext(connection) as queries:
+                approve_suggestions(self.client_.id, ids)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_skips_reviewed_and_foreign(self):
+        other = Client.objects.create(name='Other', slug='other')
+        rejected = self.create('decision', {'title': 'Old'}, status='rejected')
+        foreign = self.create('decision', {'title': 'Theirs'}, client=other)
+        pending = self.create('decision', {'title': 'Mine'})
+
+        counts = approve_suggestions(self.client_.id, [rejected.id, foreign.id, pending.id])
+        self.assertEqual(counts, {'decision': 1})
+        self.assertEqual(list(Decision.objects.values_list('title', flat=True)), ['Mine'])
+        rejected.refresh_from_db()
+        foreign.refresh_from_db()
+        self.assertEqual((rejected.status, foreign.status), ('rejected', 'pending'))
+
+    def approve(self, suggestion):
+        return self.client.patch(
+            reverse('suggestions-detail', kwargs={'client_slug': 'acme', 'pk': suggestion.id}),
+            {'action': 'approve', 'reviewed_by': 'Ana'}, content_type='application/json',
+        )
+
+    def test_approve_rejected_suggestion(self):
+        rejected = self.create('decision', {'title': 'Reconsidered', 'description': 'Go after all'}, status='rejected')
+        response = self.approve(rejected)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['status'], response.json()['reviewed_by']), ('approved', 'Ana'))
+        self.assertEqual(list(Decision.objects.values_list('title', flat=True)), ['Reconsidered'])
+
+    def test_approve_twice_conflicts(self):
+        suggestion = self.create('decision', {'title': 'Once'})
+        self.assertEqual(self.approve(suggestion).status_code, 200)
+        response = self.approve(suggestion)
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('error', response.json())
+        self.assertEqual(Decision.objects.count(), 1)
+
+    def test_batch_approve_endpoint(self):
+        ids = [str(pk) for pk in self.batch(2)]
+        response = self.client.post(
+            reverse('suggestions-batch-approve', kwargs={'client_slug': 'acme'}),
+            {'ids': ids, 'reviewed_by': 'Ana'}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['approved_count'], 6)
+        response = self.client.post(
+            reverse('suggestions-batch-approve', kwargs={'client_slug': 'acme'}), {}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class AutoApproveTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        cls.meeting = Meeting.objects.create(
+            client=cls.client_, meeting_code='MTG-1', date=datetime.date(2026, 1, 5), title='Kickoff'
+        )
+        cls.settings = ClientSettings(
+            client=cls.client_, auto_approve_threshold=Decimal('0.80'), auto_approve_types=['decision']
+        )
+
+    def create(self, confidence, suggestion_type='decision', **content):
+        return AISuggestion.objects.create(
+            meeting=self.meeting, client=self.client_, suggestion_type=suggestion_type,
+            suggested_content={'title': f'Decision at {confidence}', **content}, confidence=confidence,
+        )
+
+    def approved(self, *suggestions):
+        statuses = dict(AISuggestion.objects.values_list('id', 'status'))
+        return [statuses[s.id] == 'approved' for s in suggestions]
+
+    def test_threshold(self):
+        suggestions = [self.create(Decimal('0.79')), self.create(Decimal('0.80')), self.create(0.95)]
+        counts = auto_approve_suggestions(self.settings, suggestions)
+        self.assertEqual(counts, {'decision': 2})
+        self.assertEqual(self.approved(*suggestions), [False, True, True])
+        self.assertEqual(
+            AISuggestion.objects.get(id=suggestions[1].id).reviewed_by, 'Auto-approval (confidence >= 0.80)'
+        )
+
+    def test_only_listed_types(self):
+        suggestions = [self.create(0.95, 'action_item'), self.create(0.95)]
+        auto_approve_suggestions(self.settings, suggestions)
+        self.assertEqual(self.approved(*suggestions), [False, True])
+
+    def test_duplicates_and_ungrounded_stay_pending(self):
+        suggestions = [
+            self.create(0.95, duplicate_of={'id': 'x', 'similarity': 0.6}),
+            self.create(0.95, grounding={'matched': False, 'score': 0.2}),
+            self.create(0.95, grounding={'matched': True, 'score': 1.0}),
+            self.create(None),
+        ]
+        auto_approve_suggestions(self.settings, suggestions)
+        self.assertEqual(self.approved(*suggestions), [False, False, True, False])
+
+    def test_disabled_without_types(self):
+        settings = ClientSettings(client=self.client_, auto_approve_threshold=Decimal('0.10'), auto_approve_types=[])
+        suggestion = self.create(0.99)
+        with self.assertNumQueries(0):
+            self.assertEqual(auto_approve_suggestions(settings, [suggestion]), {})
@@ -1,21 +1,22 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from apps.clients.models import Client
+from apps.clients.tenancy import get_tenant
+from utils.fast_serializers import FastListMixin
 from .models import AISuggestion
-from .serializers import AISuggestionSerializer, SuggestionActionSerializer
+from .serializers import AISuggestionSerializer, SuggestionActionSerializer, AISuggestionFastSerializer
+from .services import approve_suggestions
 
 
-class AISuggestionViewSet(viewsets.ModelViewSet):
+class AISuggestionViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for AISuggestion operations."""
+    fast_serializer = AISuggestionFastSerializer
     serializer_class = AISuggestionSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']  # post for batch_approve action
 
     def get_queryset(self):
-        client_slug = self.kwargs.get('client_slug')
-        queryset = AISuggestion.objects.filter(client__slug=client_slug)
+        queryset = AISuggestion.objects.filter(client_id=get_tenant(self.request).id)
 
         # Filter by status if provided
         status_filter = self.request.query_params.get('status')
@@ -35,13 +36,20 @@ class AISuggestionViewSet(viewsets.ModelViewSet):
         action_data = request.data.get('action')
 
         if action_data == 'approve':
-            instance.status = 'approved'
-            instance.reviewed_at = timezone.now()
-            instance.reviewed_by = request.data.get('reviewed_by', '')
-            instance.save()
-
-            # Apply the suggestion based on type
-            self._apply_suggestion(instance)
+            # Apply the suggestion based on type; a rejected one (by a
+            # reviewer or the duplicate check) is re-opened and applied
+            counts = approve_suggestions(
+                instance.client_id,
+                [instance.id],
+                reviewed_by=request.data.get('reviewed_by', ''),
+                statuses=('pending', 'rejected'),
+            )
+            if not counts:
+                return Response(
+                    {'error': 'Suggestion is already approved'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            instance.refresh_from_db()
 
         elif action_data == 'reject':
             instance.status = 'rejected'
@@ -51,60 +59,6 @@ class AISuggestionViewSet(viewsets.ModelViewSet):
 
         return Response(AISuggestionSerializer(instance).data)
 
-    def _apply_suggestion(self, suggestion):
-        """Apply an approved suggestion to create/update records."""
-        content = suggestion.suggested_content
-
-        if suggestion.suggestion_type == 'answer' and suggestion.target_question:
-            # Update the target question with the suggested answer
-            question = suggestion.target_question
-            question.answer = content.get('answer', '')
-            question.answered_by = 'AI Suggestion'
-            question.answered_date = timezone.now().date()
-            question.status = 'answered'
-            question.save()
-
-        elif suggestion.suggestion_type == 'business_rule':
-            # Create a new business rule
-            from apps.rules.models import BusinessRule
-            count = BusinessRule.objects.filter(client=suggestion.client).count()
-            BusinessRule.objects.create(
-                client=suggestion.client,
-                rule_code=f"BR-{count + 100}",
-                title=content.get('title', ''),
-                description=content.get('description', ''),
-                category=content.get('category', ''),
-                discovered_in_meeting=suggestion.meeting,
-                source='AI Suggestion',
-            )
-
-        elif suggestion.suggestion_type == 'action_item':
-            # Create a new action item
-            from apps.actions.models import ActionItem
-            count = ActionItem.objects.filter(client=suggestion.client).count()
-            ActionItem.objects.create(
-                client=suggestion.client,
-                action_code=f"ACT-{count + 100}",
-                title=content.get('title', ''),
-                description=content.get('description', ''),
-                assigned_to=content.get('assignee', ''),
-                priority=content.get('priority', 'medium'),
-                from_meeting=suggestion.meeting,
-            )
-
-        elif suggestion.suggestion_type == 'decision':
-            # Create a new decision
-            from apps.rules.models import Decision
-            count = Decision.objects.filter(client=suggestion.client).count()
-            Decision.objects.create(
-                client=suggestion.client,
-                decision_code=f"DEC-{count + 100}",
-                title=content.get('title', ''),
-                description=content.get('description', ''),
-                made_in_meeting=suggestion.meeting,
-                made_by='AI Suggestion',
-            )
-
     @action(detail=False, methods=['post'])
     def batch_approve(self, request, client_slug=None):
         """Batch approve multiple suggestions at once."""
@@ -117,23 +71,13 @@ class AISuggestionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Get pending suggestions for this client
-        suggestions = AISuggestion.objects.filter(
-            id__in=suggestion_ids,
-            client__slug=client_slug,
-            status='pending'
-        )
+        client = get_tenant(request)
 
-        approved_count = 0
-        for suggestion in suggestions:
-            suggestion.status = 'approved'
-            suggestion.reviewed_at = timezone.now()
-            suggestion.reviewed_by = reviewed_by
-            suggestion.save()
-            self._apply_suggestion(suggestion)
-            approved_count += 1
+        # Approve all pending suggestions for this client in one transaction
+        counts = approve_suggestions(client.id, suggestion_ids, reviewed_by=reviewed_by)
 
         return Response({
             'success': True,
-            'approved_count': approved_count
+            'approved_count': sum(counts.values()),
+            'counts': dict(counts),
         })
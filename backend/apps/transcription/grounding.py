@@ -0,0 +1,152 @@
+"""
+Quote grounding for transcript analysis.
+
+The analysis asks the model for a ``source_quote`` backing each answer and
+suggestion. ``QuoteIndex`` builds a word n-gram index over the transcript
+once, then locates each quote by letting its n-grams vote for an alignment
+offset. Lookup cost is proportional to the quote length (plus bounded
+posting lists), so grounding dozens of quotes against a long transcript is
+a handful of dictionary lookups rather than a scan per quote.
+
+Quotes shorter than one n-gram are never reported as matched: a word or
+two occurs almost anywhere in a transcript, so finding it says nothing
+about whether the quote (and the answer it backs) came from the meeting.
+"""
+
+import math
+import re
+from bisect import bisect_right
+from collections import Counter, defaultdict
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+NGRAM_SIZE = 3
+# Shortest quote, in words, that can ground an item.
+MIN_QUOTE_WORDS = NGRAM_SIZE
+# Fraction of a quote's n-grams that must agree on one alignment.
+MATCH_THRESHOLD = 0.6
+# n-grams occurring more often than this carry no positional signal.
+MAX_POSTINGS = 64
+# Confidence multiplier applied when a quote cannot be found.
+MISS_CONFIDENCE_FACTOR = 0.5
+
+
+class QuoteIndex:
+    """One-time n-gram index over a transcript."""
+
+    def __init__(self, text, segments=None, n=NGRAM_SIZE):
+        self.text = text or ''
+        self.n = n
+        self.words = []
+        self.spans = []
+        for match in WORD_RE.finditer(self.text):
+            self.words.append(match.group().lower())
+            self.spans.append(match.span())
+
+        self.ngrams = defaultdict(list)
+        for position in range(len(self.words) - n + 1):
+            self.ngrams[tuple(self.words[position:position + n])].append(position)
+
+        self.segment_offsets, self.segments = self._align_segments(segments or [])
+
+    def _align_segments(self, segments):
+        """Map Whisper segments to character offsets in the transcript."""
+        offsets = []
+        aligned = []
+        cursor = 0
+        for segment in segments:
+            segment_text = (segment.get('text') or '').strip()
+            if not segment_text:
+                continue
+            position = self.text.find(segment_text, cursor)
+            if position < 0:
+                continue
+            offsets.append(position)
+            aligned.append(segment)
+            cursor = position + len(segment_text)
+        return offsets, aligned
+
+    def _segment_at(self, offset):
+        index = bisect_right(self.segment_offsets, offset) - 1
+        if index < 0:
+            return None
+        return self.segments[index]
+
+    def locate(self, quote):
+        """Find the best alignment of ``quote``; returns a dict or None."""
+        words = [w.lower() for w in WORD_RE.findall(quote or '')]
+        if not words or not self.words:
+            return None
+
+        if len(words) < max(MIN_QUOTE_WORDS, self.n):
+            return {'matched': False, 'score': 0.0}
+
+        postings = [
+            (i, self.ngrams.get(tuple(words[i:i + self.n]), ()))
+            for i in range(len(words) - self.n + 1)
+        ]
+        # Very common n-grams (repeated phrases) neither confirm nor refute an
+        # alignment; leave them out unless nothing else is left to vote with.
+        considered = [p for p in postings if len(p[1]) <= MAX_POSTINGS] or postings
+
+        votes = Counter()
+        for offset, positions in considered:
+            for position in positions:
+                votes[position - offset] += 1
+
+        if not votes:
+            return None
+        start, hits = votes.most_common(1)[0]
+        score = hits / len(considered)
+        if score < MATCH_THRESHOLD:
+            return {'matched': False, 'score': round(score, 3)}
+
+        first = max(start, 0)
+        last = min(start + len(words), len(self.words)) - 1
+        char_start = self.spans[first][0]
+        char_end = self.spans[last][1]
+        result = {
+            'matched': True,
+            'score': round(score, 3),
+            'start': char_start,
+            'end': char_end,
+        }
+
+        start_segment = self._segment_at(char_start)
+        end_segment = self._segment_at(max(char_end - 1, char_start))
+        if start_segment is not None and end_segment is not None:
+            result['start_time'] = start_segment.get('start')
+            result['end_time'] = end_segment.get('end')
+        return result
+
+
+def parse_confidence(value, default):
+    """``value`` as a confidence in [0, 1], or ``default`` if it is not a number."""
+    try:
+        confidence = float(value)
+    except (TypeError, ValueError):
+        return default
+    if not math.isfinite(confidence):
+        return default
+    return min(max(confidence, 0.0), 1.0)
+
+
+def ground_item(index, item, default_confidence=0.8, required=False):
+    """Ground one analysis item's source_quote.
+
+    Returns ``(grounding, confidence)``: the grounding record to store with
+    the answer or suggestion, and the confidence after downgrading misses.
+    Items without a quote return ``(None, confidence)`` unchanged unless
+    ``required`` is set, in which case a missing quote counts as a miss.
+    A missing or non-numeric confidence (the model sometimes answers
+    ``"high"``) falls back to ``default_confidence``.
+    """
+    confidence = parse_confidence(item.get('confidence'), default_confidence)
+    quote = item.get('source_quote')
+    if not quote and not required:
+        return None, confidence
+
+    grounding = index.locate(quote) or {'matched': False, 'score': 0.0}
+    if not grounding['matched']:
+        confidence = round(confidence * MISS_CONFIDENCE_FACTOR, 2)
+    return grounding, confidence
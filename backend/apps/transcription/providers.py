@@ -0,0 +1,361 @@
+"""
+AI provider backends for transcript analysis and audio transcription.
+
+The live providers talk to Anthropic (analysis) and OpenAI Whisper
+(transcription). The fake providers are deterministic local stand-ins used
+for benchmarks and tests: they replay recorded fixtures or generate
+schema-valid output, with configurable latency, error and 429 injection.
+
+Select the backend with ``AI_PROVIDER_BACKEND`` ('live' or 'fake') and tune
+the fake one through the ``FAKE_PROVIDER`` settings dict.
+"""
+
+import hashlib
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.conf import settings
+
+
+class ProviderError(Exception):
+    """Transient provider failure (5xx, timeout, overloaded)."""
+
+
+class ProviderRateLimitError(ProviderError):
+    """Provider rejected the call with HTTP 429."""
+
+    def __init__(self, message='Rate limited', retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class TranscriptionResult:
+    """Normalized Whisper response."""
+    text: str
+    duration: float = None
+    language: str = None
+    segments: list = field(default_factory=list)
+
+
+def uses_fake_provider():
+    """Whether the local fake backend is configured."""
+    return getattr(settings, 'AI_PROVIDER_BACKEND', 'live') == 'fake'
+
+
+def get_analysis_provider(api_key=None, model='claude-sonnet-4-20250514'):
+    """Return the configured transcript analysis provider."""
+    if uses_fake_provider():
+        return FakeAnalysisProvider()
+    return AnthropicAnalysisProvider(api_key=api_key, model=model)
+
+
+def get_transcription_provider(api_key=None):
+    """Return the configured audio transcription provider."""
+    if uses_fake_provider():
+        return FakeTranscriptionProvider()
+    return WhisperTranscriptionProvider(api_key=api_key)
+
+
+# Live providers
+
+class AnthropicAnalysisProvider:
+    """Transcript analysis through the Anthropic Messages API."""
+
+    def __init__(self, api_key, model='claude-sonnet-4-20250514'):
+        self.api_key = api_key
+        self.model = model
+
+    def complete(self, system, prompt, max_tokens=4096):
+        import anthropic
+
+        client = anthropic.Anthropic(api_key=self.api_key)
+        try:
+            message = client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                system=system,
+                messages=[{'role': 'user', 'content': prompt}]
+            )
+        except anthropic.RateLimitError as e:
+            retry_after = e.response.headers.get('retry-after') if e.response is not None else None
+            raise ProviderRateLimitError(str(e), retry_after=_parse_retry_after(retry_after)) from e
+        return message.content[0].text
+
+
+class WhisperTranscriptionProvider:
+    """Audio transcription through OpenAI Whisper."""
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+
+    def transcribe(self, audio_path, filename):
+        import openai
+
+        client = openai.OpenAI(api_key=self.api_key)
+        try:
+            with open(audio_path, 'rb') as audio_file:
+                transcription = client.audio.transcriptions.create(
+                    model='whisper-1',
+                    file=audio_file,
+                    response_format='verbose_json'
+                )
+        except openai.RateLimitError as e:
+            retry_after = e.response.headers.get('retry-after') if e.response is not None else None
+            raise ProviderRateLimitError(str(e), retry_after=_parse_retry_after(retry_after)) from e
+
+        segments = [
+            {
+                'start': _segment_value(segment, 'start'),
+                'end': _segment_value(segment, 'end'),
+                'text': _segment_value(segment, 'text'),
+            }
+            for segment in (getattr(transcription, 'segments', None) or [])
+        ]
+        return TranscriptionResult(
+            text=transcription.text,
+            duration=getattr(transcription, 'duration', None),
+            language=getattr(transcription, 'language', None),
+            segments=segments,
+        )
+
+
+def _segment_value(segment, key):
+    if isinstance(segment, dict):
+        return segment.get(key)
+    return getattr(segment, key, None)
+
+
+def _parse_retry_after(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+# Fake providers
+
+FAKE_PROVIDER_DEFAULTS = {
+    'FIXTURES_DIR': '',
+    'LATENCY_MS': 0,
+    'LATENCY_JITTER_MS': 0,
+    'ERROR_RATE': 0.0,
+    'RATE_LIMIT_RATE': 0.0,
+    'RETRY_AFTER': 1,
+    'SEED': 0,
+}
+
+QUESTION_ID_RE = re.compile(r'\[ID: ([0-9a-fA-F-]{36})\]')
+SENTENCE_RE = re.compile(r'[^.!?\n]+[.!?]?')
+
+FAKE_CATEGORIES = ['pricing', 'logistics', 'compliance', 'operations', 'finance']
+FAKE_PEOPLE = ['Ana', 'Luis', 'Maria', 'Carlos', 'Sofia']
+FAKE_PRIORITIES = ['high', 'medium', 'low']
+FAKE_WORDS = (
+    'shipment container supplier invoice customs tariff warehouse route '
+    'carrier pricing margin contract approval deadline forecast inventory '
+    'port vessel quota documentation payment schedule review'
+).split()
+
+
+_FAULT_RNGS = {}
+
+
+def _fault_rng(seed):
+    if seed not in _FAULT_RNGS:
+        _FAULT_RNGS[seed] = random.Random(seed)
+    return _FAULT_RNGS[seed]
+
+
+class FakeProviderBase:
+    """Shared latency/error injection and fixture lookup."""
+
+    fixture_kind = None
+
+    def __init__(self, options=None):
+        self.options = {**FAKE_PROVIDER_DEFAULTS, **getattr(settings, 'FAKE_PROVIDER', {}), **(options or {})}
+
+    def _rng(self, key):
+        digest = hashlib.sha256(f"{self.options['SEED']}:{key}".encode('utf-8')).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big'))
+
+    def _simulate_call(self, rng):
+        latency = self.options['LATENCY_MS']
+        jitter = self.options['LATENCY_JITTER_MS']
+        if jitter:
+            latency += rng.uniform(0, jitter)
+        if latency:
+            time.sleep(latency / 1000)
+
+        # Faults come from one process-wide generator so a retry of the same
+        # input can succeed, while the fault sequence stays reproducible.
+        roll = _fault_rng(self.options['SEED']).random()
+        if roll < self.options['RATE_LIMIT_RATE']:
+            raise ProviderRateLimitError(retry_after=self.options['RETRY_AFTER'])
+        if roll < self.options['RATE_LIMIT_RATE'] + self.options['ERROR_RATE']:
+            raise ProviderError('Injected provider failure')
+
+    def _load_fixture(self, key):
+        fixtures_dir = self.options['FIXTURES_DIR']
+        if not fixtures_dir:
+            return None
+        directory = Path(fixtures_dir) / self.fixture_kind
+        for candidate in (directory / f'{key}.json', directory / 'default.json'):
+            if candidate.exists():
+                return candidate.read_text(encoding='utf-8')
+        return None
+
+
+class FakeAnalysisProvider(FakeProviderBase):
+    """Deterministic stand-in for the Anthropic analysis call.
+
+    Fixtures live in ``<FIXTURES_DIR>/analysis/<key>.json`` where ``key`` is
+    ``fixture_key(prompt)``; otherwise a schema-valid analysis is generated
+    from the transcript and question ids embedded in the prompt.
+    """
+
+    fixture_kind = 'analysis'
+
+    @staticmethod
+    def fixture_key(prompt):
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
+
+    def complete(self, system, prompt, max_tokens=4096):
+        key = self.fixture_key(prompt)
+        rng = self._rng(key)
+        self._simulate_call(rng)
+
+        fixture = self._load_fixture(key)
+        if fixture is not None:
+            return fixture
+        return json.dumps(self._generate(prompt, rng))
+
+    def _generate(self, prompt, rng):
+        transcript = _extract_transcript(prompt)
+        sentences = [s.strip() for s in SENTENCE_RE.findall(transcript) if len(s.split()) >= 4]
+        if not sentences:
+            sentences = ['No substantive discussion was captured in this transcript.']
+
+        def quote():
+            return rng.choice(sentences)
+
+        answers = [
+            {
+                'question_id': question_id,
+                'answer': quote(),
+                'confidence': round(rng.uniform(0.5, 0.99), 2),
+                'source_quote': quote(),
+            }
+            for question_id in QUESTION_ID_RE.findall(prompt)
+            if rng.random() < 0.5
+        ]
+
+        def titled(prefix):
+            words = rng.sample(FAKE_WORDS, 3)
+            return f"{prefix} {' '.join(words)}"
+
+        business_rules = [
+            {
+                'title': titled('Rule:'),
+                'description': quote(),
+                'category': rng.choice(FAKE_CATEGORIES),
+                'confidence': round(rng.uniform(0.5, 0.99), 2),
+                'source_quote': quote(),
+            }
+            for _ in range(rng.randint(0, 3))
+        ]
+        decisions = [
+            {
+                'title': titled('Decision:'),
+                'description': quote(),
+                'confidence': round(rng.uniform(0.5, 0.99), 2),
+                'source_quote': quote(),
+            }
+            for _ in range(rng.randint(0, 3))
+        ]
+        action_items = [
+            {
+                'title': titled('Follow up on'),
+                'description': quote(),
+                'assignee': rng.choice(FAKE_PEOPLE),
+                'priority': rng.choice(FAKE_PRIORITIES),
+                'confidence': round(rng.uniform(0.5, 0.99), 2),
+                'source_quote': quote(),
+            }
+            for _ in range(rng.randint(0, 4))
+        ]
+
+        return {
+            'answers': answers,
+            'businessRules': business_rules,
+            'decisions': decisions,
+            'actionItems': action_items,
+            'summary': ' '.join(rng.sample(sentences, min(3, len(sentences)))),
+            'keyPoints': rng.sample(sentences, min(3, len(sentences))),
+        }
+
+
+class FakeTranscriptionProvider(FakeProviderBase):
+    """Deterministic stand-in for Whisper.
+
+    Fixtures live in ``<FIXTURES_DIR>/transcription/<key>.json`` where
+    ``key`` is the first 16 hex digits of the audio's SHA-256, and hold a
+    verbose_json-style payload (text, duration, language, segments);
+    otherwise a transcript is generated from the audio bytes.
+    """
+
+    fixture_kind = 'transcription'
+
+    def transcribe(self, audio_path, filename):
+        with open(audio_path, 'rb') as audio_file:
+            key = hashlib.sha256(audio_file.read()).hexdigest()[:16]
+        rng = self._rng(key)
+        self._simulate_call(rng)
+
+        fixture = self._load_fixture(key)
+        if fixture is not None:
+            payload = json.loads(fixture)
+            return TranscriptionResult(
+                text=payload.get('text', ''),
+                duration=payload.get('duration'),
+                language=payload.get('language'),
+                segments=payload.get('segments', []),
+            )
+        return self._generate(rng)
+
+    def _generate(self, rng):
+        segments = []
+        texts = []
+        offset = 0.0
+        for _ in range(rng.randint(20, 60)):
+            speaker = rng.choice(FAKE_PEOPLE)
+            words = ' '.join(rng.choice(FAKE_WORDS) for _ in range(rng.randint(6, 18)))
+            text = f"{speaker}: {words.capitalize()}."
+            length = round(rng.uniform(2.0, 9.0), 2)
+            segments.append({'start': round(offset, 2), 'end': round(offset + length, 2), 'text': text})
+            texts.append(text)
+            offset += length
+        return TranscriptionResult(
+            text=' '.join(texts),
+            duration=round(offset, 2),
+            language='en',
+            segments=segments,
+        )
+
+
+def _extract_transcript(prompt):
+    start = prompt.find('TRANSCRIPT:')
+    if start < 0:
+        return prompt
+    ends = [
+        index for index in (
+            prompt.find('Pending questions to look for answers', start),
+            prompt.find('Return ONLY valid JSON', start),
+        )
+        if index >= 0
+    ]
+    return prompt[start + len('TRANSCRIPT:'):min(ends) if ends else None]
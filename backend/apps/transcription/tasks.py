@@ -5,9 +5,13 @@ Celery tasks for transcript analysis and audio transcription.
 import json
 from celery import shared_task
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils import timezone
 from django.core.mail import send_mail
 
+from .providers import ProviderRateLimitError
+
 
 @shared_task(bind=True, max_retries=3)
 def transcribe_audio_task(self, meeting_id: str, audio_data: bytes, filename: str, api_key: str = None):
@@ -15,16 +19,16 @@ def transcribe_audio_task(self, meeting_id: str, audio_data: bytes, filename: st
     Async audio transcription using OpenAI Whisper.
     """
     from apps.meetings.models import Meeting
-    import openai
+    from .providers import get_transcription_provider, uses_fake_provider
 
     try:
         meeting = Meeting.objects.get(id=meeting_id)
         effective_api_key = api_key or settings.OPENAI_API_KEY
 
-        if not effective_api_key:
+        if not effective_api_key and not uses_fake_provider():
             raise ValueError('OpenAI API key not configured')
 
-        client = openai.OpenAI(api_key=effective_api_key)
+        provider = get_transcription_provider(api_key=effective_api_key)
 
         # Create temp file for transcription
         import tempfile
@@ -38,32 +42,30 @@ def transcribe_audio_task(self, meeting_id: str, audio_data: bytes, filename: st
             temp_path = f.name
 
         try:
-            with open(temp_path, 'rb') as audio_file:
-                transcription = client.audio.transcriptions.create(
-                    model='whisper-1',
-                    file=audio_file,
-                    response_format='verbose_json'
-                )
+            transcription = provider.transcribe(temp_path, filename)
 
             meeting.transcript_text = transcription.text
             meeting.transcript_filename = filename
             meeting.transcript_uploaded_at = timezone.now()
             meeting.transcript_source = 'whisper'
-            meeting.transcript_duration = getattr(transcription, 'duration', None)
-            meeting.transcript_language = getattr(transcription, 'language', None)
+            meeting.transcript_duration = transcription.duration
+            meeting.transcript_language = transcription.language
+            meeting.transcript_segments = transcription.segments or None
             meeting.save()
 
             return {
                 'success': True,
                 'meeting_id': str(meeting_id),
                 'text_length': len(transcription.text),
-                'duration': getattr(transcription, 'duration', None),
-                'language': getattr(transcription, 'language', None),
+                'duration': transcription.duration,
+                'language': transcription.language,
             }
 
         finally:
             os.unlink(temp_path)
 
+    except ProviderRateLimitError as e:
+        self.retry(exc=e, countdown=e.retry_after or 60)
     except Exception as e:
         self.retry(exc=e, countdown=60)
 
@@ -135,8 +137,13 @@ def run_transcript_analysis(meeting_id: str):
     from apps.meetings.models import Meeting, MeetingSummary
     from apps.questions.models import Question
     from apps.suggestions.models import AISuggestion
+    from apps.suggestions.services import auto_approve_suggestions
+    from apps.suggestions.similarity import (
+        INDEXED_STATUSES, RECORD_KINDS, apply_duplicate_check, index_signatures, suggestion_signature,
+    )
     from apps.settings_app.models import ClientSettings
-    import anthropic
+    from .grounding import QuoteIndex, ground_item
+    from .providers import get_analysis_provider, uses_fake_provider
 
     meeting = Meeting.objects.select_related('client').get(id=meeting_id)
 
@@ -149,6 +156,7 @@ def run_transcript_analysis(meeting_id: str):
 
     # Get API key: first from client settings, then fall back to environment variable
     api_key = None
+    client_settings = None
     try:
         client_settings = ClientSettings.objects.get(client=meeting.client)
         api_key = client_settings.anthropic_api_key
@@ -163,12 +171,13 @@ def run_transcript_analysis(meeting_id: str):
         if api_key:
             api_key = api_key.strip()
 
-    if not api_key:
-        return {'error': 'Anthropic API key not configured. Please add your API key in Settings.'}
+    if not uses_fake_provider():
+        if not api_key:
+            return {'error': 'Anthropic API key not configured. Please add your API key in Settings.'}
 
-    # Validate API key format
-    if not api_key.startswith('sk-ant-'):
-        return {'error': f'Invalid API key format. Key should start with sk-ant-. Got: {api_key[:10]}...'}
+        # Validate API key format
+        if not api_key.startswith('sk-ant-'):
+            return {'error': f'Invalid API key format. Key should start with sk-ant-. Got: {api_key[:10]}...'}
 
     # Get pending questions for context
     pending_questions = list(Question.objects.filter(
@@ -190,9 +199,9 @@ a trade and supply chain platform. Your job is to:
 Return your analysis as JSON with the following structure:
 {
     "answers": [{"question_id": "uuid", "answer": "detailed answer text", "confidence": 0.0-1.0, "source_quote": "exact quote from transcript"}],
-    "businessRules": [{"title": "short title", "description": "detailed description", "category": "category", "confidence": 0.0-1.0}],
-    "decisions": [{"title": "short title", "description": "what was decided", "confidence": 0.0-1.0}],
-    "actionItems": [{"title": "action title", "description": "detailed description", "assignee": "person name", "priority": "high|medium|low", "confidence": 0.0-1.0}],
+    "businessRules": [{"title": "short title", "description": "detailed description", "category": "category", "confidence": 0.0-1.0, "source_quote": "exact quote from transcript"}],
+    "decisions": [{"title": "short title", "description": "what was decided", "confidence": 0.0-1.0, "source_quote": "exact quote from transcript"}],
+    "actionItems": [{"title": "action title", "description": "detailed description", "assignee": "person name", "priority": "high|medium|low", "confidence": 0.0-1.0, "source_quote": "exact quote from transcript"}],
     "summary": "2-3 paragraph summary of the meeting covering main topics discussed, key outcomes, and next steps",
     "keyPoints": ["Key point 1", "Key point 2", "Key point 3"]
 }
@@ -214,18 +223,9 @@ TRANSCRIPT:
 
 Return ONLY valid JSON, no other text."""
 
-    # Call Claude API
-    client = anthropic.Anthropic(api_key=api_key)
-
-    message = client.messages.create(
-        model='claude-sonnet-4-20250514',
-        max_tokens=4096,
-        system=system_context,
-        messages=[{'role': 'user', 'content': prompt}]
-    )
-
-    # Parse the response
-    response_text = message.content[0].text
+    # Call Claude API (or the local fake provider when configured)
+    provider = get_analysis_provider(api_key=api_key)
+    response_text = provider.complete(system_context, prompt, max_tokens=4096)
 
     # Try to extract JSON from the response
     try:
@@ -240,71 +240,103 @@ Return ONLY valid JSON, no other text."""
 
     # Track results
     answers_applied = 0
+    answers_ungrounded = 0
     suggestions_created = 0
+    duplicates_flagged = 0
+    duplicates_merged = 0
+    auto_approved = 0
+    created_suggestions = []
+
+    # Index the transcript once so every source_quote is located in O(quote)
+    quote_index = QuoteIndex(meeting.transcript_text, segments=meeting.transcript_segments)
+
+    # Persist answers, suggestions, auto-approvals and the summary atomically
+    with transaction.atomic():
+        # AUTO-APPLY grounded ANSWERS directly to Questions; answers whose quote
+        # cannot be found in the transcript go to the review queue instead
+        for item in analysis.get('answers', []):
+            question_id = item.get('question_id')
+            if question_id:
+                try:
+                    question = Question.objects.get(id=question_id, client=meeting.client)
+                except (Question.DoesNotExist, ValueError, ValidationError):
+                    continue
+
+                grounding, confidence = ground_item(quote_index, item, required=True)
+                if grounding['matched']:
+                    # Directly update the question
+                    question.answer = item.get('answer', '')
+                    question.answered_by = 'AI Analysis'
+                    question.answered_date = timezone.now().date()
+                    question.answer_grounding = grounding
+                    question.status = 'answered'
+                    question.save()
+                    answers_applied += 1
+                else:
+                    created_suggestions.append(AISuggestion.objects.create(
+                        meeting=meeting,
+                        client=meeting.client,
+                        suggestion_type='answer',
+                        target_question=question,
+                        suggested_content={**item, 'grounding': grounding},
+                        confidence=confidence,
+                    ))
+                    answers_ungrounded += 1
+                    suggestions_created += 1
+
+        # Process business rules, decisions and action items (still create
+        # suggestions for review). Near-duplicates of existing items or earlier
+        # suggestions are flagged, or merged when practically identical. This
+        # batch's signatures are matched in memory and stored once at the end.
+        signatures = []
+        for key, suggestion_type in (
+            ('businessRules', 'business_rule'),
+            ('decisions', 'decision'),
+            ('actionItems', 'action_item'),
+        ):
+            for item in analysis.get(key, []):
+                grounding, confidence = ground_item(quote_index, item)
+                if grounding is not None:
+                    item = {**item, 'grounding': grounding}
+                suggestion = AISuggestion(
+                    meeting=meeting,
+                    client=meeting.client,
+                    suggestion_type=suggestion_type,
+                    suggested_content=item,
+                    confidence=confidence,
+                )
+                duplicate = apply_duplicate_check(suggestion, unindexed=signatures)
+                suggestion.save()
+                if suggestion.suggestion_type in RECORD_KINDS and suggestion.status in INDEXED_STATUSES:
+                    signatures.append(suggestion_signature(suggestion))
+                if duplicate and suggestion.status == 'rejected':
+                    duplicates_merged += 1
+                elif duplicate:
+                    duplicates_flagged += 1
+                created_suggestions.append(suggestion)
+                suggestions_created += 1
+        index_signatures(signatures)
+
+        # AUTO-APPROVE suggestions that meet the client's confidence policy
+        if client_settings is not None:
+            auto_approved = sum(
+                auto_approve_suggestions(client_settings, created_suggestions).values()
+            )
 
-    # AUTO-APPLY ANSWERS directly to Questions (no approval needed)
-    for item in analysis.get('answers', []):
-        question_id = item.get('question_id')
-        if question_id:
-            try:
-                question = Question.objects.get(id=question_id, client=meeting.client)
-                # Directly update the question
-                question.answer = item.get('answer', '')
-                question.answered_by = 'AI Analysis'
-                question.answered_date = timezone.now().date()
-                question.status = 'answered'
-                question.save()
-                answers_applied += 1
-            except Question.DoesNotExist:
-                pass
-
-    # Process business rules (still create suggestions for review)
-    for item in analysis.get('businessRules', []):
-        AISuggestion.objects.create(
-            meeting=meeting,
-            client=meeting.client,
-            suggestion_type='business_rule',
-            suggested_content=item,
-            confidence=item.get('confidence', 0.8),
-        )
-        suggestions_created += 1
-
-    # Process decisions (still create suggestions for review)
-    for item in analysis.get('decisions', []):
-        AISuggestion.objects.create(
-            meeting=meeting,
-            client=meeting.client,
-            suggestion_type='decision',
-            suggested_content=item,
-            confidence=item.get('confidence', 0.8),
-        )
-        suggestions_created += 1
-
-    # Process action items (still create suggestions for review)
-    for item in analysis.get('actionItems', []):
-        AISuggestion.objects.create(
-            meeting=meeting,
-            client=meeting.client,
-            suggestion_type='action_item',
-            suggested_content=item,
-            confidence=item.get('confidence', 0.8),
-        )
-        suggestions_created += 1
-
-    # CREATE MEETING SUMMARY
-    summary_text = analysis.get('summary', '')
-    key_points = analysis.get('keyPoints', [])
-
-    if summary_text:
-        MeetingSummary.objects.update_or_create(
-            meeting=meeting,
-            defaults={
-                'client': meeting.client,
-                'content': summary_text,
-                'key_points': key_points,
-                'generated_by': 'ai',
-            }
-        )
+        # CREATE MEETING SUMMARY
+        summary_text = analysis.get('summary', '')
+        key_points = analysis.get('keyPoints', [])
+
+        if summary_text:
+            MeetingSummary.objects.update_or_create(
+                meeting=meeting,
+                defaults={
+                    'client': meeting.client,
+                    'content': summary_text,
+                    'key_points': key_points,
+                    'generated_by': 'ai',
+                }
+            )
 
     # SEND EMAIL to client with summary and action items
     send_analysis_email(
@@ -317,7 +349,11 @@ Return ONLY valid JSON, no other text."""
         'success': True,
         'meeting_id': str(meeting_id),
         'answers_applied': answers_applied,
+        'answers_ungrounded': answers_ungrounded,
         'suggestions_created': suggestions_created,
+        'duplicates_flagged': duplicates_flagged,
+        'duplicates_merged': duplicates_merged,
+        'auto_approved': auto_approved,
         'summary_generated': bool(summary_text),
     }
 
@@ -329,5 +365,7 @@ def analyze_transcript_task(self, meeting_id: str):
     """
     try:
         return run_transcript_analysis(meeting_id)
+    except ProviderRateLimitError as e:
+        self.retry(exc=e, countdown=e.retry_after or 120)
     except Exception as e:
         self.retry(exc=e, countdown=120)
@@ -1,3 +1,347 @@
-from django.test import TestCase
+import datetime
+import json
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.actions.models import ActionItem
+from apps.clients.models import Client
+from apps.meetings.models import Meeting, MeetingSummary
+from apps.questions.models import Question
+from apps.rules.models import BusinessRule
+from apps.settings_app.models import ClientSettings
+from apps.suggestions.models import AISuggestion, SimilaritySignature
+
+from .grounding import MISS_CONFIDENCE_FACTOR, QuoteIndex, ground_item
+from .providers import (
+    AnthropicAnalysisProvider,
+    FakeAnalysisProvider,
+    FakeTranscriptionProvider,
+    ProviderError,
+    ProviderRateLimitError,
+    _parse_retry_after,
+    get_analysis_provider,
+    get_transcription_provider,
+)
+from .tasks import run_transcript_analysis
+
+QUESTION_ID = '0f8c5a52-4b8e-4c55-9a43-3f1f3e0b6d11'
+PROMPT = f"""TRANSCRIPT:
+Ana: The shipment leaves the port on Monday morning. Luis: We still need the customs documentation
+before the vessel is loaded. Maria: Pricing for the new route is approved by finance.
+
+Pending questions to look for answers:
+- [ID: {QUESTION_ID}] When does the shipment leave?
+
+Return ONLY valid JSON"""
+
+
+class ProviderSelectionTests(SimpleTestCase):
+
+    @override_settings(AI_PROVIDER_BACKEND='fake')
+    def test_fake_backend(self):
+        self.assertIsInstance(get_analysis_provider(api_key='unused'), FakeAnalysisProvider)
+        self.assertIsInstance(get_transcription_provider(api_key='unused'), FakeTranscriptionProvider)
+
+    @override_settings(AI_PROVIDER_BACKEND='live')
+    def test_live_backend(self):
+        provider = get_analysis_provider(api_key='key', model='model')
+        self.assertIsInstance(provider, AnthropicAnalysisProvider)
+        self.assertEqual((provider.api_key, provider.model), ('key', 'model'))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(_parse_retry_after('3'), 3)
+        self.assertEqual(_parse_retry_after('1.5'), 1)
+        self.assertIsNone(_parse_retry_after(None))
+        self.assertIsNone(_parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'))
+
+
+@override_settings(FAKE_PROVIDER={})
+class FakeAnalysisProviderTests(SimpleTestCase):
+
+    def test_deterministic(self):
+        first = FakeAnalysisProvider().complete('system', PROMPT)
+        self.assertEqual(first, FakeAnalysisProvider().complete('system', PROMPT))
+        self.assertNotEqual(first, FakeAnalysisProvider({'SEED': 1}).complete('system', PROMPT))
+
+    def test_schema(self):
+        for seed in range(10):
+            analysis = json.loads(FakeAnalysisProvider({'SEED': seed}).complete('system', PROMPT))
+            self.assertEqual(
+                set(analysis), {'answers', 'businessRules', 'decisions', 'actionItems', 'summary', 'keyPoints'}
+            )
+            for answer in analysis['answers']:
+                self.assertEqual(answer['question_id'], QUESTION_ID)
+                self.assertIn(answer['source_quote'], PROMPT)
+                self.assertTrue(0.5 <= answer['confidence'] <= 0.99)
+            for item in analysis['actionItems']:
+                self.assertIn(item['priority'], ('high', 'medium', 'low'))
+
+    def test_fixture_replay(self):
+        with tempfile.TemporaryDirectory() as fixtures:
+            directory = Path(fixtures) / 'analysis'
+            directory.mkdir()
+            (directory / f'{FakeAnalysisProvider.fixture_key(PROMPT)}.json').write_text('{"answers": []}')
+            (directory / 'default.json').write_text('{"default": true}')
+            provider = FakeAnalysisProvider({'FIXTURES_DIR': fixtures})
+            self.assertEqual(provider.complete('system', PROMPT), '{"answers": []}')
+            self.assertEqual(provider.complete('system', 'other prompt'), '{"default": true}')
+
+    def test_injected_rate_limit(self):
+        provider = FakeAnalysisProvider({'RATE_LIMIT_RATE': 1.0, 'RETRY_AFTER': 7})
+        with self.assertRaises(ProviderRateLimitError) as raised:
+            provider.complete('system', PROMPT)
+        self.assertEqual(raised.exception.retry_after, 7)
+
+    def test_injected_error(self):
+        with self.assertRaises(ProviderError) as raised:
+            FakeAnalysisProvider({'ERROR_RATE': 1.0}).complete('system', PROMPT)
+        self.assertNotIsInstance(raised.exception, ProviderRateLimitError)
+
+
+@override_settings(FAKE_PROVIDER={})
+class FakeTranscriptionProviderTests(SimpleTestCase):
+
+    def transcribe(self, audio, **options):
+        with tempfile.NamedTemporaryFile() as audio_file:
+            audio_file.write(audio)
+            audio_file.flush()
+            return FakeTranscriptionProvider(options).transcribe(audio_file.name, 'meeting.mp3')
+
+    def test_deterministic_per_audio(self):
+        self.assertEqual(self.transcribe(b'audio'), self.transcribe(b'audio'))
+        self.assertNotEqual(self.transcribe(b'audio').text, self.transcribe(b'other audio').text)
+
+    def test_segments(self):
+        result = self.transcribe(b'audio')
+        self.assertEqual(result.text, ' '.join(segment['text'] for segment in result.segments))
+        self.assertEqual(result.segments[0]['start'], 0)
+        for previous, segment in zip(result.segments, result.segments[1:]):
+            self.assertAlmostEqual(previous['end'], segment['start'], places=1)
+        self.assertAlmostEqual(result.duration, result.segments[-1]['end'], places=1)
+
+
+TRANSCRIPT = (
+    'Ana: The shipment leaves the port on Monday morning. '
+    'Luis: We still need the customs documentation before the vessel is loaded. '
+    'Maria: Pricing for the new route is approved by finance.'
+)
+SEGMENTS = [
+    {'start': 0.0, 'end': 4.0, 'text': 'Ana: The shipment leaves the port on Monday morning.'},
+    {'start': 4.0, 'end': 9.5, 'text': 'Luis: We still need the customs documentation before the vessel is loaded.'},
+    {'start': 9.5, 'end': 13.0, 'text': 'Maria: Pricing for the new route is approved by finance.'},
+]
+
+
+class QuoteIndexTests(SimpleTestCase):
+
+    def setUp(self):
+        self.index = QuoteIndex(TRANSCRIPT, segments=SEGMENTS)
+
+    def test_exact_quote(self):
+        quote = 'we still need the customs documentation'
+        result = self.index.locate(quote)
+        self.assertTrue(result['matched'])
+        self.assertEqual(result['score'], 1.0)
+        self.assertEqual(TRANSCRIPT[result['start']:result['end']].lower(), quote)
+        self.assertEqual((result['start_time'], result['end_time']), (4.0, 9.5))
+
+    def test_quote_across_segments(self):
+        result = self.index.locate('before the vessel is loaded. Maria: Pricing for the new route')
+        self.assertTrue(result['matched'])
+        self.assertEqual((result['start_time'], result['end_time']), (4.0, 13.0))
+
+    def test_punctuation_and_case_ignored(self):
+        self.assertTrue(self.index.locate('"The SHIPMENT leaves the port, on Monday morning!"')['matched'])
+
+    def test_paraphrase_is_not_matched(self):
+        result = self.index.locate('the shipment leaves early from the harbour on Monday')
+        self.assertFalse(result['matched'])
+        self.assertLess(result['score'], 0.6)
+
+    def test_one_changed_word_still_matches(self):
+        result = self.index.locate('we still need all the customs documentation before the vessel is loaded')
+        self.assertTrue(result['matched'])
+        self.assertLess(result['score'], 1.0)
+
+    def test_miss(self):
+        self.assertIsNone(self.index.locate('the budget was cut by twenty percent'))
+
+    def test_short_quote_is_not_matched(self):
+        for quote in ('the', 'the port', 'Monday morning'):
+            with self.subTest(quote=quote):
+                self.assertFalse(self.index.locate(quote)['matched'])
+
+    def test_empty(self):
+        self.assertIsNone(self.index.locate(''))
+        self.assertIsNone(QuoteIndex('').locate('the shipment leaves the port'))
+
+
+class GroundItemTests(SimpleTestCase):
+
+    def setUp(self):
+        self.index = QuoteIndex(TRANSCRIPT)
+
+    def test_grounded_keeps_confidence(self):
+        grounding, confidence = ground_item(
+            self.index, {'confidence': 0.9, 'source_quote': 'pricing for the new route is approved'}
+        )
+        self.assertTrue(grounding['matched'])
+        self.assertEqual(confidence, 0.9)
+
+    def test_miss_lowers_confidence(self):
+        grounding, confidence = ground_item(self.index, {'confidence': 0.9, 'source_quote': 'the budget was cut'})
+        self.assertFalse(grounding['matched'])
+        self.assertEqual(confidence, round(0.9 * MISS_CONFIDENCE_FACTOR, 2))
+
+    def test_short_quote_counts_as_miss(self):
+        grounding, confidence = ground_item(self.index, {'confidence': 0.9, 'source_quote': 'the'}, required=True)
+        self.assertFalse(grounding['matched'])
+        self.assertEqual(confidence, round(0.9 * MISS_CONFIDENCE_FACTOR, 2))
+
+    def test_missing_quote(self):
+        self.assertEqual(ground_item(self.index, {'confidence': 0.7}), (None, 0.7))
+        grounding, confidence = ground_item(self.index, {'confidence': 0.7}, required=True)
+        self.assertFalse(grounding['matched'])
+        self.assertEqual(confidence, 0.35)
+
+    def test_bad_confidence_uses_default(self):
+        for value in ('high', None, [], float('nan')):
+            with self.subTest(confidence=value):
+                self.assertEqual(ground_item(self.index, {'confidence': value}, default_confidence=0.6), (None, 0.6))
+        self.assertEqual(ground_item(self.index, {}, default_confidence=0.6), (None, 0.6))
+
+    def test_confidence_parsed_and_clamped(self):
+        self.assertEqual(ground_item(self.index, {'confidence': '0.75'}), (None, 0.75))
+        self.assertEqual(ground_item(self.index, {'confidence': 85}), (None, 1.0))
+        self.assertEqual(ground_item(self.index, {'confidence': -1}), (None, 0.0))
+
+
+TRANSCRIPT = (
+    'Ana: The shipment leaves the port on Monday morning. Luis: We still need the customs documentation '
+    'before the vessel is loaded. Maria: Pricing for the new route is approved by finance.'
+)
+ACTION_ITEM = {
+    'title': 'Send the customs documentation', 'description': 'Before loading the vessel',
+    'assignee': 'Luis', 'priority': 'high', 'confidence': 0.95,
+    'source_quote': 'We still need the customs documentation before the vessel is loaded',
+}
+RULE = {
+    'title': 'Switch the Rotterdam lane to the new carrier',
+    'description': 'Freight for the Rotterdam lane moves to the new carrier from the first of March '
+                   'once the contract is signed and customs documentation is updated.',
+}
+
+
+@override_settings(AI_PROVIDER_BACKEND='fake')
+class RunTranscriptAnalysisTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        ClientSettings.objects.create(
+            client=cls.client_, auto_approve_threshold=Decimal('0.80'),
+            auto_approve_types=['business_rule', 'action_item'],
+        )
+        cls.meeting = Meeting.objects.create(
+            client=cls.client_, meeting_code='MTG-1', date=datetime.date(2026, 1, 5), title='Kickoff',
+            transcript_text=TRANSCRIPT,
+        )
+        cls.grounded = Question.objects.create(
+            client=cls.client_, question_code='Q-1', question='When does the shipment leave?'
+        )
+        cls.ungrounded = Question.objects.create(
+            client=cls.client_, question_code='Q-2', question='Who pays the invoice?'
+        )
+        cls.rule = BusinessRule.objects.create(client=cls.client_, rule_code='BR-1', **RULE)
+
+    def setUp(self):
+        fixtures = tempfile.TemporaryDirectory()
+        self.addCleanup(fixtures.cleanup)
+        directory = Path(fixtures.name) / 'analysis'
+        directory.mkdir()
+        (directory / 'default.json').write_text(json.dumps({
+            'answers': [
+                {
+                    'question_id': str(self.grounded.id), 'answer': 'Monday morning', 'confidence': 0.9,
+                    'source_quote': 'The shipment leaves the port on Monday morning',
+                },
+                {
+                    'question_id': str(self.ungrounded.id), 'answer': 'Finance', 'confidence': 0.9,
+                    'source_quote': 'The invoice is paid by finance at the end of the quarter',
+                },
+            ],
+            'businessRules': [{
+                **RULE,
+                'description': RULE['description'].replace('March', 'April'),
+                'category': 'logistics', 'confidence': 0.95,
+                'source_quote': 'Pricing for the new route is approved by finance',
+            }],
+            'decisions': [],
+            'actionItems': [ACTION_ITEM, ACTION_ITEM],
+            'summary': 'The shipment leaves on Monday.',
+            'keyPoints': ['Shipment on Monday'],
+        }))
+        fake_provider = override_settings(FAKE_PROVIDER={'FIXTURES_DIR': fixtures.name})
+        fake_provider.enable()
+        self.addCleanup(fake_provider.disable)
+
+    def suggestion(self, suggestion_type, status=None):
+        suggestions = AISuggestion.objects.filter(meeting=self.meeting, suggestion_type=suggestion_type)
+        return suggestions.get(status=status) if status else suggestions.get()
+
+    def test_pipeline(self):
+        result = run_transcript_analysis(str(self.meeting.id))
+        self.assertEqual(
+            {key: result[key] for key in (
+                'answers_applied', 'answers_ungrounded', 'suggestions_created', 'duplicates_flagged',
+                'duplicates_merged', 'auto_approved', 'summary_generated',
+            )},
+            {
+                'answers_applied': 1, 'answers_ungrounded': 1, 'suggestions_created': 4, 'duplicates_flagged': 1,
+                'duplicates_merged': 1, 'auto_approved': 1, 'summary_generated': True,
+            },
+        )
+
+        # The grounded answer is applied, with where its quote was found
+        self.grounded.refresh_from_db()
+        self.assertEqual((self.grounded.status, self.grounded.answer), ('answered', 'Monday morning'))
+        self.assertTrue(self.grounded.answer_grounding['matched'])
+
+        # The ungrounded one waits for review with a lowered confidence
+        self.ungrounded.refresh_from_db()
+        self.assertEqual(self.ungrounded.status, 'pending')
+        answer = self.suggestion('answer')
+        self.assertEqual((answer.status, answer.target_question_id), ('pending', self.ungrounded.id))
+        self.assertFalse(answer.suggested_content['grounding']['matched'])
+        self.assertLess(answer.confidence, Decimal('0.9'))
+
+        # The reworded rule is flagged against the existing one and not auto-approved
+        rule = self.suggestion('business_rule')
+        self.assertEqual(rule.status, 'pending')
+        self.assertEqual(rule.suggested_content['duplicate_of']['id'], str(self.rule.id))
+        self.assertEqual(BusinessRule.objects.filter(client=self.client_).count(), 1)
+
+        # The grounded, confident action item is approved into a record, and
+        # its repeat in the same analysis is merged into it
+        approved = self.suggestion('action_item', 'approved')
+        merged = self.suggestion('action_item', 'rejected')
+        self.assertEqual(merged.suggested_content['duplicate_of']['id'], str(approved.id))
+        self.assertEqual(ActionItem.objects.filter(client=self.client_, assigned_to='Luis').count(), 1)
+        self.assertEqual(
+            set(SimilaritySignature.objects.filter(source='suggestion').values_list('object_id', flat=True)),
+            {approved.id, rule.id},
+        )
+        self.assertEqual(MeetingSummary.objects.get(meeting=self.meeting).key_points, ['Shipment on Monday'])
+
+    def test_auto_approval_rolled_back_with_the_analysis(self):
+        with mock.patch.object(MeetingSummary.objects, 'update_or_create', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                run_transcript_analysis(str(self.meeting.id))
+        self.assertFalse(AISuggestion.objects.filter(meeting=self.meeting).exists())
+        self.assertFalse(ActionItem.objects.filter(client=self.client_).exists())
+        self.grounded.refresh_from_db()
+        self.assertEqual(self.grounded.status, 'pending')
@@ -11,6 +11,11 @@ app = Celery('config')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
+# Task runtime, queue wait, retry and failure metrics (utils/metrics.py)
+from utils.metrics import connect_celery_signals  # noqa: E402
+
+connect_celery_signals()
+
 
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
@@ -40,9 +40,13 @@ INSTALLED_APPS = [
     'apps.authentication',
     'apps.sprints',
     'apps.deliverables',
+    'apps.schedule',
 ]
 
 MIDDLEWARE = [
+    'utils.metrics.MetricsMiddleware',
+    'utils.instrumentation.RequestTimingMiddleware',
+    'utils.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -50,6 +54,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.clients.middleware.TenantMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -73,6 +78,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Creates the managed=False tables (and applies migrations/*.sql) in the test database
+TEST_RUNNER = 'utils.test_runner.TestRunner'
+
 # Database - Use existing Railway PostgreSQL
 DATABASE_URL = os.environ.get('DATABASE_URL')
 if DATABASE_URL:
@@ -117,7 +125,18 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',  # Start open, add auth later
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'utils.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'utils.renderers.MessagePackRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'utils.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'utils.parsers.MessagePackParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'utils.pagination.KeysetPagination',
     'PAGE_SIZE': 100,
 }
 
@@ -146,11 +165,91 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes max
+CELERY_BEAT_SCHEDULE = {
+    'rebalance-ranks': {
+        'task': 'apps.sprints.tasks.rebalance_ranks_task',
+        'schedule': 60 * 60,  # hourly
+    },
+    'compact-sprint-snapshots': {
+        'task': 'apps.sprints.tasks.compact_sprint_snapshots_task',
+        'schedule': 60 * 60,  # hourly; also finalises yesterday after midnight
+    },
+}
+
+# Cache: shared Redis when REDIS_URL is configured, per-process memory otherwise
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+            'KEY_PREFIX': 'morichal',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Roadmap, timeline and forecast payloads are cached only in Redis: writes
+# invalidate them by bumping a version key, which a per-process cache would
+# only do for the worker that made the write
+ROADMAP_CACHE_ENABLED = bool(os.environ.get('REDIS_URL'))
+
+# Seconds a rendered roadmap stays cached (writes invalidate it earlier)
+ROADMAP_CACHE_TIMEOUT = int(os.environ.get('ROADMAP_CACHE_TIMEOUT', 300))
+
+# Tenant (client slug -> client) resolution cache: shared entry lifetime,
+# and per-process LRU size and lifetime (bounds staleness across workers)
+TENANT_CACHE_TIMEOUT = int(os.environ.get('TENANT_CACHE_TIMEOUT', 3600))
+TENANT_CACHE_LOCAL_SIZE = int(os.environ.get('TENANT_CACHE_LOCAL_SIZE', 1024))
+TENANT_CACHE_LOCAL_TTL = int(os.environ.get('TENANT_CACHE_LOCAL_TTL', 60))
+
+# Request instrumentation (utils/instrumentation.py): fraction of requests
+# whose SQL and serializer time are recorded, Server-Timing headers, and the
+# threshold above which a request is logged with its repeated SQL
+REQUEST_TIMING_SAMPLE_RATE = float(os.environ.get('REQUEST_TIMING_SAMPLE_RATE', 1.0 if DEBUG else 0.05))
+REQUEST_TIMING_HEADERS = os.environ.get('REQUEST_TIMING_HEADERS', str(DEBUG)).lower() == 'true'
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', 1000))
+
+# Smallest buffered response body gzip/brotli compressed (utils/compression.py)
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESSION_MIN_BYTES', 1024))
+
+# Bearer token required by /metrics when set (utils/metrics.py)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'request_timing': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+# Default hours per working day before a person counts as overloaded
+WORKLOAD_DAILY_CAPACITY_HOURS = float(os.environ.get('WORKLOAD_DAILY_CAPACITY_HOURS', 8))
 
 # External API Keys
 ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY', '')
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
 
+# AI provider backend: 'live' calls Anthropic/OpenAI, 'fake' uses the local
+# deterministic provider in apps.transcription.providers (benchmarks, tests)
+AI_PROVIDER_BACKEND = os.environ.get('AI_PROVIDER_BACKEND', 'live')
+FAKE_PROVIDER = {
+    'FIXTURES_DIR': os.environ.get('FAKE_PROVIDER_FIXTURES_DIR', ''),
+    'LATENCY_MS': int(os.environ.get('FAKE_PROVIDER_LATENCY_MS', 0)),
+    'LATENCY_JITTER_MS': int(os.environ.get('FAKE_PROVIDER_LATENCY_JITTER_MS', 0)),
+    'ERROR_RATE': float(os.environ.get('FAKE_PROVIDER_ERROR_RATE', 0)),
+    'RATE_LIMIT_RATE': float(os.environ.get('FAKE_PROVIDER_RATE_LIMIT_RATE', 0)),
+    'RETRY_AFTER': int(os.environ.get('FAKE_PROVIDER_RETRY_AFTER', 1)),
+    'SEED': int(os.environ.get('FAKE_PROVIDER_SEED', 0)),
+}
+
 # Email Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
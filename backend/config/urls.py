@@ -8,6 +8,8 @@ from django.http import JsonResponse
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from utils.metrics import metrics_view
+
 
 def health_check(request):
     """Health check endpoint."""
@@ -17,10 +19,9 @@ def health_check(request):
 @api_view(['GET'])
 def client_config(request, client_slug):
     """Get client configuration including branding."""
-    from django.shortcuts import get_object_or_404
-    from apps.clients.models import Client
+    from apps.clients.tenancy import get_tenant
 
-    client = get_object_or_404(Client, slug=client_slug)
+    client = get_tenant(request)
 
     return Response({
         'id': str(client.id),
@@ -46,32 +47,34 @@ def client_config(request, client_slug):
 @api_view(['GET'])
 def client_all_data(request, client_slug):
     """Get all data for a client (meetings, questions, etc.)."""
-    from django.shortcuts import get_object_or_404
-    from apps.clients.models import Client
+    from apps.clients.tenancy import get_tenant
     from apps.meetings.models import Meeting, Update, Blocker, Attachment
     from apps.meetings.serializers import (
-        MeetingSerializer, UpdateSerializer, BlockerSerializer, AttachmentSerializer
+        MeetingFastSerializer, UpdateFastSerializer, BlockerFastSerializer, AttachmentFastSerializer
     )
     from apps.questions.models import Question
-    from apps.questions.serializers import QuestionSerializer
+    from apps.questions.serializers import QuestionFastSerializer
     from apps.rules.models import BusinessRule, Decision
-    from apps.rules.serializers import BusinessRuleSerializer, DecisionSerializer
+    from apps.rules.serializers import BusinessRuleFastSerializer, DecisionFastSerializer
     from apps.actions.models import ActionItem
-    from apps.actions.serializers import ActionItemSerializer
+    from apps.actions.serializers import ActionItemFastSerializer
+    from utils.fast_serializers import native_types
 
-    client = get_object_or_404(Client, slug=client_slug)
+    client = get_tenant(request)
+    native = native_types(request)
 
+    # values()-based serializers: same output as the ModelSerializers, no model instances
     return Response({
         'version': '2.1',
         'lastUpdated': client.updated_at,
-        'meetings': MeetingSerializer(Meeting.objects.filter(client=client), many=True).data,
-        'questions': QuestionSerializer(Question.objects.filter(client=client), many=True).data,
-        'businessRules': BusinessRuleSerializer(BusinessRule.objects.filter(client=client), many=True).data,
-        'decisions': DecisionSerializer(Decision.objects.filter(client=client), many=True).data,
-        'actionItems': ActionItemSerializer(ActionItem.objects.filter(client=client), many=True).data,
-        'updates': UpdateSerializer(Update.objects.filter(client=client), many=True).data,
-        'blockers': BlockerSerializer(Blocker.objects.filter(client=client), many=True).data,
-        'attachments': AttachmentSerializer(Attachment.objects.filter(client=client), many=True).data,
+        'meetings': MeetingFastSerializer.serialize_queryset(Meeting.objects.filter(client=client), native),
+        'questions': QuestionFastSerializer.serialize_queryset(Question.objects.filter(client=client), native),
+        'businessRules': BusinessRuleFastSerializer.serialize_queryset(BusinessRule.objects.filter(client=client), native),
+        'decisions': DecisionFastSerializer.serialize_queryset(Decision.objects.filter(client=client), native),
+        'actionItems': ActionItemFastSerializer.serialize_queryset(ActionItem.objects.filter(client=client), native),
+        'updates': UpdateFastSerializer.serialize_queryset(Update.objects.filter(client=client), native),
+        'blockers': BlockerFastSerializer.serialize_queryset(Blocker.objects.filter(client=client), native),
+        'attachments': AttachmentFastSerializer.serialize_queryset(Attachment.objects.filter(client=client), native),
     })
 
 
@@ -79,6 +82,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('health/', health_check, name='health'),
     path('api/health/', health_check, name='api-health'),
+    path('metrics', metrics_view, name='metrics'),
 
     # Authentication endpoints
     path('api/auth/', include('apps.authentication.urls')),
@@ -101,5 +105,6 @@ urlpatterns = [
         path('', include('apps.settings_app.urls')),
         path('', include('apps.sprints.urls')),
         path('', include('apps.deliverables.urls')),
+        path('', include('apps.schedule.urls')),
     ])),
 ]
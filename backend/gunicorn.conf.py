@@ -0,0 +1,24 @@
+"""
+Gunicorn settings.
+
+With PROMETHEUS_MULTIPROC_DIR set, every worker writes its metrics to
+files in that directory (see utils/metrics.py). Files left by a previous
+run are removed at startup, and workers that exit are marked dead so
+their series stop being reported.
+"""
+
+import os
+import shutil
+
+
+def on_starting(server):
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
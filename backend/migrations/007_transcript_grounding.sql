@@ -0,0 +1,9 @@
+-- Quote grounding for transcript analysis
+-- Run this SQL against the Railway PostgreSQL database
+
+-- Whisper segments (start/end/text) kept alongside the transcript
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS transcript_segments JSONB;
+
+-- Where an AI-applied answer was found in the transcript
+-- ({matched, score, start, end, start_time, end_time})
+ALTER TABLE questions ADD COLUMN IF NOT EXISTS answer_grounding JSONB;
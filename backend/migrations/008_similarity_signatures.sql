@@ -0,0 +1,19 @@
+-- Near-duplicate detection for AI suggestions (MinHash + LSH)
+-- Run this SQL against the Railway PostgreSQL database
+
+CREATE TABLE IF NOT EXISTS similarity_signatures (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    client_id UUID NOT NULL REFERENCES clients(id) ON DELETE CASCADE,
+    kind VARCHAR(50) NOT NULL,
+    source VARCHAR(20) NOT NULL,
+    object_id UUID NOT NULL,
+    label VARCHAR(50) NOT NULL DEFAULT '',
+    signature BIGINT[] NOT NULL,
+    band_keys BIGINT[] NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE(object_id)
+);
+
+-- LSH bucket lookup: band_keys && ARRAY[...] within a client and kind
+CREATE INDEX IF NOT EXISTS idx_similarity_signatures_band_keys ON similarity_signatures USING GIN (band_keys);
+CREATE INDEX IF NOT EXISTS idx_similarity_signatures_client_kind ON similarity_signatures(client_id, kind);
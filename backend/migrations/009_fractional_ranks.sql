@@ -0,0 +1,43 @@
+-- Fractional (LexoRank-style) ordering keys for sprints, sprint items and
+-- delivery milestones; deliverable_sections gets the same column through
+-- the deliverables Django migration 0002_deliverablesection_rank.
+-- Run this SQL against the Railway PostgreSQL database
+
+-- Keys are compared bytewise, so the columns use the "C" collation (the
+-- models declare it too, as db_collation='C')
+ALTER TABLE sprints ADD COLUMN IF NOT EXISTS rank VARCHAR(64) COLLATE "C";
+ALTER TABLE sprint_items ADD COLUMN IF NOT EXISTS rank VARCHAR(64) COLLATE "C";
+ALTER TABLE delivery_milestones ADD COLUMN IF NOT EXISTS rank VARCHAR(64) COLLATE "C";
+
+-- Seed keys from the current order: 'i' + 7-digit zero-padded position +
+-- 'i', starting mid-keyspace so a board has room to prepend
+UPDATE sprints s SET rank = r.rank
+FROM (
+    SELECT id, 'i' || lpad((row_number() OVER (
+        PARTITION BY client_id ORDER BY "order", start_date, created_at
+    ) - 1)::text, 7, '0') || 'i' AS rank
+    FROM sprints
+) r
+WHERE s.id = r.id AND s.rank IS NULL;
+
+UPDATE sprint_items i SET rank = r.rank
+FROM (
+    SELECT id, 'i' || lpad((row_number() OVER (
+        PARTITION BY sprint_id ORDER BY "order", created_at
+    ) - 1)::text, 7, '0') || 'i' AS rank
+    FROM sprint_items
+) r
+WHERE i.id = r.id AND i.rank IS NULL;
+
+UPDATE delivery_milestones m SET rank = r.rank
+FROM (
+    SELECT id, 'i' || lpad((row_number() OVER (
+        PARTITION BY client_id ORDER BY "order", start_date, created_at
+    ) - 1)::text, 7, '0') || 'i' AS rank
+    FROM delivery_milestones
+) r
+WHERE m.id = r.id AND m.rank IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_sprints_client_rank ON sprints(client_id, rank);
+CREATE INDEX IF NOT EXISTS idx_sprint_items_sprint_rank ON sprint_items(sprint_id, rank);
+CREATE INDEX IF NOT EXISTS idx_delivery_milestones_client_rank ON delivery_milestones(client_id, rank);
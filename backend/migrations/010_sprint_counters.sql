@@ -0,0 +1,90 @@
+-- Denormalized sprint counters maintained by triggers on sprint_items
+-- Run this SQL against the Railway PostgreSQL database
+--
+-- Every write path (ORM saves, QuerySet.update, the bulk reorder
+-- UPDATE ... FROM (VALUES ...), admin, raw SQL) goes through the trigger,
+-- so sprint progress is a column read. Drift can be repaired with
+-- `python manage.py reconcile_sprint_counters`.
+
+ALTER TABLE sprints ADD COLUMN IF NOT EXISTS total_items INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE sprints ADD COLUMN IF NOT EXISTS completed_items INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE sprints ADD COLUMN IF NOT EXISTS cancelled_items INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE sprints ADD COLUMN IF NOT EXISTS estimated_hours NUMERIC(10, 2) NOT NULL DEFAULT 0;
+ALTER TABLE sprints ADD COLUMN IF NOT EXISTS actual_hours NUMERIC(10, 2) NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION sprint_items_maintain_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        -- Reorders and other edits that do not affect the counters
+        IF OLD.sprint_id = NEW.sprint_id
+           AND OLD.status IS NOT DISTINCT FROM NEW.status
+           AND OLD.estimated_hours IS NOT DISTINCT FROM NEW.estimated_hours
+           AND OLD.actual_hours IS NOT DISTINCT FROM NEW.actual_hours THEN
+            RETURN NULL;
+        END IF;
+
+        -- Same sprint: apply the difference as one row update
+        IF OLD.sprint_id = NEW.sprint_id THEN
+            UPDATE sprints SET
+                completed_items = completed_items
+                    + (NEW.status = 'completed')::int - (OLD.status = 'completed')::int,
+                cancelled_items = cancelled_items
+                    + (NEW.status = 'cancelled')::int - (OLD.status = 'cancelled')::int,
+                estimated_hours = estimated_hours
+                    + COALESCE(NEW.estimated_hours, 0) - COALESCE(OLD.estimated_hours, 0),
+                actual_hours = actual_hours
+                    + COALESCE(NEW.actual_hours, 0) - COALESCE(OLD.actual_hours, 0)
+            WHERE id = NEW.sprint_id;
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE sprints SET
+            total_items = total_items - 1,
+            completed_items = completed_items - (OLD.status = 'completed')::int,
+            cancelled_items = cancelled_items - (OLD.status = 'cancelled')::int,
+            estimated_hours = estimated_hours - COALESCE(OLD.estimated_hours, 0),
+            actual_hours = actual_hours - COALESCE(OLD.actual_hours, 0)
+        WHERE id = OLD.sprint_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE sprints SET
+            total_items = total_items + 1,
+            completed_items = completed_items + (NEW.status = 'completed')::int,
+            cancelled_items = cancelled_items + (NEW.status = 'cancelled')::int,
+            estimated_hours = estimated_hours + COALESCE(NEW.estimated_hours, 0),
+            actual_hours = actual_hours + COALESCE(NEW.actual_hours, 0)
+        WHERE id = NEW.sprint_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_sprint_items_counters ON sprint_items;
+CREATE TRIGGER trg_sprint_items_counters
+    AFTER INSERT OR DELETE OR UPDATE OF sprint_id, status, estimated_hours, actual_hours
+    ON sprint_items
+    FOR EACH ROW EXECUTE FUNCTION sprint_items_maintain_counters();
+
+-- Backfill from the current items
+UPDATE sprints s SET
+    total_items = COALESCE(agg.total_items, 0),
+    completed_items = COALESCE(agg.completed_items, 0),
+    cancelled_items = COALESCE(agg.cancelled_items, 0),
+    estimated_hours = COALESCE(agg.estimated_hours, 0),
+    actual_hours = COALESCE(agg.actual_hours, 0)
+FROM sprints s2
+LEFT JOIN (
+    SELECT sprint_id,
+           COUNT(*) AS total_items,
+           COUNT(*) FILTER (WHERE status = 'completed') AS completed_items,
+           COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled_items,
+           SUM(estimated_hours) AS estimated_hours,
+           SUM(actual_hours) AS actual_hours
+    FROM sprint_items
+    GROUP BY sprint_id
+) agg ON agg.sprint_id = s2.id
+WHERE s.id = s2.id;
@@ -0,0 +1,92 @@
+-- Sprint item status history and daily burndown snapshots
+-- Run this SQL against the Railway PostgreSQL database
+
+-- Append-only log, one row per status change, sprint move, estimate change,
+-- insert (from_status NULL) or delete (to_status NULL) of a sprint item.
+-- No foreign keys: history outlives deleted items and sprints, and the
+-- delete trigger must not fail while a client's rows are being cascaded.
+CREATE TABLE IF NOT EXISTS sprint_item_status_events (
+    id BIGSERIAL PRIMARY KEY,
+    client_id UUID NOT NULL,
+    item_id UUID NOT NULL,
+    sprint_id UUID NOT NULL,
+    previous_sprint_id UUID,
+    from_status VARCHAR(20),
+    to_status VARCHAR(20),
+    estimated_hours NUMERIC(6, 2),
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Latest state per item as of a day (DISTINCT ON item_id ... changed_at DESC)
+CREATE INDEX IF NOT EXISTS idx_status_events_item_changed ON sprint_item_status_events(item_id, changed_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_status_events_sprint ON sprint_item_status_events(sprint_id);
+CREATE INDEX IF NOT EXISTS idx_status_events_client_changed ON sprint_item_status_events(client_id, changed_at);
+
+CREATE OR REPLACE FUNCTION sprint_items_log_status() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO sprint_item_status_events
+            (client_id, item_id, sprint_id, from_status, to_status, estimated_hours)
+        VALUES (NEW.client_id, NEW.id, NEW.sprint_id, NULL, NEW.status, NEW.estimated_hours);
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO sprint_item_status_events
+            (client_id, item_id, sprint_id, from_status, to_status, estimated_hours)
+        VALUES (OLD.client_id, OLD.id, OLD.sprint_id, OLD.status, NULL, OLD.estimated_hours);
+    ELSIF OLD.status IS DISTINCT FROM NEW.status
+          OR OLD.sprint_id IS DISTINCT FROM NEW.sprint_id
+          OR OLD.estimated_hours IS DISTINCT FROM NEW.estimated_hours THEN
+        INSERT INTO sprint_item_status_events
+            (client_id, item_id, sprint_id, previous_sprint_id, from_status, to_status, estimated_hours)
+        VALUES (
+            NEW.client_id, NEW.id, NEW.sprint_id,
+            CASE WHEN OLD.sprint_id IS DISTINCT FROM NEW.sprint_id THEN OLD.sprint_id END,
+            OLD.status, NEW.status, NEW.estimated_hours
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_sprint_items_status_log ON sprint_items;
+CREATE TRIGGER trg_sprint_items_status_log
+    AFTER INSERT OR DELETE OR UPDATE OF status, sprint_id, estimated_hours
+    ON sprint_items
+    FOR EACH ROW EXECUTE FUNCTION sprint_items_log_status();
+
+-- One row per sprint per day, written by the nightly compaction
+-- (apps.sprints.burndown.compact_day)
+CREATE TABLE IF NOT EXISTS sprint_daily_snapshots (
+    id BIGSERIAL PRIMARY KEY,
+    client_id UUID NOT NULL REFERENCES clients(id) ON DELETE CASCADE,
+    sprint_id UUID NOT NULL REFERENCES sprints(id) ON DELETE CASCADE,
+    snapshot_date DATE NOT NULL,
+    total_items INTEGER NOT NULL DEFAULT 0,
+    completed_items INTEGER NOT NULL DEFAULT 0,
+    cancelled_items INTEGER NOT NULL DEFAULT 0,
+    estimated_hours NUMERIC(10, 2) NOT NULL DEFAULT 0,
+    completed_hours NUMERIC(10, 2) NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE(sprint_id, snapshot_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_sprint_snapshots_client_date ON sprint_daily_snapshots(client_id, snapshot_date);
+
+-- Seed history for existing items: created in their current status, or
+-- created as planned and completed at completed_at
+INSERT INTO sprint_item_status_events
+    (client_id, item_id, sprint_id, from_status, to_status, estimated_hours, changed_at)
+SELECT client_id, id, sprint_id, NULL,
+       CASE WHEN status = 'completed' AND completed_at IS NOT NULL THEN 'planned' ELSE status END,
+       estimated_hours, created_at
+FROM sprint_items i
+WHERE NOT EXISTS (SELECT 1 FROM sprint_item_status_events e WHERE e.item_id = i.id);
+
+INSERT INTO sprint_item_status_events
+    (client_id, item_id, sprint_id, from_status, to_status, estimated_hours, changed_at)
+SELECT client_id, id, sprint_id, 'planned', 'completed', estimated_hours, completed_at
+FROM sprint_items i
+WHERE status = 'completed' AND completed_at IS NOT NULL
+  AND NOT EXISTS (
+      SELECT 1 FROM sprint_item_status_events e
+      WHERE e.item_id = i.id AND e.to_status = 'completed'
+  );
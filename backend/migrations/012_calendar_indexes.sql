@@ -0,0 +1,18 @@
+-- Date indexes for the calendar range queries (apps/schedule)
+-- Run this SQL against the Railway PostgreSQL database
+--
+-- Every calendar query is scoped to one client, so the indexes lead with
+-- client_id and the overlap predicates become index range scans. The
+-- single-column sprint_items date indexes from 006 stay for cross-client
+-- reporting.
+
+CREATE INDEX IF NOT EXISTS idx_sprint_items_client_start_end
+    ON sprint_items(client_id, start_date, end_date);
+CREATE INDEX IF NOT EXISTS idx_sprint_items_client_end
+    ON sprint_items(client_id, end_date);
+CREATE INDEX IF NOT EXISTS idx_delivery_milestones_client_start
+    ON delivery_milestones(client_id, start_date);
+CREATE INDEX IF NOT EXISTS idx_meetings_client_date
+    ON meetings(client_id, date);
+CREATE INDEX IF NOT EXISTS idx_action_items_client_due_date
+    ON action_items(client_id, due_date);
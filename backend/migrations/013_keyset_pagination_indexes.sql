@@ -0,0 +1,30 @@
+-- Composite indexes matching the list endpoints' keyset ordering
+-- Run this SQL against the Railway PostgreSQL database
+--
+-- utils/pagination.py pages with WHERE (ordering columns, id) > (cursor),
+-- so each list needs an index on its tenant column followed by the
+-- ordering columns and the id tiebreaker, in the same directions. With it,
+-- every page is an index range scan, however deep it is.
+
+-- ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_action_items_client_created ON action_items(client_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_questions_client_created ON questions(client_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_business_rules_client_created ON business_rules(client_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_decisions_client_created ON decisions(client_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_updates_client_created ON updates(client_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_blockers_client_created ON blockers(client_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_attachments_client_created ON attachments(client_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_ai_suggestions_client_created ON ai_suggestions(client_id, created_at DESC, id DESC);
+-- MeetingViewSet.suggestions
+CREATE INDEX IF NOT EXISTS idx_ai_suggestions_meeting_created ON ai_suggestions(meeting_id, created_at DESC, id DESC);
+
+-- ORDER BY date DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_meetings_client_date_id ON meetings(client_id, date DESC, id DESC);
+
+-- ORDER BY rank NULLS LAST, "order", start_date / created_at, id
+CREATE INDEX IF NOT EXISTS idx_sprints_client_board
+    ON sprints(client_id, rank NULLS LAST, "order", start_date, id);
+CREATE INDEX IF NOT EXISTS idx_delivery_milestones_client_board
+    ON delivery_milestones(client_id, rank NULLS LAST, "order", start_date, id);
+CREATE INDEX IF NOT EXISTS idx_sprint_items_sprint_board
+    ON sprint_items(sprint_id, rank NULLS LAST, "order", created_at, id);
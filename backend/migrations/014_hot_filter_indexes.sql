@@ -0,0 +1,31 @@
+-- migrate: no-transaction
+-- Composite indexes for the status filters on hot paths
+-- Applied by `python manage.py apply_sql_migrations`
+--
+-- Built CONCURRENTLY so writes to these tables are not blocked while the
+-- index builds, which is why this file runs outside a transaction. If a
+-- build is interrupted it leaves an INVALID index that IF NOT EXISTS would
+-- skip: DROP INDEX CONCURRENTLY it and run the command again.
+--
+-- meetings(client_id, date DESC) is already covered by
+-- idx_meetings_client_date_id from 013.
+
+-- Pending questions loaded by every transcript analysis, and the questions
+-- list by ?status= in list order so each keyset page is a range scan
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_questions_client_status_created
+    ON questions(client_id, status, created_at DESC, id DESC);
+
+-- Suggestion queue (?status=, optionally &type=) and batch approval, in
+-- list order so each keyset page is a range scan
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ai_suggestions_client_status_type
+    ON ai_suggestions(client_id, status, suggestion_type, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ai_suggestions_client_status_created
+    ON ai_suggestions(client_id, status, created_at DESC, id DESC);
+
+-- Action items by status, in list order
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_action_items_client_status_created
+    ON action_items(client_id, status, created_at DESC, id DESC);
+
+-- Forecast throughput: completed items by completion time
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sprint_items_client_status_completed
+    ON sprint_items(client_id, status, completed_at);
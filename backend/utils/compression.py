@@ -0,0 +1,148 @@
+"""
+Negotiated gzip/brotli compression for API responses.
+
+WhiteNoise only serves precompressed static files, so JSON responses such
+as ``/all/`` and the roadmap went out uncompressed. ``CompressionMiddleware``
+picks brotli or gzip from ``Accept-Encoding`` (q-values respected, brotli
+preferred on a tie, brotli only when the ``brotli`` package is installed)
+for the API's own media types: JSON, MessagePack and iCalendar. Buffered responses are compressed when they
+are at least ``RESPONSE_COMPRESSION_MIN_BYTES`` long and kept only if that
+makes them smaller. Streaming responses (the iCalendar feed, file
+downloads) are compressed chunk by chunk as they are sent, so memory stays
+bounded.
+
+HTML (the browsable API, the admin) is never compressed: those pages put
+the CSRF token next to content reflected from the request, which is what a
+BREACH attack needs, and the API types carry no such secret. Responses
+that already carry a ``Content-Encoding`` (WhiteNoise's ``.gz`` and ``.br``
+files) or have any other type pass through untouched. Brotli uses a mid quality level: the top
+levels cost far more CPU than they save in bytes on per-request content.
+"""
+
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# API media types; HTML and everything else passes through (see above)
+COMPRESSIBLE_TYPES = (
+    'application/json', 'application/msgpack', 'application/vnd.msgpack', 'text/calendar',
+)
+COMPRESSIBLE_SUFFIXES = ('+json',)
+
+ACCEPT_ENCODING = re.compile(r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+def accepted_encoding(header):
+    """Best of ``br``/``gzip`` allowed by an Accept-Encoding header, or None."""
+    qualities = {}
+    for part in header.split(','):
+        match = ACCEPT_ENCODING.match(part)
+        if not match:
+            continue
+        try:
+            quality = float(match[2]) if match[2] is not None else 1.0
+        except ValueError:
+            continue
+        qualities[match[1].lower()] = quality
+
+    wildcard = qualities.get('*', 0.0)
+    offered = ('br', 'gzip') if brotli is not None else ('gzip',)
+    best, best_quality = None, 0.0
+    for encoding in offered:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compressible(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return content_type in COMPRESSIBLE_TYPES or content_type.endswith(COMPRESSIBLE_SUFFIXES)
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class _Stream:
+    """Incremental compressor with one interface for both encodings."""
+
+    def __init__(self, encoding):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self.process, self.finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self.process, self.finish = compressor.compress, compressor.flush
+
+
+def compress_stream(chunks, encoding):
+    stream = _Stream(encoding)
+    for chunk in chunks:
+        data = stream.process(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def compress_async_stream(chunks, encoding):
+    stream = _Stream(encoding)
+    async for chunk in chunks:
+        data = stream.process(chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+class CompressionMiddleware:
+    """Compress text-like responses with the client's preferred encoding."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_bytes = settings.RESPONSE_COMPRESSION_MIN_BYTES
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header('Content-Encoding') or response.status_code == 206 or not compressible(response):
+            return response
+        if not response.streaming and len(response.content) < self.min_bytes:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = accepted_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            # The compressed size is unknown until the stream ends
+            del response.headers['Content-Length']
+        else:
+            content = compress(response.content, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers['Content-Length'] = str(len(content))
+
+        # A strong ETag names the exact bytes, which changed (RFC 9110 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,177 @@
+"""
+Read-only serializers that build list responses from ``values()`` rows.
+
+A ``ModelSerializer`` list instantiates a model object per row and runs
+every field's ``get_attribute``/``to_representation`` on it, which is most
+of the CPU time of a large list. ``FastSerializer`` wraps an existing
+``ModelSerializer`` class and compiles its fields once into a plan of
+(output name, column, converter): the rows come from ``values()`` and each
+value goes through a precomputed converter (``str`` for UUIDs,
+``date.isoformat``, DRF's own ``DecimalField.to_representation``, ...) or
+none at all for strings, numbers and JSON. The output is identical to the
+wrapped serializer's, key order included.
+
+Only plain model fields can be compiled: nested serializers, method
+fields, property sources and non-pk relations raise
+``ImproperlyConfigured`` when the plan is built, so use it for flat list
+serializers. ``FastListMixin`` lets a viewset opt in for ``list``.
+
+Renderers that encode UUIDs, dates and datetimes themselves set
+``native_types`` (the MessagePack renderer); for them the rows keep those
+values as Python objects instead of strings (see ``native_types``).
+"""
+
+import datetime
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import fields, relations
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+from utils.instrumentation import serialization
+from utils.pagination import ordering_keys
+
+# Fields whose to_representation returns the database value unchanged
+IDENTITY = {
+    fields.CharField.to_representation,
+    fields.IntegerField.to_representation,
+    fields.FloatField.to_representation,
+    fields.BooleanField.to_representation,
+    fields.ChoiceField.to_representation,
+    fields.JSONField.to_representation,
+    fields.ReadOnlyField.to_representation,
+}
+
+
+def _datetime(tz):
+    """DateTimeField.to_representation for the ISO 8601 format in ``tz``."""
+    def convert(value):
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def native_types(request):
+    """Whether the renderer chosen for ``request`` takes UUID/date/datetime objects."""
+    return getattr(getattr(request, 'accepted_renderer', None), 'native_types', False)
+
+
+def _converter(field, tz, native=False):
+    """Converter for one serializer field, or None when the value is used as is."""
+    if native and isinstance(field, (fields.UUIDField, fields.DateField, fields.DateTimeField)):
+        return None
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        if field.pk_field is not None:
+            return field.pk_field.to_representation
+        return None
+    if isinstance(field, relations.RelatedField):
+        raise ImproperlyConfigured(f'{field.field_name}: only primary key relations can be compiled')
+    if isinstance(field, fields.UUIDField) and field.uuid_format == 'hex_verbose':
+        return str
+    if isinstance(field, fields.DateTimeField):
+        iso = getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601
+        if iso and tz is not None and not hasattr(field, 'timezone'):
+            return _datetime(tz)
+        return field.to_representation
+    if isinstance(field, fields.DateField) and getattr(field, 'format', api_settings.DATE_FORMAT) == ISO_8601:
+        return datetime.date.isoformat
+    if type(field).to_representation in IDENTITY and not getattr(field, 'binary', False):
+        return None
+    if isinstance(field, fields.ListField) and type(field.child).to_representation in IDENTITY:
+        return list
+    return field.to_representation
+
+
+class FastSerializer:
+    """Serializes ``values()`` rows exactly as ``serializer_class`` serializes objects."""
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self._plans = {}
+
+    @property
+    def plan(self):
+        return self.get_plan()
+
+    def get_plan(self, native=False):
+        # Compiled on first use (once the app registry and settings are
+        # ready) and per active time zone, which datetimes are rendered in
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        plan = self._plans.get((tz, native))
+        if plan is None:
+            plan = self._plans[tz, native] = self.compile(tz, native)
+        return plan
+
+    def compile(self, tz, native=False):
+        serializer = self.serializer_class()
+        model = serializer.Meta.model
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, fields.SerializerMethodField) or len(field.source_attrs) != 1:
+                raise ImproperlyConfigured(f'{self.serializer_class.__name__}.{name} cannot be read from values()')
+            column = field.source_attrs[0]
+            try:
+                model_field = model._meta.get_field(column)
+            except FieldDoesNotExist:
+                model_field = None
+            if model_field is None or not model_field.concrete or model_field.many_to_many:
+                raise ImproperlyConfigured(f'{self.serializer_class.__name__}.{name} is not a model column')
+            if model_field.is_relation and model_field.target_field != model_field.related_model._meta.pk:
+                # values() holds the to_field value, the serializer outputs the pk
+                raise ImproperlyConfigured(f'{self.serializer_class.__name__}.{name} does not reference a primary key')
+            plan.append((name, column, _converter(field, tz, native)))
+        return tuple(plan)
+
+    @property
+    def columns(self):
+        return [column for _, column, _ in self.plan]
+
+    def values(self, queryset, *extra):
+        """``queryset`` as dict rows holding the plan's columns plus ``extra`` lookups."""
+        columns = self.columns
+        columns += [path for path in extra if path not in columns]
+        return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+    def to_representation(self, row, plan=None):
+        data = {}
+        for name, column, convert in plan or self.plan:
+            value = row[column]
+            data[name] = value if convert is None or value is None else convert(value)
+        return data
+
+    def serialize(self, rows, native=False):
+        plan = self.get_plan(native)
+        with serialization():
+            return [self.to_representation(row, plan) for row in rows]
+
+    def serialize_queryset(self, queryset, native=False):
+        # Fetched first so the query is not counted as serializer time
+        return self.serialize(list(self.values(queryset)), native)
+
+
+class FastListMixin:
+    """Serves ``list`` from ``values()`` rows through ``fast_serializer``.
+
+    Applies only while the action's serializer class is the one
+    ``fast_serializer`` wraps, so other actions keep the normal path. The
+    ordering columns are added to the rows for keyset cursors.
+    """
+    fast_serializer = None
+
+    def list(self, request, *args, **kwargs):
+        fast = self.fast_serializer
+        if fast is None or self.get_serializer_class() is not fast.serializer_class:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = [key.path for key in ordering_keys(queryset)]
+        rows = fast.values(queryset, *ordering)
+        native = native_types(request)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page, native))
+        return Response(fast.serialize(rows, native))
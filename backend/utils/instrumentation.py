@@ -0,0 +1,181 @@
+"""
+Per-request timing: SQL, serialization and view time.
+
+``RequestTimingMiddleware`` times every request (total, and view plus
+rendering from ``process_view`` on). A sampled fraction
+(``REQUEST_TIMING_SAMPLE_RATE``) also records each SQL statement through
+``connection.execute_wrapper`` and the time spent in top-level DRF
+``serializer.data`` calls (and ``serialization()`` blocks). The breakdown
+is sent as a ``Server-Timing`` header (``REQUEST_TIMING_HEADERS``) so it
+shows up in the browser's network panel, and requests slower than
+``SLOW_REQUEST_MS`` are logged with their most repeated SQL, which is how
+N+1 queries show up. The sample's ``RequestMetrics`` is left on the request
+as ``request.timing_metrics`` (None when unsampled) for
+``utils.metrics.MetricsMiddleware``. For a streaming response the SQL hook
+stays installed until the response is closed, so the queries run while the
+body is produced are counted too.
+
+Unsampled requests only pay for two clock reads; serializer timing is a
+no-op unless the current request is being recorded.
+"""
+
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from rest_framework import serializers
+
+logger = logging.getLogger('request_timing')
+
+# Statements shown in the slow request log
+TOP_DUPLICATES = 3
+SQL_PREVIEW_LENGTH = 200
+
+_current = ContextVar('request_timing', default=None)
+
+
+class RequestMetrics:
+    """Counters for one sampled request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+        self.serialize_time = 0.0
+        self._serialize_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def duplicates(self, limit=TOP_DUPLICATES):
+        return [(sql, n) for sql, n in self.statements.most_common(limit) if n > 1]
+
+
+@contextmanager
+def serialization():
+    """Count the block as serializer time of the request being recorded."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    # Only the outermost block counts (ListSerializer.data -> Serializer)
+    metrics._serialize_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._serialize_depth -= 1
+        if metrics._serialize_depth == 0:
+            metrics.serialize_time += time.perf_counter() - start
+
+
+def _timed_data(prop):
+    """Wrap a serializer ``data`` property to add its time to the request."""
+    getter = prop.fget
+
+    def data(self):
+        if _current.get() is None:
+            return getter(self)
+        with serialization():
+            return getter(self)
+
+    data._timed = True
+    return property(data)
+
+
+def install_serializer_timing():
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        prop = cls.__dict__['data']
+        if not getattr(prop.fget, '_timed', False):
+            cls.data = _timed_data(prop)
+
+
+def on_close(response, callback):
+    """Run ``callback`` now, or once a streaming response's body has been sent."""
+    if response.streaming:
+        # Called by the handler (and the test client) from response.close()
+        response._resource_closers.append(callback)
+    else:
+        callback()
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+def server_timing(total, view, metrics):
+    parts = [f'total;dur={_ms(total)}']
+    if view is not None:
+        parts.append(f'view;dur={_ms(view)}')
+    if metrics is not None:
+        parts.append(f'db;dur={_ms(metrics.db_time)};desc="{metrics.queries} queries"')
+        parts.append(f'serialize;dur={_ms(metrics.serialize_time)}')
+    return ', '.join(parts)
+
+
+class RequestTimingMiddleware:
+    """Time requests, sample SQL/serializer breakdowns, log slow requests."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        self.slow_ms = settings.SLOW_REQUEST_MS
+        self.headers = settings.REQUEST_TIMING_HEADERS
+        install_serializer_timing()
+
+    def __call__(self, request):
+        metrics = RequestMetrics() if random.random() < self.sample_rate else None
+        request.timing_metrics = metrics
+        start = time.perf_counter()
+        if metrics is None:
+            response = self.get_response(request)
+        else:
+            token = _current.set(metrics)
+            stack = ExitStack()
+            try:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+            except BaseException:
+                stack.close()
+                raise
+            finally:
+                _current.reset(token)
+            on_close(response, stack.close)
+        end = time.perf_counter()
+        total = end - start
+        view_start = getattr(request, '_timing_view_start', None)
+        view = end - view_start if view_start is not None else None
+
+        if self.headers:
+            response['Server-Timing'] = server_timing(total, view, metrics)
+        if _ms(total) >= self.slow_ms:
+            self.log_slow(request, response, total, metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # View time runs from URL resolution to the end of rendering
+        request._timing_view_start = time.perf_counter()
+
+    def log_slow(self, request, response, total, metrics):
+        message = f'Slow request {request.method} {request.get_full_path()} -> {response.status_code} in {_ms(total)}ms'
+        if metrics is not None:
+            message += (
+                f'; {metrics.queries} queries in {_ms(metrics.db_time)}ms'
+                f', serialize {_ms(metrics.serialize_time)}ms'
+            )
+            for sql, count in metrics.duplicates():
+                message += f'\n  {count}x {sql[:SQL_PREVIEW_LENGTH]}'
+        logger.warning(message)
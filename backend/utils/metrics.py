@@ -0,0 +1,188 @@
+"""
+Prometheus metrics for HTTP requests, caches and Celery tasks.
+
+Served at ``/metrics`` in the text exposition format. Gunicorn and Celery
+prefork run several processes, each with its own counters, so when
+``PROMETHEUS_MULTIPROC_DIR`` is set prometheus_client keeps every
+process's values in memory-mapped files in that directory and the
+``/metrics`` view merges them with ``MultiProcessCollector``. The directory
+must be emptied before the server starts (``gunicorn.conf.py`` does this)
+and dead workers are marked on exit so their live-only series are dropped.
+
+``MetricsMiddleware`` times every request and takes the SQL count from
+the sampled ``RequestMetrics`` of ``utils.instrumentation``, so the query
+histogram covers the ``REQUEST_TIMING_SAMPLE_RATE`` fraction of requests
+and unsampled ones pay for nothing more than the clock reads. Streaming
+responses are observed when they are closed, once the body has been sent.
+
+Celery workers usually run in their own container and cannot share the
+web process's directory; setting ``CELERY_METRICS_PORT`` makes the worker
+serve its own merged ``/metrics`` on that port.
+"""
+
+import os
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY,
+    generate_latest, multiprocess, start_http_server,
+)
+
+from utils.instrumentation import on_close
+
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+TASK_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Request latency by resolved URL name, method and status class',
+    ['route', 'method', 'status'],
+)
+HTTP_REQUEST_QUERIES = Histogram(
+    'http_request_db_queries',
+    'SQL statements executed per sampled request',
+    ['route', 'method'],
+    buckets=QUERY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total',
+    'Application cache lookups by cache and result (hit or miss)',
+    ['cache', 'result'],
+)
+TASK_RUNTIME = Histogram(
+    'celery_task_runtime_seconds',
+    'Task execution time',
+    ['task', 'state'],
+    buckets=TASK_BUCKETS,
+)
+TASK_QUEUE_WAIT = Histogram(
+    'celery_task_queue_wait_seconds',
+    'Time between publish (or ETA) and a worker starting the task',
+    ['task'],
+    buckets=TASK_BUCKETS,
+)
+TASK_RETRIES = Counter('celery_task_retries_total', 'Task retries requested', ['task'])
+TASK_FAILURES = Counter('celery_task_failures_total', 'Tasks that raised', ['task'])
+
+
+def multiprocess_enabled():
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+def registry():
+    if not multiprocess_enabled():
+        return REGISTRY
+    merged = CollectorRegistry()
+    multiprocess.MultiProcessCollector(merged)
+    return merged
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+def metrics_view(request):
+    """Text exposition of all metrics; optionally guarded by METRICS_TOKEN."""
+    token = settings.METRICS_TOKEN
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponseForbidden()
+    return HttpResponse(generate_latest(registry()), content_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """Observe latency and SQL count per resolved route.
+
+    Must come before ``RequestTimingMiddleware``, whose sampled counts it
+    reports.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        # URL names keep label cardinality bounded; raw paths would not
+        route = (match.view_name or match.route) if match else 'unresolved'
+        if route == 'metrics':
+            return response
+
+        def observe():
+            HTTP_REQUEST_DURATION.labels(
+                route=route, method=request.method, status=f'{response.status_code // 100}xx'
+            ).observe(time.perf_counter() - start)
+            sampled = getattr(request, 'timing_metrics', None)
+            if sampled is not None:
+                HTTP_REQUEST_QUERIES.labels(route=route, method=request.method).observe(sampled.queries)
+
+        on_close(response, observe)
+        return response
+
+
+# Celery signal handlers ----------------------------------------------------
+
+PUBLISHED_AT_HEADER = 'published_at'
+_task_started = {}
+
+
+def _before_publish(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+def _prerun(task_id=None, task=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+    request = task.request
+    published_at = getattr(request, PUBLISHED_AT_HEADER, None)
+    if published_at is None:
+        return
+    # Retries and countdowns are not queueing delay: measure from the ETA
+    ready_at = float(published_at)
+    if request.eta:
+        try:
+            ready_at = max(ready_at, datetime.fromisoformat(str(request.eta)).timestamp())
+        except ValueError:
+            pass
+    TASK_QUEUE_WAIT.labels(task=task.name).observe(max(time.time() - ready_at, 0))
+
+
+def _postrun(task_id=None, task=None, state=None, **kwargs):
+    start = _task_started.pop(task_id, None)
+    if start is not None:
+        TASK_RUNTIME.labels(task=task.name, state=state or 'UNKNOWN').observe(time.perf_counter() - start)
+
+
+def _retry(sender=None, **kwargs):
+    TASK_RETRIES.labels(task=sender.name).inc()
+
+
+def _failure(sender=None, **kwargs):
+    TASK_FAILURES.labels(task=sender.name).inc()
+
+
+def _worker_init(**kwargs):
+    port = os.environ.get('CELERY_METRICS_PORT')
+    if port:
+        start_http_server(int(port), registry=registry())
+
+
+def _process_shutdown(pid=None, **kwargs):
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def connect_celery_signals():
+    from celery import signals
+
+    signals.before_task_publish.connect(_before_publish, weak=False)
+    signals.task_prerun.connect(_prerun, weak=False)
+    signals.task_postrun.connect(_postrun, weak=False)
+    signals.task_retry.connect(_retry, weak=False)
+    signals.task_failure.connect(_failure, weak=False)
+    signals.worker_init.connect(_worker_init, weak=False)
+    signals.worker_process_shutdown.connect(_process_shutdown, weak=False)
@@ -0,0 +1,304 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Pages are selected with a ``WHERE (ordering columns) > (last row seen)``
+predicate instead of ``OFFSET``, so with a composite index matching the
+ordering (migrations/013_keyset_pagination_indexes.sql) page N costs the
+same as page 1. The ordering is the queryset's own (or the model's
+``Meta.ordering``) with the primary key appended as a tiebreaker, so any
+ordering the views already use keeps working, including mixed directions
+and ``nulls_last`` rank columns.
+
+When every column sorts the same way and none is nullable the predicate is
+a row-value comparison, ``(created_at, id) < (%s, %s)``, which PostgreSQL
+turns into a single index range condition. Otherwise it is the expanded
+``a < x OR (a = x AND ...)`` form, ANDed with an inclusive bound on the
+leading column (``a <= x``) so the index range still starts at the cursor.
+
+Cursors are opaque URL-safe tokens holding the boundary row's ordering
+values. Keyset paging is opt-in: a request with a ``cursor`` parameter
+(empty for the first page) gets cursor ``next``/``previous`` links, and
+``COUNT(*)`` is then skipped unless asked for (``?count=exact`` runs it,
+``?count=estimate`` reads the planner's row estimate instead). Requests
+without one keep the page-number contract (``?page=N`` with an exact
+``count``) that existing clients rely on.
+"""
+
+import base64
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection
+from django.db.models import BooleanField, Expression, F, OrderBy, Q, Value
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class Key:
+    """One ordering column: lookup path, model field, direction, null placement."""
+
+    def __init__(self, model, path, descending=False, nulls_last=None):
+        field = None
+        parts = path.split(LOOKUP_SEP)
+        for index, part in enumerate(parts):
+            field = model._meta.get_field(part)
+            if field.is_relation:
+                if index == len(parts) - 1:
+                    # Ordering by a relation means its key column
+                    parts[index] = field.attname
+                else:
+                    model = field.related_model
+        self.path = LOOKUP_SEP.join(parts)
+        self.field = field
+        self.descending = descending
+        # PostgreSQL puts NULLs last ascending and first descending
+        self.nulls_last = (not descending) if nulls_last is None else nulls_last
+
+    def order_by(self, reverse=False):
+        descending = self.descending != reverse
+        if not self.field.null:
+            return OrderBy(F(self.path), descending=descending)
+        if self.nulls_last != reverse:
+            return OrderBy(F(self.path), descending=descending, nulls_last=True)
+        return OrderBy(F(self.path), descending=descending, nulls_first=True)
+
+    def after(self, value, reverse=False):
+        """Rows strictly after ``value`` in this column (and its equality test)."""
+        descending = self.descending != reverse
+        nulls_last = self.nulls_last != reverse
+        if value is None:
+            after = Q(**{f'{self.path}__isnull': False}) if not nulls_last else Q(pk__in=[])
+            return after, Q(**{f'{self.path}__isnull': True})
+        after = Q(**{f'{self.path}__{"lt" if descending else "gt"}': value})
+        if self.field.null and nulls_last:
+            after |= Q(**{f'{self.path}__isnull': True})
+        return after, Q(**{self.path: value})
+
+    def bound(self, value, reverse=False):
+        """Rows at or after ``value`` in this column alone."""
+        descending = self.descending != reverse
+        nulls_last = self.nulls_last != reverse
+        if value is None:
+            return Q() if not nulls_last else Q(**{f'{self.path}__isnull': True})
+        bound = Q(**{f'{self.path}__{"lte" if descending else "gte"}': value})
+        if self.field.null and nulls_last:
+            bound |= Q(**{f'{self.path}__isnull': True})
+        return bound
+
+    def value(self, obj):
+        if isinstance(obj, dict):
+            # values() rows are keyed by the lookup path
+            return obj[self.path]
+        for part in self.path.split(LOOKUP_SEP):
+            obj = getattr(obj, part) if obj is not None else None
+        return obj
+
+
+def ordering_keys(queryset):
+    """The queryset's ordering as Keys, with the primary key appended."""
+    model = queryset.model
+    ordering = queryset.query.order_by or model._meta.ordering
+    keys = []
+    for term in ordering:
+        if isinstance(term, str):
+            descending = term.startswith('-')
+            path = term.lstrip('-')
+            if path == 'pk':
+                path = model._meta.pk.name
+            keys.append(Key(model, path, descending))
+        elif isinstance(term, OrderBy) and isinstance(term.expression, F):
+            nulls_last = True if term.nulls_last else (False if term.nulls_first else None)
+            keys.append(Key(model, term.expression.name, term.descending, nulls_last))
+        else:
+            raise ValueError(f'Keyset pagination cannot order by {term!r}')
+
+    pk = model._meta.pk
+    if not any(key.field == pk for key in keys):
+        keys.append(Key(model, pk.name, keys[-1].descending if keys else False))
+    return keys
+
+
+class RowComparison(Expression):
+    """``(col, ...) < (value, ...)`` (or ``>``) as a boolean filter expression."""
+    conditional = True
+    output_field = BooleanField()
+
+    def __init__(self, paths, values, descending):
+        super().__init__()
+        self.columns = [F(path) for path in paths]
+        self.values = values
+        self.descending = descending
+
+    def get_source_expressions(self):
+        return [*self.columns, *self.values]
+
+    def set_source_expressions(self, exprs):
+        self.columns, self.values = exprs[:len(self.columns)], exprs[len(self.columns):]
+
+    def as_sql(self, compiler, connection):
+        sql, params = [], []
+        for side in (self.columns, self.values):
+            parts = [compiler.compile(expr) for expr in side]
+            sql.append(', '.join(part for part, _ in parts))
+            params.extend(param for _, part_params in parts for param in part_params)
+        operator = '<' if self.descending else '>'
+        return f'({sql[0]}) {operator} ({sql[1]})', params
+
+
+def keyset_filter(keys, values, reverse=False):
+    """Lexicographic "after ``values``" predicate over ``keys``."""
+    pairs = list(zip(keys, values))
+    directions = {key.descending for key in keys}
+    if len(directions) == 1 and not any(key.field.null or value is None for key, value in pairs):
+        return Q(RowComparison(
+            [key.path for key in keys],
+            [Value(value, output_field=key.field) for key, value in pairs],
+            directions.pop() != reverse,
+        ))
+
+    condition = Q(pk__in=[])
+    # Built from the last column outwards: after_i | (equal_i & after_rest)
+    for key, value in reversed(pairs):
+        after, equal = key.after(value, reverse)
+        condition = after | (equal & condition)
+    # Redundant, but gives the planner an index bound on the leading column
+    key, value = pairs[0]
+    return key.bound(value, reverse) & condition
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, decimal.Decimal)):
+        return str(value)
+    return value
+
+
+def estimated_count(queryset):
+    """Planner row estimate for ``queryset`` (exact count off PostgreSQL)."""
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(PageNumberPagination):
+    """Cursor pagination over the view's own ordering with a pk tiebreaker.
+
+    Falls back to page-number pagination when no ``cursor`` is given;
+    those pages get the same tiebreaker so they do not shift between
+    requests.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def encode_cursor(self, values, reverse):
+        payload = {'v': [_encode_value(v) for v in values]}
+        if reverse:
+            payload['r'] = 1
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode())
+        return token.decode().rstrip('=')
+
+    def decode_cursor(self, request, keys):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            raw = payload['v']
+            if len(raw) != len(keys):
+                raise ValueError
+            values = [None if v is None else key.field.to_python(v) for key, v in zip(keys, raw)]
+        except (TypeError, ValueError, KeyError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, bool(payload.get('r'))
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param, '').lower()
+        if mode in ('1', 'true', 'exact'):
+            return queryset.count()
+        if mode == 'estimate':
+            return estimated_count(queryset)
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = self.cursor_query_param in request.query_params
+        keys = ordering_keys(queryset)
+        if not self.keyset:
+            queryset = queryset.order_by(*(key.order_by(False) for key in keys))
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request, keys)
+        self.count = self.get_count(queryset, request)
+
+        queryset = queryset.order_by(*(key.order_by(reverse) for key in keys))
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(keys, values, reverse))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = values is not None, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        self.next = self.previous = None
+        if rows and has_next:
+            self.next = self.encode_cursor([key.value(rows[-1]) for key in keys], False)
+        if rows and has_previous:
+            self.previous = self.encode_cursor([key.value(rows[0]) for key in keys], True)
+        return rows
+
+    def _link(self, token):
+        if token is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, token)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'count': self.count,
+            'next': self._link(self.next),
+            'previous': self._link(self.previous),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
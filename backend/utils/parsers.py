@@ -0,0 +1,66 @@
+"""
+DRF parsers: orjson-backed JSON and MessagePack.
+
+``FastJSONParser`` decodes UTF-8 request bodies with orjson and falls back
+to DRF's ``JSONParser`` for other encodings or when orjson is not
+installed. Like ``JSONParser`` with ``STRICT_JSON`` it rejects ``NaN`` and
+``Infinity``.
+
+``MessagePackParser`` accepts ``application/msgpack`` bodies, with the
+extension types ``MessagePackRenderer`` writes decoded back to UUIDs and
+dates and timestamps to aware UTC datetimes, which DRF fields accept as is.
+"""
+
+import codecs
+import datetime
+import struct
+import uuid
+
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser, get_encoding
+
+from utils.renderers import DAYS, EPOCH_ORDINAL, EXT_DATE, EXT_UUID, FastJSONRenderer, MessagePackRenderer
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` decoding with orjson when available."""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = get_encoding(parser_context or {})
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+def msgpack_ext_hook(code, data):
+    if code == EXT_UUID:
+        return uuid.UUID(bytes=data)
+    if code == EXT_DATE:
+        return datetime.date.fromordinal(DAYS.unpack(data)[0] + EPOCH_ORDINAL)
+    return msgpack.ExtType(code, data)
+
+
+def msgpack_loads(data):
+    return msgpack.unpackb(data, ext_hook=msgpack_ext_hook, timestamp=3, strict_map_key=False)
+
+
+class MessagePackParser(BaseParser):
+    """Parses ``application/msgpack`` request bodies."""
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack_loads(stream.read())
+        except (ValueError, TypeError, msgpack.UnpackException, struct.error) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
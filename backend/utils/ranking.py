@@ -0,0 +1,268 @@
+"""
+Fractional (LexoRank-style) ordering keys.
+
+A rank is a base-36 string read as the digits after a radix point, so any
+two ranks have another rank between them and moving one row means writing
+one new key instead of renumbering its siblings. Keys never end in ``'0'``
+(that would make ``'a'`` and ``'a0'`` equal), and compare bytewise, which is
+why the columns use the "C" collation (``db_collation='C'``; SQLite gets an
+equivalent one from ``add_c_collation``). Appends and prepends step the
+leading digits instead of halving, so boards that mostly grow at the end
+keep fixed-length keys.
+
+``rank_for_order`` gives fixed-width keys for an integer position, starting
+at the middle of the keyspace (``'i'``) so a seeded board has as much room
+to prepend as to append; they seed new columns, mirror integer ``order``
+writes from the bulk reorder endpoints and are what ``rebalance`` rewrites
+a group to when repeated inserts at one spot have made keys long.
+"""
+
+from django.apps import apps
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Count, F, Max, Q
+from django.db.models.functions import Length
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from utils.reorder import bulk_reorder
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+# Leading digits stepped by appends/prepends; rank_for_order writes the
+# middle digit followed by the position as zero-padded decimal, + 'i'
+ORDER_WIDTH = 8
+SEED_DIGIT = DIGITS[len(DIGITS) // 2]
+MAX_ORDER = 10 ** (ORDER_WIDTH - 1) - 1
+# Groups holding a key longer than this are rewritten by the rebalancer
+MAX_RANK_LENGTH = 24
+# Column width; a key reaching it forces an immediate rebalance
+RANK_COLUMN_LENGTH = 64
+
+# model label -> field that defines a sibling group
+RANKED_MODELS = {
+    'sprints.Sprint': 'client_id',
+    'sprints.SprintItem': 'sprint_id',
+    'sprints.DeliveryMilestone': 'client_id',
+    'deliverables.DeliverableSection': 'page_id',
+}
+
+
+def add_c_collation(sender, connection, **kwargs):
+    """``connection_created`` receiver giving SQLite PostgreSQL's "C" collation.
+
+    Rank columns declare ``db_collation='C'``, which SQLite does not have.
+    Keys are ASCII, so comparing code points is the same as comparing bytes.
+    """
+    if connection.vendor == 'sqlite':
+        connection.connection.create_collation('C', lambda a, b: (a > b) - (a < b))
+
+
+class RankError(ValueError):
+    """Neighbour ranks that leave no room (missing, equal or reversed)."""
+
+
+def _midpoint(a, b):
+    """Key strictly between fractional digit strings ``a`` and ``b``.
+
+    ``a`` may be '' (zero) and ``b`` may be None (one).
+    """
+    if b is not None:
+        # Shared prefix, padding a with zeros
+        n = 0
+        while (a[n] if n < len(a) else '0') == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    # Adjacent digits: keep a's digit and recurse on the remainder
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _validate(key):
+    if key == '' or key.endswith('0') or any(c not in DIGITS for c in key):
+        raise RankError(f'Invalid rank {key!r}')
+
+
+def _step(key, delta):
+    """Key one unit above/below ``key`` in its leading ORDER_WIDTH digits.
+
+    Appending or prepending this way keeps keys at a fixed length instead of
+    halving towards the end of the range. Returns None at the range edge.
+    """
+    prefix = key[:ORDER_WIDTH].ljust(ORDER_WIDTH, '0')
+    value = int(prefix, BASE) + delta
+    if value <= 0 or value >= BASE ** ORDER_WIDTH:
+        return None
+    digits = []
+    for _ in range(ORDER_WIDTH):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits)) + 'i'
+
+
+def rank_between(before=None, after=None):
+    """Rank sorting after ``before`` and before ``after`` (either may be None)."""
+    if before is not None:
+        _validate(before)
+    if after is not None:
+        _validate(after)
+    if before is not None and after is not None and before >= after:
+        raise RankError(f'{before!r} does not sort before {after!r}')
+    if after is None and before is not None:
+        return _step(before, 1) or _midpoint(before, None)
+    if before is None and after is not None:
+        return _step(after, -1) or _midpoint('', after)
+    return _midpoint(before or '', after)
+
+
+def rank_for_order(order):
+    """Fixed-width rank for integer position ``order`` (monotonic in order)."""
+    order = min(max(int(order), 0), MAX_ORDER)
+    return f'{SEED_DIGIT}{order:0{ORDER_WIDTH - 1}d}i'
+
+
+def ranked_model(label):
+    return apps.get_model(label)
+
+
+def rebalance(model, group_field, group_value):
+    """Rewrite one sibling group to evenly spaced rank_for_order keys.
+
+    Current rank order is kept; rows without a rank go last in ``order``
+    order. Returns the number of rows updated.
+    """
+    ids = model.objects.filter(**{group_field: group_value}).order_by(
+        F('rank').asc(nulls_last=True), 'order', 'created_at'
+    ).values_list('pk', flat=True)
+    rows = [{'id': pk, 'rank': rank_for_order(position)} for position, pk in enumerate(ids)]
+    return bulk_reorder(model, rows, scope={group_field: group_value}, fields=('rank',))
+
+
+def rank_for_position(siblings, after_id=None, before_id=None):
+    """New rank placing a row after ``after_id`` and before ``before_id``.
+
+    ``siblings`` is the target group, excluding the row being moved. With
+    only one neighbour given the other is the adjacent sibling; with none
+    the row goes last. Raises ``model.DoesNotExist`` for an unknown
+    neighbour and RankError when the neighbours leave no room (unranked or
+    equal keys), which a rebalance of the group resolves.
+    """
+    ranked = siblings.exclude(rank__isnull=True)
+    before = siblings.values_list('rank', flat=True).get(pk=after_id) if after_id else None
+    after = siblings.values_list('rank', flat=True).get(pk=before_id) if before_id else None
+
+    if after_id and before is None or before_id and after is None:
+        raise RankError('Neighbour has no rank')
+    if after_id and not before_id:
+        after = ranked.filter(rank__gt=before).order_by('rank').values_list('rank', flat=True).first()
+    elif before_id and not after_id:
+        before = ranked.filter(rank__lt=after).order_by('-rank').values_list('rank', flat=True).first()
+    elif not after_id and not before_id:
+        if siblings.filter(rank__isnull=True).exists():
+            raise RankError('Group has unranked rows')
+        before = ranked.order_by('-rank').values_list('rank', flat=True).first()
+
+    return rank_between(before, after)
+
+
+def place(model, group_field, group_value, exclude_pk=None, after_id=None, before_id=None):
+    """Rank for a row entering ``group_value`` between the given neighbours.
+
+    Rebalances the group once when its keys leave no room or the new key
+    would not fit the column.
+    """
+    siblings = model.objects.filter(**{group_field: group_value})
+    if exclude_pk is not None:
+        siblings = siblings.exclude(pk=exclude_pk)
+    try:
+        rank = rank_for_position(siblings, after_id, before_id)
+        if len(rank) < RANK_COLUMN_LENGTH:
+            return rank
+    except RankError:
+        pass
+    rebalance(model, group_field, group_value)
+    return rank_for_position(siblings, after_id, before_id)
+
+
+def rebalance_all(max_length=MAX_RANK_LENGTH, force=False):
+    """Rebalance every group with over-long or missing keys (all when forced).
+
+    Returns ``{model label: groups rebalanced}``.
+    """
+    results = {}
+    for label, group_field in RANKED_MODELS.items():
+        model = ranked_model(label)
+        groups = model.objects.values(group_field).annotate(
+            longest=Max(Length('rank')),
+            unranked=Count('pk', filter=Q(rank__isnull=True)),
+        ).order_by()
+        if not force:
+            groups = groups.filter(Q(longest__gt=max_length) | Q(unranked__gt=0))
+        values = [group[group_field] for group in groups]
+        for value in values:
+            rebalance(model, group_field, value)
+        results[label] = len(values)
+    return results
+
+
+class RankSerializer(serializers.Serializer):
+    """Neighbours for an "insert between" move (either may be omitted)."""
+    after = serializers.UUIDField(required=False, allow_null=True)
+    before = serializers.UUIDField(required=False, allow_null=True)
+
+
+class RankActionMixin:
+    """Adds a ``rank`` action that moves one row between two siblings.
+
+    ``rank_group_field`` names the field whose value defines the sibling
+    group (e.g. ``sprint_id``); neighbours are only looked up inside it.
+    """
+    rank_group_field = 'client_id'
+
+    @action(detail=True, methods=['post'])
+    def rank(self, request, *args, **kwargs):
+        """Place the row after ``after`` and before ``before`` (one UPDATE)."""
+        instance = self.get_object()
+        serializer = RankSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            instance.rank = place(
+                type(instance),
+                self.rank_group_field,
+                getattr(instance, self.rank_group_field),
+                exclude_pk=instance.pk,
+                after_id=serializer.validated_data.get('after'),
+                before_id=serializer.validated_data.get('before'),
+            )
+        except ObjectDoesNotExist:
+            return Response({'error': 'Neighbour not found'}, status=status.HTTP_404_NOT_FOUND)
+        except RankError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        instance.save(update_fields=['rank', 'updated_at'])
+        return Response(self.get_serializer(instance).data)
+
+
+def with_order_ranks(rows):
+    """Mirror the integer ``order`` of bulk reorder rows into ``rank``.
+
+    Rows whose order does not parse are passed through unchanged for
+    ``bulk_reorder`` to reject.
+    """
+    ranked = []
+    for row in rows:
+        try:
+            row = {**row, 'rank': rank_for_order(row['order'])}
+        except (KeyError, TypeError, ValueError):
+            pass
+        ranked.append(row)
+    return ranked
@@ -0,0 +1,105 @@
+"""
+DRF renderers: orjson-backed JSON and MessagePack.
+
+``FastJSONRenderer`` encodes with orjson, which handles UUIDs, dates and
+datetimes natively and is several times faster than the stdlib ``json``
+module on large payloads such as ``/all/`` and the roadmap. Its output is
+the same as DRF's ``JSONRenderer``: compact, UTF-8, ``Z`` for UTC
+datetimes, ``\\u2028``/``\\u2029`` escaped, and types orjson does not know
+(``Decimal``, lazy strings, querysets, ...) go through DRF's encoder. It
+falls back to ``JSONRenderer`` when orjson is not installed, for indented
+output (``Accept: application/json; indent=4`` and the browsable API), for
+values orjson rejects, such as integers above 64 bits, and for NaN and
+infinities, which orjson writes as ``null`` where ``JSONRenderer`` (with
+``STRICT_JSON``) raises. Those can only hide behind a ``null`` in the
+output, so the data is only searched for them when one is present.
+
+``MessagePackRenderer`` serves ``application/msgpack`` for bulk consumers
+that send that ``Accept`` header (or ``?format=msgpack``). UUIDs are
+packed as 16-byte extension values, dates as day numbers since 1970-01-01
+and aware datetimes as MessagePack timestamps; ``native_types`` tells the
+values()-based serializers to hand those over as objects rather than
+strings. ``utils.parsers.msgpack_loads`` decodes them back.
+"""
+
+import datetime
+import math
+import struct
+import uuid
+
+import msgpack
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _has_non_finite(data):
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` with identical output, encoded by orjson when available."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=JSONEncoder().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'null' in ret and _has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Keep the output a strict JavaScript subset, as JSONRenderer does
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+# MessagePack extension type codes (0-127 are application defined)
+EXT_UUID = 1
+EXT_DATE = 2
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+DAYS = struct.Struct('>i')
+
+
+def msgpack_default(obj):
+    """Encode what MessagePack has no type for; the rest as DRF's JSON encoder would."""
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(EXT_UUID, obj.bytes)
+    if isinstance(obj, datetime.datetime):
+        # Aware datetimes are packed as timestamps before reaching here
+        return obj.isoformat()
+    if isinstance(obj, datetime.date):
+        return msgpack.ExtType(EXT_DATE, DAYS.pack(obj.toordinal() - EPOCH_ORDINAL))
+    return JSONEncoder().default(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renders ``application/msgpack`` with compact UUID, date and datetime encodings."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    native_types = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=msgpack_default, datetime=True, use_bin_type=True)
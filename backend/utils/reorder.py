@@ -0,0 +1,106 @@
+"""
+Set-based reordering for drag-and-drop boards.
+
+``bulk_reorder`` applies a whole new ordering in one statement per batch
+inside a single transaction. On PostgreSQL that is an
+``UPDATE ... FROM (VALUES ...)`` join whose WHERE clause also carries the
+tenant scope (client, page), so rows belonging to someone else are never
+touched even if their ids are submitted. Other backends fall back to
+``bulk_update`` over the scoped rows.
+
+Neither path runs ``save()``, so ``auto_now`` columns (``updated_at``) are
+set explicitly: the calendar ETag and other change checks read them.
+"""
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+BATCH_SIZE = 1000
+
+
+def _auto_now_fields(model):
+    return [field for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+
+
+def _clean_rows(model, rows, fields):
+    """Coerce submitted values to Python types, rejecting malformed input."""
+    meta = model._meta
+    cleaned = []
+    for row in rows:
+        try:
+            values = [meta.pk.to_python(row['id'])]
+            for name in fields:
+                value = row.get(name)
+                values.append(None if value in (None, '') else meta.get_field(name).to_python(value))
+        except (KeyError, TypeError, DjangoValidationError):
+            raise ValidationError({'items': f'Invalid reorder entry: {row!r}'})
+        cleaned.append(values)
+    return cleaned
+
+
+def _update_from_values(model, rows, fields, scope):
+    meta = model._meta
+    qn = connection.ops.quote_name
+    columns = [meta.pk] + [meta.get_field(name) for name in fields]
+
+    placeholder = '(' + ', '.join(f'%s::{c.db_type(connection)}' for c in columns) + ')'
+    assignments = ', '.join(
+        [f'{qn(c.column)} = COALESCE(v.{qn(c.column)}, t.{qn(c.column)})' for c in columns[1:]]
+        + [f'{qn(field.column)} = %s' for field in _auto_now_fields(model)]
+    )
+    # The clock auto_now uses; NOW() would be the transaction's start time
+    set_params = [timezone.now()] * len(_auto_now_fields(model))
+    conditions = [f't.{qn(meta.pk.column)} = v.{qn(meta.pk.column)}']
+    scope_params = []
+    for name, value in scope.items():
+        conditions.append(f't.{qn(meta.get_field(name).column)} = %s')
+        scope_params.append(value)
+
+    updated = 0
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), BATCH_SIZE):
+            batch = rows[start:start + BATCH_SIZE]
+            sql = (
+                f'UPDATE {qn(meta.db_table)} AS t SET {assignments} '
+                f'FROM (VALUES {", ".join([placeholder] * len(batch))}) '
+                f'AS v({", ".join(qn(c.column) for c in columns)}) '
+                f'WHERE {" AND ".join(conditions)}'
+            )
+            params = set_params + [value for row in batch for value in row] + scope_params
+            cursor.execute(sql, params)
+            updated += cursor.rowcount
+    return updated
+
+
+def _bulk_update(model, rows, fields, scope):
+    values = {row[0]: row[1:] for row in rows}
+    objects = list(model.objects.filter(pk__in=list(values), **scope))
+    touched = [field.name for field in _auto_now_fields(model)]
+    now = timezone.now()
+    for obj in objects:
+        for name, value in zip(fields, values[obj.pk]):
+            if value is not None:
+                setattr(obj, name, value)
+        for name in touched:
+            setattr(obj, name, now)
+    model.objects.bulk_update(objects, list(fields) + touched, batch_size=BATCH_SIZE)
+    return len(objects)
+
+
+def bulk_reorder(model, rows, scope, fields=('order',)):
+    """Apply ``rows`` (dicts with ``id`` plus ``fields``) to ``model`` atomically.
+
+    ``scope`` maps field names to required values (e.g. ``{'client_id': ...}``)
+    and is enforced in the same statement. Optional fields that are missing
+    or null keep their current value. Returns the number of rows updated.
+    """
+    cleaned = _clean_rows(model, rows, fields)
+    if not cleaned:
+        return 0
+
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            return _update_from_values(model, cleaned, fields, scope)
+        return _bulk_update(model, cleaned, fields, scope)
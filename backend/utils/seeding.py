@@ -0,0 +1,272 @@
+"""
+Synthetic tenant data for benchmarks and query budget checks.
+
+``seed_tenant`` creates one client with ``rows`` records in each of its
+main tables (meetings, questions, rules, decisions, action items, sprint
+items, suggestions, updates, blockers, attachments, sections, documents),
+linked the way real data is: items spread over sprints, records pointing
+at meetings, answer suggestions at questions. Everything is inserted with
+``bulk_create``, so model signals do not fire; database triggers (sprint
+counters, status events) still do.
+
+Values come from a seeded ``random.Random``, so the same arguments give the
+same shape of data on every run. With ``transcripts=True`` completed
+meetings also get a timestamped, speaker-labelled transcript of
+``TRANSCRIPT_LINES`` lines, roughly the size of a real one-hour call.
+"""
+
+import random
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.actions.models import ActionItem
+from apps.clients.models import Client
+from apps.deliverables.models import ClientBranding, ClientDocument, DeliverablePage, DeliverableSection
+from apps.meetings.models import Attachment, Blocker, Meeting, MeetingSummary, Update
+from apps.questions.models import Question
+from apps.rules.models import BusinessRule, Decision
+from apps.settings_app.models import ClientSettings
+from apps.sprints.models import DeliveryMilestone, Sprint, SprintItem
+from apps.suggestions.models import AISuggestion
+from utils.ranking import rank_for_order
+
+BATCH_SIZE = 1000
+
+# Rows per parent for the tables that hang off another one
+ITEMS_PER_SPRINT = 20
+SECTIONS_PER_PAGE = 25
+ROWS_PER_MILESTONE = 10
+ROWS_PER_DOCUMENT = 10
+# Enough sprints and milestones to move one between two others
+MIN_GROUPS = 3
+
+TRANSCRIPT_LINES = 120
+# Distinct sentences drawn from; composing text word by word dominates the
+# run time once tables reach millions of rows
+SENTENCE_POOL = 1024
+
+PEOPLE = ['Ana', 'Ben', 'Chloe', 'Diego', 'Elena', 'Farid', 'Grace', 'Hugo']
+WORDS = (
+    'invoice shipment customs tariff broker carrier freight quote contract '
+    'warehouse pallet manifest origin declaration duty port vessel container'
+).split()
+
+
+def _choice(choices):
+    return [value for value, _ in choices]
+
+
+class _Faker:
+    """Deterministic filler text and dates."""
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.today = timezone.now().date()
+        self.sentences = [self.words(self.random.randint(6, 14)) + '.' for _ in range(SENTENCE_POOL)]
+
+    def words(self, count):
+        return ' '.join(self.random.choices(WORDS, k=count)).capitalize()
+
+    def text(self, sentences=3):
+        return ' '.join(self.random.choices(self.sentences, k=sentences))
+
+    def transcript(self, speakers, lines=TRANSCRIPT_LINES):
+        seconds = 0
+        out = []
+        for _ in range(lines):
+            seconds += self.random.randint(5, 45)
+            stamp = f'{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}'
+            out.append(f'[{stamp}] {self.random.choice(speakers)}: {self.text(self.random.randint(1, 3))}')
+        return '\n'.join(out), seconds
+
+    def pick(self, values):
+        return self.random.choice(values)
+
+    def day(self, spread=90):
+        return self.today + timedelta(days=self.random.randint(-spread, spread))
+
+
+def _create(model, objects):
+    return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+def _meeting(fake, client, n, transcripts):
+    attendees = fake.random.sample(PEOPLE, 3)
+    meeting = Meeting(
+        client=client,
+        meeting_code=f'MTG-{n + 1:05d}',
+        date=fake.day(),
+        title=fake.words(5),
+        attendees=attendees,
+        agenda=fake.text(2),
+        notes=fake.text(),
+        status=fake.pick(_choice(Meeting.STATUS_CHOICES)),
+    )
+    if transcripts and meeting.status == 'completed':
+        meeting.transcript_text, duration = fake.transcript(attendees)
+        meeting.transcript_filename = f'{meeting.meeting_code.lower()}.txt'
+        meeting.transcript_uploaded_at = timezone.now()
+        meeting.transcript_source = 'text'
+        meeting.transcript_duration = duration
+        meeting.transcript_language = 'en'
+    return meeting
+
+
+def seed_tenant(rows, slug=None, name=None, seed=0, transcripts=False):
+    """Create a client with ``rows`` records per main table; returns the Client."""
+    rows = max(int(rows), 1)
+    slug = slug or f'seed-{uuid.uuid4().hex[:8]}'
+    fake = _Faker(seed)
+
+    with transaction.atomic():
+        client = Client.objects.create(name=name or slug.replace('-', ' ').title(), slug=slug)
+        ClientBranding.objects.create(client=client, company_name=client.name)
+        ClientSettings.objects.create(client=client)
+
+        meetings = _create(Meeting, [_meeting(fake, client, n, transcripts) for n in range(rows)])
+        _create(MeetingSummary, [
+            MeetingSummary(
+                client=client, meeting=meeting, content=fake.text(),
+                key_points=[fake.words(4) for _ in range(3)],
+            )
+            for meeting in meetings
+        ])
+        _create(Update, [
+            Update(
+                client=client, meeting=fake.pick(meetings), update_code=f'UPD-{n + 1:05d}',
+                author=fake.pick(PEOPLE), content=fake.text(),
+                category=fake.pick(_choice(Update.CATEGORY_CHOICES)),
+            )
+            for n in range(rows)
+        ])
+        _create(Blocker, [
+            Blocker(
+                client=client, meeting=fake.pick(meetings), blocker_code=f'BLK-{n + 1:05d}',
+                title=fake.words(5), description=fake.text(),
+                severity=fake.pick(_choice(Blocker.SEVERITY_CHOICES)),
+                status=fake.pick(_choice(Blocker.STATUS_CHOICES)), owner=fake.pick(PEOPLE),
+            )
+            for n in range(rows)
+        ])
+        _create(Attachment, [
+            Attachment(
+                client=client, meeting=fake.pick(meetings), filename=f'file-{n + 1}.pdf',
+                file_type=fake.pick(_choice(Attachment.FILE_TYPE_CHOICES)),
+                file_url=f'https://files.example.com/{slug}/{n + 1}.pdf', uploaded_by=fake.pick(PEOPLE),
+            )
+            for n in range(rows)
+        ])
+
+        questions = _create(Question, [
+            Question(
+                client=client, question_code=f'Q-{n + 1:05d}', category=fake.pick(WORDS),
+                question=fake.words(10) + '?', asked_in_meeting=fake.pick(meetings),
+                status=fake.pick(_choice(Question.STATUS_CHOICES)),
+                priority=fake.pick(_choice(Question.PRIORITY_CHOICES)),
+            )
+            for n in range(rows)
+        ])
+        _create(BusinessRule, [
+            BusinessRule(
+                client=client, rule_code=f'BR-{n + 1:05d}', title=fake.words(6),
+                description=fake.text(), category=fake.pick(WORDS),
+                discovered_in_meeting=fake.pick(meetings), source='Seed',
+            )
+            for n in range(rows)
+        ])
+        _create(Decision, [
+            Decision(
+                client=client, decision_code=f'DEC-{n + 1:05d}', title=fake.words(6),
+                description=fake.text(), made_in_meeting=fake.pick(meetings), made_by=fake.pick(PEOPLE),
+            )
+            for n in range(rows)
+        ])
+        _create(ActionItem, [
+            ActionItem(
+                client=client, action_code=f'ACT-{n + 1:05d}', title=fake.words(6),
+                description=fake.text(), assigned_to=fake.pick(PEOPLE), due_date=fake.day(),
+                status=fake.pick(_choice(ActionItem.STATUS_CHOICES)),
+                priority=fake.pick(_choice(ActionItem.PRIORITY_CHOICES)),
+                from_meeting=fake.pick(meetings),
+            )
+            for n in range(rows)
+        ])
+
+        suggestion_types = _choice(AISuggestion.TYPE_CHOICES)
+        suggestions = []
+        for n in range(rows):
+            suggestion_type = suggestion_types[n % len(suggestion_types)]
+            content = {'title': fake.words(6), 'description': fake.text(2)}
+            if suggestion_type == 'answer':
+                content = {'answer': fake.text(2)}
+            suggestions.append(AISuggestion(
+                client=client, meeting=fake.pick(meetings), suggestion_type=suggestion_type,
+                target_question=fake.pick(questions) if suggestion_type == 'answer' else None,
+                suggested_content=content, confidence=round(fake.random.uniform(0.5, 1), 2),
+            ))
+        _create(AISuggestion, suggestions)
+
+        sprint_count = max(rows // ITEMS_PER_SPRINT, MIN_GROUPS)
+        sprints = []
+        for n in range(sprint_count):
+            start = fake.today + timedelta(days=14 * (n - sprint_count // 2))
+            sprints.append(Sprint(
+                client=client, sprint_code=f'S{n + 1}', name=f'Sprint {n + 1}',
+                description=fake.text(1), start_date=start, end_date=start + timedelta(days=13),
+                status='delivered' if start + timedelta(days=13) < fake.today else (
+                    'in_progress' if start <= fake.today else 'planned'
+                ),
+                order=n, rank=rank_for_order(n),
+            ))
+        sprints = _create(Sprint, sprints)
+        items = []
+        for n in range(rows):
+            sprint = sprints[n % sprint_count]
+            position = n // sprint_count
+            items.append(SprintItem(
+                client=client, sprint=sprint, item_code=f'ITEM-{n + 1:05d}', name=fake.words(4),
+                description=fake.text(1), item_type=fake.pick(_choice(SprintItem.ITEM_TYPE_CHOICES)),
+                status=fake.pick(_choice(SprintItem.STATUS_CHOICES)),
+                priority=fake.pick(_choice(SprintItem.PRIORITY_CHOICES)),
+                order=position, rank=rank_for_order(position), assigned_to=fake.pick(PEOPLE),
+                estimated_hours=fake.random.choice([2, 4, 8, 16]),
+                start_date=sprint.start_date, end_date=sprint.end_date,
+            ))
+        _create(SprintItem, items)
+        _create(DeliveryMilestone, [
+            DeliveryMilestone(
+                client=client, milestone_code=f'M{n + 1}', name=fake.words(3),
+                milestone_type=fake.pick(_choice(DeliveryMilestone.MILESTONE_TYPE_CHOICES)),
+                start_date=fake.day(), status=fake.pick(_choice(DeliveryMilestone.STATUS_CHOICES)),
+                order=n, rank=rank_for_order(n),
+            )
+            for n in range(max(rows // ROWS_PER_MILESTONE, MIN_GROUPS))
+        ])
+
+        pages = _create(DeliverablePage, [
+            DeliverablePage(
+                client=client, slug=f'page-{n + 1}', title=fake.words(3), description=fake.text(1),
+                content=fake.text(5), is_published=n % 2 == 0, order=n,
+            )
+            for n in range(max(rows // SECTIONS_PER_PAGE, 1))
+        ])
+        _create(DeliverableSection, [
+            DeliverableSection(
+                page=pages[n % len(pages)], title=fake.words(3), content=fake.text(4),
+                section_type=fake.pick(_choice(DeliverableSection.SECTION_TYPES)),
+                order=n // len(pages), rank=rank_for_order(n // len(pages)),
+            )
+            for n in range(rows)
+        ])
+        _create(ClientDocument, [
+            ClientDocument(
+                client=client, slug=f'doc-{n + 1}', title=fake.words(4), content=fake.text(8),
+                category=fake.pick(_choice(ClientDocument.CATEGORIES)), is_pinned=n == 0,
+            )
+            for n in range(max(rows // ROWS_PER_DOCUMENT, 1))
+        ])
+
+    return client
@@ -0,0 +1,69 @@
+"""
+Test runner that builds the ``managed=False`` schema in the test database.
+
+Most tables are created by the numbered SQL files in ``backend/migrations``
+rather than Django migrations, so a plain test database would not have
+them. ``TestRunner`` creates every model's table from its definition
+(migrations are skipped, as with ``TEST['MIGRATE'] = False``), records the
+SQL files up to ``MODEL_TABLES_THROUGH`` as applied and then applies the
+later ones on top with ``apply_sql_migrations``, so triggers, extra tables
+and indexes exist as in production. Tables those later files create
+themselves are not built from the models.
+
+The schema uses PostgreSQL types, so tests that touch the database need
+``DATABASE_URL`` to point at a PostgreSQL server (the test database is
+created next to the configured one). Tests that need no database
+(``SimpleTestCase``) run anywhere.
+"""
+
+import io
+import re
+
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.runner import DiscoverRunner
+
+MODEL_TABLES_THROUGH = '006'
+CREATE_TABLE = re.compile(r'CREATE TABLE IF NOT EXISTS (\w+)', re.IGNORECASE)
+
+
+def sql_tables():
+    """Tables created by the SQL files after ``MODEL_TABLES_THROUGH``."""
+    from apps.clients.management.commands.apply_sql_migrations import discover
+
+    return {
+        table
+        for migration in discover() if migration.version > MODEL_TABLES_THROUGH
+        for table in CREATE_TABLE.findall(migration.sql)
+    }
+
+
+class TestRunner(DiscoverRunner):
+
+    def setup_databases(self, **kwargs):
+        if kwargs.get('aliases') and connections[DEFAULT_DB_ALIAS].vendor != 'postgresql':
+            raise ImproperlyConfigured('Database tests need PostgreSQL; set DATABASE_URL')
+        # Tables a SQL file creates are left to it, with its defaults
+        skip = sql_tables()
+        unmanaged = [
+            model for model in apps.get_models()
+            if not model._meta.managed and model._meta.db_table not in skip
+        ]
+        for alias in connections:
+            connections[alias].settings_dict.setdefault('TEST', {})['MIGRATE'] = False
+        for model in unmanaged:
+            model._meta.managed = True
+        try:
+            old_config = super().setup_databases(**kwargs)
+        finally:
+            for model in unmanaged:
+                model._meta.managed = False
+
+        if kwargs.get('aliases'):
+            # The files up to MODEL_TABLES_THROUGH create or reshape tables
+            # the models now define, so they are only recorded
+            call_command('apply_sql_migrations', fake_through=MODEL_TABLES_THROUGH, stdout=io.StringIO())
+            call_command('apply_sql_migrations', stdout=io.StringIO())
+        return old_config
@@ -0,0 +1,764 @@
+import datetime
+import decimal
+import gzip
+import io
+import json
+import uuid
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import F
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from prometheus_client import REGISTRY
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from apps.actions.models import ActionItem
+from apps.actions.serializers import ActionItemFastSerializer
+from apps.clients.models import Client
+from apps.clients.tenancy import local_cache
+from apps.deliverables.models import DeliverableSection
+from apps.meetings.models import Attachment, Blocker, Meeting, Update
+from apps.questions.models import Question
+from apps.rules.models import BusinessRule, Decision
+from apps.meetings.serializers import (
+    AttachmentFastSerializer, BlockerFastSerializer, MeetingFastSerializer, UpdateFastSerializer,
+)
+from apps.rules.serializers import BusinessRuleFastSerializer, DecisionFastSerializer
+from apps.sprints.models import Sprint, SprintItem
+from apps.sprints.serializers import SprintItemFastSerializer
+from apps.suggestions.models import AISuggestion
+from apps.suggestions.serializers import AISuggestionFastSerializer
+
+from . import metrics
+from .compression import CompressionMiddleware, accepted_encoding, brotli
+from .fast_serializers import FastSerializer
+from .instrumentation import RequestMetrics, serialization, server_timing
+from .pagination import KeysetPagination, keyset_filter, ordering_keys
+from .parsers import FastJSONParser, MessagePackParser, msgpack_loads
+from .ranking import MAX_ORDER, RankError, rank_between, rank_for_order
+from .renderers import FastJSONRenderer, MessagePackRenderer
+from .seeding import ITEMS_PER_SPRINT, MIN_GROUPS, seed_tenant
+
+
+class RankForOrderTests(SimpleTestCase):
+
+    def test_centred_fixed_width(self):
+        self.assertEqual(rank_for_order(0), 'i0000000i')
+        self.assertEqual(rank_for_order('12'), 'i0000012i')
+        self.assertEqual(len({len(rank_for_order(n)) for n in (0, 9, 10, 12345, MAX_ORDER)}), 1)
+
+    def test_monotonic_and_clamped(self):
+        keys = [rank_for_order(n) for n in (0, 1, 9, 10, 11, 99, 100, 12345, MAX_ORDER)]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(rank_for_order(-3), rank_for_order(0))
+        self.assertEqual(rank_for_order(MAX_ORDER + 1), rank_for_order(MAX_ORDER))
+
+
+class RankBetweenTests(SimpleTestCase):
+
+    def assertBetween(self, before, after):
+        rank = rank_between(before, after)
+        if before is not None:
+            self.assertLess(before, rank)
+        if after is not None:
+            self.assertLess(rank, after)
+        self.assertFalse(rank.endswith('0'))
+        return rank
+
+    def test_empty_list(self):
+        self.assertBetween(None, None)
+
+    def test_start_of_list(self):
+        first = rank_for_order(0)
+        rank = self.assertBetween(None, first)
+        self.assertEqual(len(rank), len(first))
+        for _ in range(100):
+            rank = self.assertBetween(None, rank)
+        self.assertEqual(len(rank), len(first))
+
+    def test_end_of_list(self):
+        last = rank_for_order(MAX_ORDER)
+        rank = self.assertBetween(last, None)
+        for _ in range(100):
+            rank = self.assertBetween(rank, None)
+        self.assertEqual(len(rank), len(last))
+
+    def test_edges_of_keyspace(self):
+        self.assertBetween(None, '00000001i')
+        self.assertBetween(None, '1')
+        self.assertBetween('zzzzzzzzi', None)
+        self.assertBetween('z', None)
+
+    def test_adjacent_keys(self):
+        for before, after in (
+            (rank_for_order(0), rank_for_order(1)),
+            ('a', 'b'),
+            ('a', 'a1'),
+            ('a1', 'a2'),
+            ('az', 'b'),
+            ('azzz', 'b1'),
+        ):
+            with self.subTest(before=before, after=after):
+                self.assertBetween(before, after)
+
+    def test_repeated_inserts_at_one_spot(self):
+        before, after = rank_for_order(0), rank_for_order(1)
+        for _ in range(50):
+            after = self.assertBetween(before, after)
+        for _ in range(50):
+            before = self.assertBetween(before, after)
+
+    def test_invalid(self):
+        for before, after in (('b', 'a'), ('a', 'a'), ('a0', None), (None, ''), ('A', None)):
+            with self.subTest(before=before, after=after), self.assertRaises(RankError):
+                rank_between(before, after)
+
+
+class RankCollationTests(TestCase):
+
+    def test_rank_columns_compare_bytewise(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT table_name, collation_name FROM information_schema.columns WHERE column_name = 'rank' "
+                "AND table_name IN ('sprints', 'sprint_items', 'delivery_milestones', 'deliverable_sections')"
+            )
+            self.assertEqual(sorted(cursor.fetchall()), [
+                ('deliverable_sections', 'C'), ('delivery_milestones', 'C'), ('sprint_items', 'C'), ('sprints', 'C'),
+            ])
+
+
+class CursorTests(SimpleTestCase):
+
+    def setUp(self):
+        self.paginator = KeysetPagination()
+        self.keys = ordering_keys(Meeting.objects.all())
+
+    def decode(self, token):
+        request = Request(RequestFactory().get('/', {'cursor': token}))
+        return self.paginator.decode_cursor(request, self.keys)
+
+    def test_round_trip(self):
+        values = [datetime.date(2026, 3, 2), uuid.uuid4()]
+        for backwards in (False, True):
+            token = self.paginator.encode_cursor(values, backwards)
+            self.assertNotIn('=', token)
+            self.assertEqual(self.decode(token), (values, backwards))
+
+    def test_empty_cursor_is_first_page(self):
+        self.assertEqual(self.decode(''), (None, False))
+
+    def test_invalid_cursor(self):
+        wrong_length = self.paginator.encode_cursor([datetime.date(2026, 3, 2)], False)
+        bad_uuid = self.paginator.encode_cursor(['2026-03-02', 'not-a-uuid'], False)
+        for token in ('garbage', 'e30', wrong_length, bad_uuid):
+            with self.subTest(token=token), self.assertRaises(NotFound):
+                self.decode(token)
+
+
+class KeysetFilterTests(SimpleTestCase):
+
+    def where(self, queryset, values):
+        sql = str(queryset.filter(keyset_filter(ordering_keys(queryset), values)).query)
+        return sql.split(' WHERE ', 1)[1].split(' ORDER BY ')[0]
+
+    def test_row_value_comparison(self):
+        where = self.where(Meeting.objects.all(), [datetime.date(2026, 3, 2), uuid.uuid4()])
+        self.assertTrue(where.startswith('("meetings"."date", "meetings"."id") < ('))
+        self.assertNotIn(' OR ', where)
+
+    def test_leading_bound(self):
+        # Nullable rank column: expanded form, bounded on the rank
+        queryset = SprintItem.objects.order_by(F('rank').asc(nulls_last=True), 'order')
+        where = self.where(queryset, ['i0000001i', 1, uuid.uuid4()])
+        self.assertTrue(where.startswith('(("sprint_items"."rank" >= i0000001i OR "sprint_items"."rank" IS NULL) AND'))
+
+        # Mixed directions
+        created_at = datetime.datetime(2026, 3, 2, tzinfo=datetime.timezone.utc)
+        where = self.where(Meeting.objects.order_by('date', '-created_at'), [datetime.date(2026, 3, 2), created_at, uuid.uuid4()])
+        self.assertTrue(where.startswith('("meetings"."date" >= 2026-03-02 AND'))
+
+
+class KeysetPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        # Repeated dates, so pages split inside runs of equal ordering values
+        Meeting.objects.bulk_create([
+            Meeting(client=cls.client_, meeting_code=f'M{n}', title=f'Meeting {n}',
+                    date=datetime.date(2026, 3, 1 + n // 3))
+            for n in range(8)
+        ])
+        sprint = Sprint.objects.create(
+            client=cls.client_, sprint_code='S1', name='Sprint 1',
+            start_date=datetime.date(2026, 3, 2), end_date=datetime.date(2026, 3, 15),
+        )
+        SprintItem.objects.bulk_create([
+            SprintItem(client=cls.client_, sprint=sprint, item_code=f'I{n}', name=f'Item {n}',
+                       order=n % 2, rank=None if n % 3 == 0 else rank_for_order(n // 2))
+            for n in range(7)
+        ])
+        cls.meetings = [str(pk) for pk in Meeting.objects.order_by('-date', '-id').values_list('id', flat=True)]
+
+    def get(self, name='meetings-list', url=None, **params):
+        local_cache.clear()
+        response = self.client.get(url or reverse(name, kwargs={'client_slug': self.client_.slug}), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def traverse(self, name, **params):
+        """Ids of every page following ``next``, then back again following ``previous``."""
+        page = self.get(name, cursor='', page_size=3, **params)
+        forward = [row['id'] for row in page['results']]
+        while page['next']:
+            page = self.get(url=page['next'])
+            forward += [row['id'] for row in page['results']]
+        backward = [row['id'] for row in page['results']]
+        while page['previous']:
+            page = self.get(url=page['previous'])
+            backward = [row['id'] for row in page['results']] + backward
+        return forward, backward
+
+    def test_cursor_pages(self):
+        forward, backward = self.traverse('meetings-list')
+        self.assertEqual(forward, self.meetings)
+        self.assertEqual(backward, self.meetings)
+
+    def test_cursor_pages_nullable_rank(self):
+        expected = [str(pk) for pk in SprintItem.objects.order_by(
+            F('rank').asc(nulls_last=True), 'order', 'id'
+        ).values_list('id', flat=True)]
+        forward, backward = self.traverse('sprint-items-list')
+        self.assertEqual(forward, expected)
+        self.assertEqual(backward, expected)
+
+    def test_cursor_count_opt_in(self):
+        self.assertIsNone(self.get(cursor='')['count'])
+        self.assertEqual(self.get(cursor='', count='exact')['count'], 8)
+        self.assertIsInstance(self.get(cursor='', count='estimate')['count'], int)
+
+    def test_invalid_cursor(self):
+        local_cache.clear()
+        url = reverse('meetings-list', kwargs={'client_slug': self.client_.slug})
+        self.assertEqual(self.client.get(url, {'cursor': 'garbage'}).status_code, 404)
+
+    def test_page_numbers_without_cursor(self):
+        first = self.get(page_size=5)
+        self.assertEqual(first['count'], 8)
+        self.assertIn('page=2', first['next'])
+        second = self.get(url=first['next'])
+        self.assertEqual([row['id'] for row in first['results'] + second['results']], self.meetings)
+        self.assertIsNone(second['next'])
+
+
+class RequestMetricsTests(SimpleTestCase):
+
+    def test_server_timing(self):
+        self.assertEqual(server_timing(0.0123, None, None), 'total;dur=12.3')
+        metrics = RequestMetrics()
+        metrics.queries, metrics.db_time, metrics.serialize_time = 3, 0.002, 0.001
+        self.assertEqual(
+            server_timing(0.0123, 0.01, metrics),
+            'total;dur=12.3, view;dur=10.0, db;dur=2.0;desc="3 queries", serialize;dur=1.0',
+        )
+
+    def test_duplicates(self):
+        metrics = RequestMetrics()
+        for sql in ('SELECT 1', 'SELECT 2', 'SELECT 2', 'SELECT 3', 'SELECT 3', 'SELECT 3'):
+            metrics(lambda *args: None, sql, None, False, {})
+        self.assertEqual(metrics.queries, 6)
+        self.assertEqual(metrics.duplicates(), [('SELECT 3', 3), ('SELECT 2', 2)])
+
+    def test_serialization_outside_a_request(self):
+        with serialization():
+            pass
+
+
+@override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0, REQUEST_TIMING_HEADERS=True, SLOW_REQUEST_MS=60000)
+class RequestTimingMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+        Meeting.objects.create(client=cls.client_, meeting_code='M1', title='Kickoff', date=datetime.date(2026, 3, 2))
+
+    def setUp(self):
+        local_cache.clear()
+        self.url = reverse('meetings-list', kwargs={'client_slug': self.client_.slug})
+
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.url)
+        parts = dict(part.split(';', 1) for part in response['Server-Timing'].split(', '))
+        self.assertEqual(set(parts), {'total', 'view', 'db', 'serialize'})
+        self.assertIn(f'desc="{len(captured.captured_queries)} queries"', parts['db'])
+
+    @override_settings(REQUEST_TIMING_HEADERS=False)
+    def test_headers_off(self):
+        self.assertNotIn('Server-Timing', self.client.get(self.url))
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_request_logged(self):
+        with self.assertLogs('request_timing', 'WARNING') as logs, CaptureQueriesContext(connection) as captured:
+            self.client.get(self.url)
+        (message,) = logs.output
+        self.assertIn(f'Slow request GET {self.url} -> 200', message)
+        self.assertIn(f'{len(captured.captured_queries)} queries', message)
+
+
+class MetricsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = Client.objects.create(name='Acme', slug='acme')
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0)
+    def test_request_metrics(self):
+        labels = {'route': 'meetings-list', 'method': 'GET'}
+        requests = self.sample('http_request_duration_seconds_count', status='2xx', **labels)
+        queries = self.sample('http_request_db_queries_count', **labels)
+        local_cache.clear()
+        self.client.get(reverse('meetings-list', kwargs={'client_slug': self.client_.slug}))
+        self.assertEqual(self.sample('http_request_duration_seconds_count', status='2xx', **labels), requests + 1)
+        self.assertEqual(self.sample('http_request_db_queries_count', **labels), queries + 1)
+
+        # Unresolved paths share one label instead of one series per URL
+        unresolved = self.sample('http_request_duration_seconds_count', route='unresolved', method='GET', status='4xx')
+        self.client.get('/no/such/path/')
+        self.assertEqual(
+            self.sample('http_request_duration_seconds_count', route='unresolved', method='GET', status='4xx'),
+            unresolved + 1,
+        )
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0.0)
+    def test_unsampled_request_has_no_query_count(self):
+        labels = {'route': 'meetings-list', 'method': 'GET'}
+        requests = self.sample('http_request_duration_seconds_count', status='2xx', **labels)
+        queries = self.sample('http_request_db_queries_count', **labels)
+        local_cache.clear()
+        self.client.get(reverse('meetings-list', kwargs={'client_slug': self.client_.slug}))
+        self.assertEqual(self.sample('http_request_duration_seconds_count', status='2xx', **labels), requests + 1)
+        self.assertEqual(self.sample('http_request_db_queries_count', **labels), queries)
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0)
+    def test_streaming_response_observed_on_close(self):
+        labels = {'route': 'calendar-feed', 'method': 'GET'}
+        requests = self.sample('http_request_duration_seconds_count', status='2xx', **labels)
+        queries = self.sample('http_request_db_queries_sum', **labels)
+        local_cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(
+                reverse('calendar-feed', kwargs={'client_slug': self.client_.slug}),
+                {'start': '2026-03-01', 'end': '2026-03-31'},
+            )
+            self.assertEqual(self.sample('http_request_duration_seconds_count', status='2xx', **labels), requests)
+            # The entries are only read while the body is sent
+            b''.join(response.streaming_content)
+        self.assertEqual(self.sample('http_request_duration_seconds_count', status='2xx', **labels), requests + 1)
+        self.assertEqual(self.sample('http_request_db_queries_sum', **labels), queries + len(captured))
+
+    def test_record_cache(self):
+        hits = self.sample('cache_requests_total', cache='test', result='hit')
+        metrics.record_cache('test', True)
+        metrics.record_cache('test', False)
+        self.assertEqual(self.sample('cache_requests_total', cache='test', result='hit'), hits + 1)
+
+    def test_exposition(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE_LATEST)
+        self.assertIn(b'http_request_duration_seconds', response.content)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        response = self.client.get(reverse('metrics'), headers={'Authorization': 'Bearer secret'})
+        self.assertEqual(response.status_code, 200)
+
+
+class CeleryMetricsTests(SimpleTestCase):
+
+    class Task:
+        name = 'tests.task'
+
+        def __init__(self, **request):
+            self.request = type('Request', (), {'eta': None, **request})()
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, {'task': self.Task.name, **labels}) or 0
+
+    def test_runtime_and_queue_wait(self):
+        runs = self.sample('celery_task_runtime_seconds_count', state='SUCCESS')
+        waits = self.sample('celery_task_queue_wait_seconds_count')
+        headers = {}
+        metrics._before_publish(headers=headers)
+        task = self.Task(published_at=headers['published_at'] - 2)
+        metrics._prerun(task_id='1', task=task)
+        metrics._postrun(task_id='1', task=task, state='SUCCESS')
+        self.assertEqual(self.sample('celery_task_runtime_seconds_count', state='SUCCESS'), runs + 1)
+        self.assertEqual(self.sample('celery_task_queue_wait_seconds_count'), waits + 1)
+        self.assertGreaterEqual(self.sample('celery_task_queue_wait_seconds_sum'), 2)
+
+    def test_no_publish_header_or_prerun(self):
+        waits = self.sample('celery_task_queue_wait_seconds_count')
+        metrics._prerun(task_id='2', task=self.Task())
+        metrics._postrun(task_id='2', task=self.Task(), state='SUCCESS')
+        self.assertEqual(self.sample('celery_task_queue_wait_seconds_count'), waits)
+        runs = self.sample('celery_task_runtime_seconds_count', state='FAILURE')
+        metrics._postrun(task_id='unknown', task=self.Task(), state='FAILURE')
+        self.assertEqual(self.sample('celery_task_runtime_seconds_count', state='FAILURE'), runs)
+
+    def test_retries_and_failures(self):
+        retries, failures = self.sample('celery_task_retries_total'), self.sample('celery_task_failures_total')
+        metrics._retry(sender=self.Task())
+        metrics._failure(sender=self.Task())
+        self.assertEqual(self.sample('celery_task_retries_total'), retries + 1)
+        self.assertEqual(self.sample('celery_task_failures_total'), failures + 1)
+
+
+class FastSerializerTests(TestCase):
+    fast_serializers = [
+        ActionItemFastSerializer, AISuggestionFastSerializer, AttachmentFastSerializer, BlockerFastSerializer,
+        BusinessRuleFastSerializer, DecisionFastSerializer, MeetingFastSerializer, SprintItemFastSerializer,
+        UpdateFastSerializer,
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_tenant(5, seed=1, transcripts=True)
+
+    def assertParity(self, fast):
+        queryset = fast.serializer_class.Meta.model.objects.order_by('pk')
+        expected = [list(row.items()) for row in fast.serializer_class(queryset, many=True).data]
+        self.assertTrue(expected)
+        # Same values and the same key order
+        self.assertEqual([list(row.items()) for row in fast.serialize_queryset(queryset)], expected)
+
+    def test_parity(self):
+        for fast in self.fast_serializers:
+            with self.subTest(fast.serializer_class.__name__):
+                self.assertParity(fast)
+
+    def test_parity_in_other_time_zone(self):
+        with timezone.override('America/Bogota'):
+            for fast in self.fast_serializers:
+                with self.subTest(fast.serializer_class.__name__):
+                    self.assertParity(fast)
+
+    def test_native_types(self):
+        meeting = Meeting.objects.order_by('pk').first()
+        row, = MeetingFastSerializer.serialize_queryset(Meeting.objects.filter(pk=meeting.pk), native=True)
+        self.assertEqual(row['id'], meeting.pk)
+        self.assertEqual(row['date'], meeting.date)
+        self.assertEqual(row['created_at'], meeting.created_at)
+
+    def test_list_endpoint(self):
+        client = Client.objects.get()
+        local_cache.clear()
+        response = self.client.get(reverse('meetings-list', kwargs={'client_slug': client.slug}), {'page_size': 100})
+        expected = MeetingFastSerializer.serializer_class(Meeting.objects.order_by('-date', '-id'), many=True).data
+        self.assertEqual(response.json()['results'], [dict(row) for row in expected])
+
+    def test_uncompilable_fields(self):
+        class MethodSerializer(serializers.ModelSerializer):
+            title = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Meeting
+                fields = ['id', 'title']
+
+        class NestedSourceSerializer(serializers.ModelSerializer):
+            client_name = serializers.CharField(source='client.name')
+
+            class Meta:
+                model = Meeting
+                fields = ['id', 'client_name']
+
+        for serializer_class in (MethodSerializer, NestedSourceSerializer):
+            with self.subTest(serializer_class.__name__), self.assertRaises(ImproperlyConfigured):
+                FastSerializer(serializer_class).plan
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    payload = {
+        'id': uuid.UUID('6f1c2b9e-3d4a-4f5b-8c7d-9e0f1a2b3c4d'),
+        'utc': datetime.datetime(2026, 3, 1, 9, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        'offset': datetime.datetime(2026, 3, 1, 9, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))),
+        'naive': datetime.datetime(2026, 3, 1, 9, 30),
+        'date': datetime.date(2026, 3, 1),
+        'time': datetime.time(9, 30, 15),
+        'amount': decimal.Decimal('12.50'),
+        'lazy': gettext_lazy('Invalid cursor'),
+        'text': 'Año\u2028línea\u2029 "quoted" \\ ✓',
+        'rows': [{'n': 1, 'x': 2.5, 'none': None, 'flag': True, 'tags': ('a', 'b')}],
+        1: 'integer key',
+    }
+
+    def test_same_bytes_as_json_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+        # Strict JSON has no NaN or infinities; both renderers refuse them
+        for value in (float('nan'), float('inf'), float('-inf')):
+            data = {'rows': [{'x': 1.5, 'y': None}, {'x': value}]}
+            with self.subTest(value=value):
+                for renderer in (JSONRenderer(), FastJSONRenderer()):
+                    with self.assertRaises(ValueError):
+                        renderer.render(data)
+
+    def test_orjson_rejects_fall_back(self):
+        data = {'big': 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent(self):
+        media_type = 'application/json; indent=4'
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload, media_type),
+            JSONRenderer().render(self.payload, media_type),
+        )
+
+    def test_none(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONParserTests(SimpleTestCase):
+
+    def parse(self, body):
+        return FastJSONParser().parse(io.BytesIO(body), 'application/json', {})
+
+    def test_same_as_json_parser(self):
+        body = JSONRenderer().render(FastJSONRendererTests.payload)
+        self.assertEqual(self.parse(body), JSONParser().parse(io.BytesIO(body), 'application/json', {}))
+
+    def test_rejects_nan_and_garbage(self):
+        for body in (b'{"x": NaN}', b'{"x": Infinity}', b'{"x":'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                self.parse(body)
+
+
+class AcceptedEncodingTests(SimpleTestCase):
+
+    def test_negotiation(self):
+        br = 'br' if brotli is not None else 'gzip'
+        cases = [
+            ('', None),
+            ('identity', None),
+            ('gzip', 'gzip'),
+            ('gzip, deflate, br', br),
+            ('br;q=0.5, gzip', 'gzip'),
+            ('br;q=0, gzip;q=0', None),
+            ('*', br),
+            ('*;q=0.2, gzip;q=0', 'br' if brotli is not None else None),
+            ('GZIP;q=0.8, bogus;q=x', 'gzip'),
+        ]
+        for header, expected in cases:
+            with self.subTest(header=header):
+                self.assertEqual(accepted_encoding(header), expected)
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_BYTES=100)
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = json.dumps([{'id': n, 'title': f'Row {n}'} for n in range(100)]).encode()
+
+    def get(self, response, encoding='gzip'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip(self):
+        response = self.get(HttpResponse(self.body, content_type='application/json', headers={'ETag': '"v1"'}))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['ETag'], 'W/"v1"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_brotli(self):
+        if brotli is None:
+            self.skipTest('brotli is not installed')
+        response = self.get(HttpResponse(self.body, content_type='application/json'), 'gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+
+    def test_streaming(self):
+        chunks = [self.body[:500], self.body[500:]]
+        response = self.get(StreamingHttpResponse(iter(chunks), content_type='text/calendar'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.body)
+
+    def test_passes_through(self):
+        cases = {
+            'small': HttpResponse(b'{}', content_type='application/json'),
+            'not compressible': HttpResponse(self.body, content_type='image/png'),
+            'html': HttpResponse(self.body, content_type='text/html; charset=utf-8'),
+            'already encoded': HttpResponse(
+                self.body, content_type='application/json', headers={'Content-Encoding': 'br'}
+            ),
+            'partial': HttpResponse(self.body, content_type='application/json', status=206),
+        }
+        for name, response in cases.items():
+            with self.subTest(name):
+                self.assertEqual(self.get(response).content, self.body if name != 'small' else b'{}')
+                self.assertNotEqual(response.get('Content-Encoding'), 'gzip')
+
+    def test_not_accepted(self):
+        response = self.get(HttpResponse(self.body, content_type='application/json'), 'identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+
+class MessagePackTests(SimpleTestCase):
+
+    def round_trip(self, data):
+        return msgpack_loads(MessagePackRenderer().render(data))
+
+    def test_round_trip(self):
+        utc = datetime.timezone.utc
+        cases = [
+            uuid.UUID('6f1c2b9e-3d4a-4f5b-8c7d-9e0f1a2b3c4d'),
+            datetime.datetime(2026, 3, 1, 9, 30, 15, 123456, tzinfo=utc),
+            datetime.datetime(1969, 12, 31, 23, 59, 59, tzinfo=utc),
+            datetime.date(2026, 3, 1),
+            datetime.date(1969, 7, 20),
+            datetime.date(1, 1, 1),
+            [[1, [2.5, None]], ['text', b'bytes', True], []],
+            {'nested': {'ids': [uuid.UUID(int=n) for n in range(3)]}, 1: 'integer key'},
+        ]
+        for value in cases:
+            with self.subTest(value=value):
+                result = self.round_trip(value)
+                self.assertEqual(result, value)
+                self.assertIs(type(result), type(value))
+
+    def test_other_offsets_come_back_as_utc(self):
+        value = datetime.datetime(2026, 3, 1, 9, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-5)))
+        result = self.round_trip(value)
+        self.assertEqual(result, value)
+        self.assertEqual(result.utcoffset(), datetime.timedelta(0))
+
+    def test_json_fallbacks(self):
+        # Types without a MessagePack encoding come back as the JSON renderer writes them
+        naive = datetime.datetime(2026, 3, 1, 9, 30)
+        self.assertEqual(self.round_trip(naive), naive.isoformat())
+        self.assertEqual(self.round_trip(decimal.Decimal('12.50')), 12.5)
+        self.assertEqual(self.round_trip(datetime.time(9, 30)), '09:30:00')
+        self.assertEqual(self.round_trip(gettext_lazy('Invalid cursor')), 'Invalid cursor')
+        self.assertEqual(self.round_trip(('a', 'b')), ['a', 'b'])
+
+    def test_matches_json(self):
+        # Timestamps keep the instant but not the offset, see test_other_offsets_come_back_as_utc
+        payload = {key: value for key, value in FastJSONRendererTests.payload.items() if key != 'offset'}
+        decoded = json.loads(FastJSONRenderer().render(self.round_trip(payload)))
+        self.assertEqual(decoded, json.loads(FastJSONRenderer().render(payload)))
+
+    def test_parser(self):
+        body = MessagePackRenderer().render({'due_date': datetime.date(2030, 1, 31)})
+        parsed = MessagePackParser().parse(io.BytesIO(body))
+        self.assertEqual(parsed, {'due_date': datetime.date(2030, 1, 31)})
+        for body in (b'\xc1', b'\x92\x01'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                MessagePackParser().parse(io.BytesIO(body))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class MessagePackEndpointTests(TestCase):
+    routes = ['client-all', 'meetings-list', 'sprints-roadmap']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_ = seed_tenant(5, seed=2)
+
+    def get(self, url, media_type):
+        cache.clear()
+        local_cache.clear()
+        response = self.client.get(url, HTTP_ACCEPT=media_type)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith(media_type))
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    def test_same_data_as_json(self):
+        for name in self.routes:
+            with self.subTest(name):
+                url = reverse(name, kwargs={'client_slug': self.client_.slug})
+                body = json.loads(self.get(url, 'application/json'))
+                packed = json.loads(FastJSONRenderer().render(msgpack_loads(self.get(url, 'application/msgpack'))))
+                body.pop('generated_at', None)
+                packed.pop('generated_at', None)
+                self.assertEqual(packed, body)
+
+    def test_create_from_msgpack_body(self):
+        url = reverse('action-items-list', kwargs={'client_slug': self.client_.slug})
+        values = {
+            'title': 'Round trip',
+            'due_date': datetime.date(2030, 1, 31),
+            'from_meeting': Meeting.objects.filter(client=self.client_).first().pk,
+            'priority': 'high',
+        }
+        created = []
+        for media_type, body in (
+            ('application/json', json.dumps(values, default=str)),
+            ('application/msgpack', MessagePackRenderer().render(values)),
+        ):
+            local_cache.clear()
+            response = self.client.post(url, body, content_type=media_type, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 201, response.content)
+            created.append({
+                key: value for key, value in response.json().items()
+                if key not in ('id', 'action_code', 'created_at', 'updated_at')
+            })
+        self.assertEqual(created[0], created[1])
+        self.assertEqual(created[1]['due_date'], '2030-01-31')
+
+
+class SeedTenantTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = seed_tenant(50, slug='first', seed=3, transcripts=True)
+        cls.second = seed_tenant(50, slug='second', seed=3, transcripts=True)
+
+    def test_rows_per_table(self):
+        for model in (
+            Meeting, Update, Blocker, Attachment, Question, BusinessRule, Decision, ActionItem, AISuggestion,
+            SprintItem,
+        ):
+            with self.subTest(model.__name__):
+                self.assertEqual(model.objects.filter(client=self.first).count(), 50)
+        self.assertEqual(DeliverableSection.objects.filter(page__client=self.first).count(), 50)
+        sprints = Sprint.objects.filter(client=self.first)
+        self.assertEqual(sprints.count(), max(50 // ITEMS_PER_SPRINT, MIN_GROUPS))
+
+    def test_links_stay_in_tenant(self):
+        self.assertFalse(Update.objects.filter(client=self.first).exclude(meeting__client=self.first).exists())
+        self.assertFalse(SprintItem.objects.filter(client=self.first).exclude(sprint__client=self.first).exists())
+        answers = AISuggestion.objects.filter(client=self.first, suggestion_type='answer')
+        self.assertTrue(answers.exists())
+        self.assertFalse(answers.exclude(target_question__client=self.first).exists())
+
+    def test_same_seed_same_data(self):
+        def shape(client):
+            return (
+                list(Meeting.objects.filter(client=client).order_by('meeting_code').values_list('date', 'title')),
+                list(SprintItem.objects.filter(client=client).order_by('item_code').values_list('status', 'rank')),
+            )
+        self.assertEqual(shape(self.first), shape(self.second))
+        self.assertNotEqual(shape(self.first), shape(seed_tenant(50, seed=4, transcripts=True)))
+
+    def test_transcripts(self):
+        self.assertTrue(Meeting.objects.filter(client=self.first).exclude(transcript_text=None).exists())
+        self.assertFalse(Meeting.objects.filter(client=seed_tenant(5)).exclude(transcript_text=None).exists())
+
+    def test_counters_follow_bulk_inserts(self):
+        for sprint in Sprint.objects.filter(client=self.first):
+            self.assertEqual(sprint.total_items, sprint.items.count())